@@ -16,6 +16,7 @@ from sentry import analytics, eventstream, features
 from sentry.api.serializers import serialize
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.db.models.query import create_or_update
+from sentry.grouping.grouphash_cache import invalidate_grouphash_cache
 from sentry.models import (
     TOMBSTONE_FIELDS_FROM_GROUP,
     Activity,
@@ -99,6 +100,7 @@ def handle_discard(
                 GroupHash.objects.filter(group=group).update(
                     group=None, group_tombstone_id=tombstone.id
                 )
+                invalidate_grouphash_cache(group.project_id)
 
     for project in projects:
         delete_group_list(
@@ -0,0 +1,139 @@
+"""
+Concurrent loading of the attributes of API serializers.
+
+``Serializer.get_attrs`` implementations often run a series of independent
+queries (one per attribute), and pay the sum of their latencies. Instead,
+they can declare these queries as named loaders, each a function without
+arguments, and let `run_loaders` run them on a bounded thread pool:
+
+    loaded = run_loaders(
+        {
+            "bookmarks": lambda: get_bookmarks(item_list, user),
+            "snoozes": lambda: get_snoozes(item_list),
+        }
+    )
+
+Loaders that depend on the results of others are run by a later call to
+`run_loaders`.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Mapping, MutableMapping
+
+import sentry_sdk
+from django.db import connections
+from sentry_sdk import Hub
+
+from sentry import options
+from sentry.app import env
+
+__all__ = ("run_loaders",)
+
+LOADER_CONCURRENCY = 8
+
+# Workers keep their database connections across loaders, up to this many
+# seconds. See `_close_unusable_connections`.
+LOADER_CONNECTION_MAX_AGE = 300
+
+_loader_pool = ThreadPoolExecutor(
+    max_workers=LOADER_CONCURRENCY, thread_name_prefix="serializer-loader"
+)
+_loader_state = threading.local()
+
+
+def _can_run_concurrently() -> bool:
+    if not options.get("api.serializers.concurrent-loaders.enabled"):
+        return False
+
+    # Loaders called from a loader run inline, so that they can't exhaust the
+    # pool while their caller is waiting for them.
+    if getattr(_loader_state, "in_loader", False):
+        return False
+
+    # Other threads use connections of their own, and don't see what this
+    # thread has written in an open transaction.
+    return not any(connection.in_atomic_block for connection in connections.all())
+
+
+def _close_unusable_connections() -> None:
+    """
+    Closes the connections of a worker that broke or are older than
+    `LOADER_CONNECTION_MAX_AGE`, and keeps all others open for the next
+    loader. Unlike `close_old_connections`, this doesn't depend on
+    ``CONN_MAX_AGE``, which closes connections after every request when it's
+    not configured. The pool then holds at most one connection per worker
+    and database, instead of opening new ones for every loader.
+    """
+    opened_at = getattr(_loader_state, "opened_at", None)
+    if opened_at is None:
+        opened_at = _loader_state.opened_at = {}
+
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            opened_at.pop(connection.alias, None)
+            continue
+
+        # Connections are identified by their DB-API connection, which is
+        # replaced when Django reconnects.
+        seen = opened_at.get(connection.alias)
+        if seen is None or seen[0] is not connection.connection:
+            seen = opened_at[connection.alias] = (connection.connection, now)
+
+        if connection.get_autocommit() != connection.settings_dict["AUTOCOMMIT"]:
+            unusable = True
+        elif connection.errors_occurred:
+            unusable = not connection.is_usable()
+            connection.errors_occurred = unusable
+        else:
+            unusable = False
+
+        if unusable or now - seen[1] >= LOADER_CONNECTION_MAX_AGE:
+            connection.close()
+            del opened_at[connection.alias]
+
+
+def _run_loader(name: str, loader: Callable[[], Any], hub: Hub, request: Any) -> Any:
+    with hub, hub.start_span(op="serialize.get_attrs.loader", description=name):
+        # Serializers look at the current request (e.g. for superuser
+        # checks), which is a thread local.
+        env.request = request
+        _loader_state.in_loader = True
+        try:
+            # Like Django does at the start and end of every request,
+            # connections are checked before and after every loader, since
+            # they may have broken while the worker was idle.
+            _close_unusable_connections()
+            return loader()
+        finally:
+            env.request = None
+            _loader_state.in_loader = False
+            _close_unusable_connections()
+
+
+def run_loaders(loaders: Mapping[str, Callable[[], Any]]) -> MutableMapping[str, Any]:
+    """
+    Runs independent attribute loaders, concurrently if enabled, and returns
+    their results by name. Every loader is reported as a span.
+
+    The first exception raised by a loader is raised once all loaders have
+    finished.
+    """
+    if len(loaders) < 2 or not _can_run_concurrently():
+        results = {}
+        for name, loader in loaders.items():
+            with sentry_sdk.start_span(op="serialize.get_attrs.loader", description=name):
+                results[name] = loader()
+        return results
+
+    futures = {
+        name: _loader_pool.submit(_run_loader, name, loader, Hub(Hub.current), env.request)
+        for name, loader in loaders.items()
+    }
+    # Wait for every loader before raising, so that none is still running
+    # against the state of a request that has already failed.
+    for future in futures.values():
+        future.exception()
+    return {name: future.result() for name, future in futures.items()}
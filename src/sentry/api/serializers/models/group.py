@@ -15,6 +15,7 @@ from typing import (
     Optional,
     Protocol,
     Sequence,
+    Set,
     Tuple,
     TypedDict,
 )
@@ -26,6 +27,7 @@ from django.db.models import Min, prefetch_related_objects
 
 from sentry import tagstore
 from sentry.api.serializers import Serializer, register, serialize
+from sentry.api.serializers.loaders import run_loaders
 from sentry.api.serializers.models.actor import ActorSerializer
 from sentry.api.serializers.models.plugin import is_plugin_deprecated
 from sentry.api.serializers.models.user import UserSerializerResponse
@@ -188,51 +190,11 @@ class GroupSerializerBase(Serializer, ABC):
         # making unnecessary queries.
         prefetch_related_objects(item_list, "project__organization")
 
-        if user.is_authenticated and item_list:
-            bookmarks = set(
-                GroupBookmark.objects.filter(user=user, group__in=item_list).values_list(
-                    "group_id", flat=True
-                )
-            )
-            seen_groups = dict(
-                GroupSeen.objects.filter(user=user, group__in=item_list).values_list(
-                    "group_id", "last_seen"
-                )
-            )
-            subscriptions = self._get_subscriptions(item_list, user)
-        else:
-            bookmarks = set()
-            seen_groups = {}
-            subscriptions = defaultdict(lambda: (False, False, None))
-
-        assignees = {
-            a.group_id: a.assigned_actor()
-            for a in GroupAssignee.objects.filter(group__in=item_list)
-        }
-        resolved_assignees = ActorTuple.resolve_dict(assignees)
-
-        ignore_items = {g.group_id: g for g in GroupSnooze.objects.filter(group__in=item_list)}
-
-        release_resolutions, commit_resolutions = self._resolve_resolutions(item_list, user)
-
-        actor_ids = {r[-1] for r in release_resolutions.values()}
-        actor_ids.update(r.actor_id for r in ignore_items.values())
-        if actor_ids:
-            users = list(User.objects.filter(id__in=actor_ids, is_active=True))
-            actors = {u.id: d for u, d in zip(users, serialize(users, user))}
-        else:
-            actors = {}
-
-        share_ids = dict(
-            GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid")
-        )
-
-        seen_stats = self._get_seen_stats(item_list, user)
-
-        organization_id_list = list({item.project.organization_id for item in item_list})
         # if no groups, then we can't proceed but this seems to be a valid use case
         if not item_list:
             return {}
+
+        organization_id_list = list({item.project.organization_id for item in item_list})
         if len(organization_id_list) > 1:
             # this should never happen but if it does we should know about it
             logger.warning(
@@ -243,18 +205,47 @@ class GroupSerializerBase(Serializer, ABC):
         # should only have 1 org at this point
         organization_id = organization_id_list[0]
 
-        authorized = self._is_authorized(user, organization_id)
+        # None of these depend on each other, so they are loaded concurrently.
+        loaded = run_loaders(
+            {
+                "bookmarks": lambda: self._get_bookmarks(item_list, user),
+                "seen_groups": lambda: self._get_seen_groups(item_list, user),
+                "subscriptions": lambda: (
+                    self._get_subscriptions(item_list, user)
+                    if user.is_authenticated
+                    else defaultdict(lambda: (False, False, None))
+                ),
+                "assignees": lambda: self._get_assignees(item_list),
+                "ignore_items": lambda: self._get_snoozes(item_list),
+                "resolutions": lambda: self._resolve_resolutions(item_list, user),
+                "share_ids": lambda: self._get_share_ids(item_list),
+                "seen_stats": lambda: self._get_seen_stats(item_list, user),
+                "authorized": lambda: self._is_authorized(user, organization_id),
+                "annotations": lambda: self._resolve_annotations(organization_id, item_list),
+            }
+        )
+        bookmarks = loaded["bookmarks"]
+        seen_groups = loaded["seen_groups"]
+        subscriptions = loaded["subscriptions"]
+        resolved_assignees = loaded["assignees"]
+        ignore_items = loaded["ignore_items"]
+        release_resolutions, commit_resolutions = loaded["resolutions"]
+        share_ids = loaded["share_ids"]
+        seen_stats = loaded["seen_stats"]
+        authorized = loaded["authorized"]
+        annotations_by_group_id = loaded["annotations"]
 
-        annotations_by_group_id: MutableMapping[int, List[Any]] = defaultdict(list)
-        for annotations_by_group in itertools.chain.from_iterable(
-            [
-                self._resolve_integration_annotations(organization_id, item_list),
-                [self._resolve_external_issue_annotations(item_list)],
-            ]
-        ):
-            merge_list_dictionaries(annotations_by_group_id, annotations_by_group)
+        actor_ids = {r[-1] for r in release_resolutions.values()}
+        actor_ids.update(r.actor_id for r in ignore_items.values())
 
-        snuba_stats = self._get_group_snuba_stats(item_list, seen_stats)
+        loaded = run_loaders(
+            {
+                "actors": lambda: self._get_actors(actor_ids, user),
+                "snuba_stats": lambda: self._get_group_snuba_stats(item_list, seen_stats),
+            }
+        )
+        actors = loaded["actors"]
+        snuba_stats = loaded["snuba_stats"]
 
         result = {}
         for item in item_list:
@@ -516,6 +507,52 @@ class GroupSerializerBase(Serializer, ABC):
             datetime.now(pytz.utc) - timedelta(days=90),
         )
 
+    @staticmethod
+    def _get_bookmarks(item_list: Sequence[Group], user) -> Set[int]:
+        if not user.is_authenticated:
+            return set()
+
+        return set(
+            GroupBookmark.objects.filter(user=user, group__in=item_list).values_list(
+                "group_id", flat=True
+            )
+        )
+
+    @staticmethod
+    def _get_seen_groups(item_list: Sequence[Group], user) -> Mapping[int, datetime]:
+        if not user.is_authenticated:
+            return {}
+
+        return dict(
+            GroupSeen.objects.filter(user=user, group__in=item_list).values_list(
+                "group_id", "last_seen"
+            )
+        )
+
+    @staticmethod
+    def _get_assignees(item_list: Sequence[Group]) -> Mapping[int, Any]:
+        assignees = {
+            a.group_id: a.assigned_actor()
+            for a in GroupAssignee.objects.filter(group__in=item_list)
+        }
+        return ActorTuple.resolve_dict(assignees)
+
+    @staticmethod
+    def _get_snoozes(item_list: Sequence[Group]) -> Mapping[int, GroupSnooze]:
+        return {g.group_id: g for g in GroupSnooze.objects.filter(group__in=item_list)}
+
+    @staticmethod
+    def _get_share_ids(item_list: Sequence[Group]) -> Mapping[int, str]:
+        return dict(GroupShare.objects.filter(group__in=item_list).values_list("group_id", "uuid"))
+
+    @staticmethod
+    def _get_actors(actor_ids: Set[int], user) -> Mapping[int, Any]:
+        if not actor_ids:
+            return {}
+
+        users = list(User.objects.filter(id__in=actor_ids, is_active=True))
+        return {u.id: d for u, d in zip(users, serialize(users, user))}
+
     @staticmethod
     def _get_subscriptions(
         groups: Iterable[Group], user: User
@@ -587,6 +624,20 @@ class GroupSerializerBase(Serializer, ABC):
 
         return _release_resolutions, _commit_resolutions
 
+    @classmethod
+    def _resolve_annotations(
+        cls, org_id: int, groups: Sequence[Group]
+    ) -> MutableMapping[int, List[Any]]:
+        annotations_by_group_id: MutableMapping[int, List[Any]] = defaultdict(list)
+        for annotations_by_group in itertools.chain.from_iterable(
+            [
+                cls._resolve_integration_annotations(org_id, groups),
+                [cls._resolve_external_issue_annotations(groups)],
+            ]
+        ):
+            merge_list_dictionaries(annotations_by_group_id, annotations_by_group)
+        return annotations_by_group_id
+
     @staticmethod
     def _resolve_external_issue_annotations(groups: Sequence[Group]) -> Mapping[int, Sequence[Any]]:
         from sentry.models import PlatformExternalIssue
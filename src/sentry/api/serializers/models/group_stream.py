@@ -9,6 +9,7 @@ from typing import Any, Callable, Mapping, MutableMapping, Optional, Sequence
 from django.utils import timezone
 
 from sentry import release_health, tsdb
+from sentry.api.serializers.loaders import run_loaders
 from sentry.api.serializers.models.group import (
     BaseGroupSerializerResponse,
     GroupSerializer,
@@ -218,12 +219,12 @@ class StreamGroupSerializerSnuba(GroupSerializerSnuba, GroupStatsMixin):
                 ),
                 environment_ids=self.environment_ids,
             )
-            stats = partial_get_stats()
-            filtered_stats = (
-                partial_get_stats(conditions=self.conditions)
-                if self.conditions and not self._collapse("filtered")
-                else None
-            )
+            loaders: MutableMapping[str, Callable[[], Any]] = {"stats": partial_get_stats}
+            if self.conditions and not self._collapse("filtered"):
+                loaders["filtered_stats"] = lambda: partial_get_stats(conditions=self.conditions)
+            loaded = run_loaders(loaders)
+            stats = loaded["stats"]
+            filtered_stats = loaded.get("filtered_stats")
             for item in item_list:
                 if filtered_stats:
                     attrs[item].update({"filtered_stats": filtered_stats[item.id]})
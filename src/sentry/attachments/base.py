@@ -1,4 +1,5 @@
 import zlib
+from io import BytesIO
 
 from sentry.utils import metrics
 from sentry.utils.json import prune_empty_keys
@@ -7,6 +8,9 @@ ATTACHMENT_META_KEY = "{key}:a"
 ATTACHMENT_UNCHUNKED_DATA_KEY = "{key}:a:{id}"
 ATTACHMENT_DATA_CHUNK_KEY = "{key}:a:{id}:{chunk_index}"
 
+#: Number of chunks that are fetched from the cache in a single round trip.
+ATTACHMENT_CHUNK_FETCH_WINDOW = 16
+
 UNINITIALIZED_DATA = object()
 
 
@@ -14,6 +18,31 @@ class MissingAttachmentChunks(Exception):
     pass
 
 
+class ChunkedReader:
+    """
+    Read-only file-like object over an iterator of byte chunks. Chunks are
+    only pulled from the iterator as ``read`` needs them.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def read(self, size=-1):
+        while size is None or size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size is None or size < 0:
+            size = len(self._buffer)
+
+        rv = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return rv
+
+
 class CachedAttachment:
     def __init__(
         self,
@@ -63,6 +92,18 @@ class CachedAttachment:
         assert self._data is not UNINITIALIZED_DATA
         return self._data
 
+    def getfile(self):
+        """
+        Return a file-like object for the attachment data. Unlike ``data``,
+        this does not load the full attachment into memory when it is
+        stored in chunks; chunks are fetched and decompressed while reading.
+        ``MissingAttachmentChunks`` is raised from ``read`` instead.
+        """
+        if self._data is UNINITIALIZED_DATA and self._cache is not None:
+            return ChunkedReader(self._cache.get_data_chunks(self))
+
+        return BytesIO(self.data)
+
     def delete(self):
         for key in self.chunk_keys:
             self._cache.inner.delete(key)
@@ -151,16 +192,21 @@ class BaseAttachmentCache:
             attachment.setdefault("key", key)
             yield CachedAttachment(cache=self, **attachment)
 
-    def get_data(self, attachment):
-        data = []
+    def get_data_chunks(self, attachment, window=ATTACHMENT_CHUNK_FETCH_WINDOW):
+        """
+        Yield the decompressed chunks of an attachment in order. Chunks are
+        fetched ``window`` at a time with a single cache round trip each.
+        """
+        keys = list(attachment.chunk_keys)
 
-        for key in attachment.chunk_keys:
-            raw_data = self.inner.get(key, raw=True)
-            if raw_data is None:
-                raise MissingAttachmentChunks()
-            data.append(zlib.decompress(raw_data))
+        for start in range(0, len(keys), window):
+            for raw_data in self.inner.get_many(keys[start : start + window], raw=True):
+                if raw_data is None:
+                    raise MissingAttachmentChunks()
+                yield zlib.decompress(raw_data)
 
-        return b"".join(data)
+    def get_data(self, attachment):
+        return b"".join(self.get_data_chunks(attachment))
 
     def delete(self, key):
         for attachment in self.get(key):
@@ -1,11 +1,18 @@
 import logging
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, models, router
 from django.db.models import F
+from django.db.models.signals import post_save
 
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
+from sentry.utils.dates import to_timestamp
 from sentry.utils.services import Service
 
+# Maximum number of rows sent in a single ``UPDATE ... FROM (VALUES ...)`` statement.
+BATCH_UPDATE_CHUNK_SIZE = 500
+
 
 class BufferMount(type):
     def __new__(cls, name, bases, attrs):
@@ -102,3 +109,189 @@ class Buffer(Service, metaclass=BufferMount):
             created=created,
             sender=model,
         )
+
+    def process_batch(self, batch):
+        """
+        Processes a batch of ``(model, columns, filters, extra, signal_only)`` tuples.
+
+        Increments for the same model row are coalesced first. Rows are then grouped by
+        model and column set and applied with one ``UPDATE ... FROM (VALUES ...)``
+        statement per group. Anything that can't be expressed that way (signal only
+        updates, filters on unknown fields, rows that don't exist yet) falls back to
+        ``process``.
+
+        Returns the number of rows that were applied with a bulk update.
+        """
+        coalesced = {}
+        for model, columns, filters, extra, signal_only in batch:
+            # Signal only rows are never merged with regular ones, they are
+            # processed without applying their increments.
+            row_key = (model, tuple(sorted(filters.items())), bool(signal_only))
+            if row_key not in coalesced:
+                coalesced[row_key] = (model, dict(columns), filters, dict(extra or {}), signal_only)
+                continue
+            _, row_columns, _, row_extra, row_signal_only = coalesced[row_key]
+            for column, amount in columns.items():
+                row_columns[column] = row_columns.get(column, 0) + amount
+            # last write wins, same as the buffer itself
+            row_extra.update(extra or {})
+            coalesced[row_key] = (model, row_columns, filters, row_extra, row_signal_only)
+
+        groups = {}
+        fallback = []
+        for model, columns, filters, extra, signal_only in coalesced.values():
+            filter_fields = None
+            if not signal_only and isinstance(model, type) and issubclass(model, models.Model):
+                filter_fields = _resolve_fields(model, filters)
+            if (
+                not filter_fields
+                or not (columns or extra)
+                or _resolve_fields(model, columns, extra) is None
+            ):
+                fallback.append((model, columns, filters, extra, signal_only))
+                continue
+            group_key = (
+                model,
+                tuple(sorted(filters)),
+                tuple(sorted(columns)),
+                tuple(sorted(extra)),
+            )
+            groups.setdefault(group_key, []).append((columns, filters, extra))
+
+        updated = 0
+        for (model, filter_names, column_names, extra_names), rows in groups.items():
+            for i in range(0, len(rows), BATCH_UPDATE_CHUNK_SIZE):
+                chunk = rows[i : i + BATCH_UPDATE_CHUNK_SIZE]
+                matched = _bulk_update(model, filter_names, column_names, extra_names, chunk)
+                for idx, (columns, filters, extra) in enumerate(chunk):
+                    if idx not in matched:
+                        fallback.append((model, columns, filters, extra, None))
+                        continue
+                    updated += 1
+                    buffer_incr_complete.send_robust(
+                        model=model,
+                        columns=columns,
+                        filters=filters,
+                        extra=extra,
+                        created=False,
+                        sender=model,
+                    )
+
+        for model, columns, filters, extra, signal_only in fallback:
+            # Subclasses are free to override ``process`` with a different signature, so
+            # call the base implementation directly.
+            Buffer.process(self, model, columns, filters, extra or None, signal_only)
+
+        return updated
+
+
+def _resolve_fields(model, *mappings):
+    """
+    Maps buffer column names onto concrete model fields, returning ``None`` if any of
+    them can't be used as a plain column in a bulk update.
+    """
+    fields = {}
+    for mapping in mappings:
+        for name in mapping:
+            try:
+                field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not getattr(field, "concrete", False) or field.many_to_many:
+                return None
+            fields[name] = field
+    return fields
+
+
+def _get_cast_type(field, connection):
+    if field.is_relation:
+        field = field.target_field
+    if isinstance(field, models.AutoField):
+        # serial types can't be used in casts
+        return "bigint"
+    return field.db_type(connection)
+
+
+def _bulk_update(model, filter_names, column_names, extra_names, rows):
+    """
+    Applies ``rows`` of ``(columns, filters, extra)`` with a single
+    ``UPDATE ... FROM (VALUES ...)`` statement and returns the indexes of the rows that
+    matched an existing row.
+    """
+    from sentry.models import Group
+
+    using = router.db_for_write(model)
+    connection = connections[using]
+    qn = connection.ops.quote_name
+    fields = _resolve_fields(model, filter_names, column_names, extra_names)
+
+    aliases = ["idx"]
+    casts = ["integer"]
+    set_clauses = []
+    where_clauses = []
+    for prefix, names in (("f", filter_names), ("i", column_names), ("e", extra_names)):
+        for pos, name in enumerate(names):
+            alias = f"{prefix}{pos}"
+            column = qn(fields[name].column)
+            aliases.append(alias)
+            casts.append(_get_cast_type(fields[name], connection))
+            if prefix == "f":
+                where_clauses.append(f"t.{column} = v.{alias}")
+            elif prefix == "i":
+                set_clauses.append(f"{column} = t.{column} + v.{alias}")
+            else:
+                set_clauses.append(f"{column} = v.{alias}")
+
+    # HACK(dcramer): mirrors the ``ScoreClause`` special case in ``process``
+    with_score = model is Group and "times_seen" in column_names and "last_seen" in extra_names
+    if with_score:
+        aliases.append("score")
+        casts.append("bigint")
+        times_seen = f"v.i{column_names.index('times_seen')}"
+        set_clauses.append(
+            f"{qn('score')} = log(t.{qn('times_seen')} + {times_seen}) * 600 + v.score"
+        )
+
+    params = []
+    values = []
+    for idx, (columns, filters, extra) in enumerate(rows):
+        row = [idx]
+        for mapping, names in (
+            (filters, filter_names),
+            (columns, column_names),
+            (extra, extra_names),
+        ):
+            for name in names:
+                value = mapping[name]
+                if isinstance(value, models.Model):
+                    value = value.pk
+                row.append(fields[name].get_db_prep_save(value, connection))
+        if with_score:
+            row.append(int(to_timestamp(extra["last_seen"])))
+        params.extend(row)
+        values.append("(%s)" % ", ".join(f"%s::{cast}" for cast in casts))
+
+    sql = """
+        UPDATE {table} AS t SET {set}
+        FROM (VALUES {values}) AS v ({aliases})
+        WHERE {where}
+        RETURNING v.idx, t.{pk}
+    """.format(
+        table=qn(model._meta.db_table),
+        set=", ".join(set_clauses),
+        values=", ".join(values),
+        aliases=", ".join(aliases),
+        where=" AND ".join(where_clauses),
+        pk=qn(model._meta.pk.column),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        returned = cursor.fetchall()
+
+    if model is Group:
+        # Keep the group cache in sync, same as ``group.update`` does in ``process``.
+        for group in Group.objects.filter(id__in={pk for _, pk in returned}):
+            post_save.send(sender=Group, instance=group, created=False)
+
+    return {idx for idx, _ in returned}
@@ -1,12 +1,15 @@
 import pickle
+import random
 import threading
 from datetime import datetime
 from time import time
 
+import msgpack
 from django.db import models
 from django.utils import timezone
 from django.utils.encoding import force_bytes, force_text
 
+from sentry import options
 from sentry.buffer import Buffer
 from sentry.exceptions import InvalidConfiguration
 from sentry.tasks.process_buffer import process_incr, process_pending
@@ -19,6 +22,11 @@ from sentry.utils.redis import get_cluster_from_options
 _local_buffers = None
 _local_buffers_lock = threading.Lock()
 
+# Values written with the msgpack encoding are prefixed with a version byte. Neither pickle
+# (protocol 0 opcodes are printable, protocol 2+ starts with \x80) nor the legacy JSON
+# encoding can start with it, so reads can tell all three formats apart.
+MSGPACK_VERSION = b"\x01"
+
 
 class PendingBuffer:
     def __init__(self, size):
@@ -51,10 +59,13 @@ class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, pending_partitions=1, incr_batch_size=2, **options):
+    def __init__(self, pending_partitions=1, incr_batch_size=2, batch_flush=False, **options):
         self.cluster, options = get_cluster_from_options("SENTRY_BUFFER_OPTIONS", options)
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
+        # When enabled, ``process_incr`` batches are claimed and read with one pipeline
+        # per Redis node and applied with bulk updates (see ``Buffer.process_batch``).
+        self.batch_flush = batch_flush
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
 
@@ -145,6 +156,50 @@ class RedisBuffer(Buffer):
         else:
             raise TypeError(f"invalid type: {type_}")
 
+    def _dump_filters(self, filters, use_msgpack):
+        """
+        Serializes the filters of a buffered row for storage in the buffer hash.
+
+        For msgpack, model instances are replaced with the primary key of the
+        ``<name>_id`` field of their relation, so that they still filter (and create)
+        the same row once loaded.
+        """
+        if use_msgpack:
+            encoded = {}
+            for name, value in filters.items():
+                if isinstance(value, models.Model):
+                    name, value = f"{name}_id", value.pk
+                encoded[name] = value
+            filters = encoded
+        return self._dump_payload(filters, use_msgpack)
+
+    def _dump_payload(self, value, use_msgpack):
+        """
+        Serializes a filters or extra value for storage in the buffer hash.
+        """
+        if use_msgpack:
+            try:
+                # model instances, naive datetimes and anything else we don't know
+                # about are left to pickle
+                return MSGPACK_VERSION + msgpack.packb(value, datetime=True)
+            except (TypeError, ValueError, OverflowError):
+                metrics.incr("buffer.msgpack-fallback", skip_internal=True)
+        return pickle.dumps(value)
+
+    def _load_payload_value(self, payload):
+        """
+        Deserializes a value written by ``_dump_payload``, or by the legacy JSON path.
+        """
+        if payload.startswith(MSGPACK_VERSION):
+            return msgpack.unpackb(payload[len(MSGPACK_VERSION) :], timestamp=3)
+        if payload.startswith((b"{", b"[")):
+            loaded = json.loads(payload.decode("utf-8"))
+            if isinstance(loaded, dict):
+                return self._load_values(loaded)
+            return self._load_value(loaded)
+        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+        return pickle.loads(payload)
+
     def get(self, model, columns, filters):
         """
         Fetches buffered values for a model/filter. Passed columns must be integer columns.
@@ -180,12 +235,13 @@ class RedisBuffer(Buffer):
         # keys (one per Redis partition)
         conn = self.cluster.get_local_client_for_key(key)
 
+        # Pickle is still written unless the rollout option says otherwise, so that all
+        # readers understand msgpack payloads before the first one is written.
+        use_msgpack = random.random() < options.get("buffer.msgpack-write-rate")
+
         pipe = conn.pipeline()
         pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
-        # TODO(dcramer): once this goes live in production, we can kill the pickle path
-        # (this is to ensure a zero downtime deploy where we can transition event processing)
-        pipe.hsetnx(key, "f", pickle.dumps(filters))
-        # pipe.hsetnx(key, 'f', json.dumps(self._dump_values(filters)))
+        pipe.hsetnx(key, "f", self._dump_filters(filters, use_msgpack))
         for column, amount in columns.items():
             pipe.hincrby(key, "i+" + column, amount)
 
@@ -194,10 +250,7 @@ class RedisBuffer(Buffer):
             # hook here
             # e.g. "update score if last_seen or times_seen is changed"
             for column, value in extra.items():
-                # TODO(dcramer): once this goes live in production, we can kill the pickle path
-                # (this is to ensure a zero downtime deploy where we can transition event processing)
-                pipe.hset(key, "e+" + column, pickle.dumps(value))
-                # pipe.hset(key, 'e+' + column, json.dumps(self._dump_value(value)))
+                pipe.hset(key, "e+" + column, self._dump_payload(value, use_msgpack))
 
         if signal_only is True:
             pipe.hset(key, "s", "1")
@@ -262,6 +315,10 @@ class RedisBuffer(Buffer):
         if key is not None:
             batch_keys = [key]
 
+        if self.batch_flush and len(batch_keys) > 1:
+            self._process_batch(batch_keys)
+            return
+
         for key in batch_keys:
             self._process_single_incr(key)
 
@@ -298,32 +355,82 @@ class RedisBuffer(Buffer):
                 self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
                 return
 
-            # XXX(py3): Note that ``import_string`` explicitly wants a str in
-            # python2, so we'll decode (for python3) and then translate back to
-            # a byte string (in python2) for import_string.
-            model = import_string(str(values.pop("m").decode("utf-8")))
-
-            if values["f"].startswith(b"{"):
-                filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(values.pop("f"))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"["):
-                        extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(v)
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
+            model, incr_values, filters, extra_values, signal_only = self._load_payload(values)
             self._process(model, incr_values, filters, extra_values, signal_only)
         finally:
             client.delete(lock_key)
+
+    def _load_payload(self, values):
+        """
+        Decodes the contents of a buffer hash into the arguments of ``Buffer.process``.
+        """
+        # XXX(py3): Note that ``import_string`` explicitly wants a str in
+        # python2, so we'll decode (for python3) and then translate back to
+        # a byte string (in python2) for import_string.
+        model = import_string(str(values.pop("m").decode("utf-8")))
+
+        filters = self._load_payload_value(values.pop("f"))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                extra_values[k[2:]] = self._load_payload_value(v)
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
+
+    def _process_batch(self, batch_keys):
+        # Duplicate keys are common due to the way we use celery etas.
+        batch_keys = list(dict.fromkeys(batch_keys))
+
+        with metrics.timer("buffer.process-batch"):
+            # Claim every key in one pipeline per Redis node, instead of one lock
+            # round trip per key.
+            with self.cluster.map() as client:
+                locks = {
+                    key: client.set(self._make_lock_key(key), "1", nx=True, ex=10)
+                    for key in batch_keys
+                }
+            claimed = [key for key, result in locks.items() if result.value]
+
+            if len(claimed) < len(batch_keys):
+                metrics.incr(
+                    "buffer.revoked",
+                    amount=len(batch_keys) - len(claimed),
+                    tags={"reason": "locked"},
+                    skip_internal=False,
+                )
+
+            try:
+                with self.cluster.map() as client:
+                    results = {}
+                    for key in claimed:
+                        results[key] = client.hgetall(key)
+                        client.zrem(self._make_pending_key_from_key(key), key)
+                        client.delete(key)
+
+                batch = []
+                for key, result in results.items():
+                    values = {force_text(k): v for k, v in result.value.items()}
+                    if not values:
+                        metrics.incr(
+                            "buffer.revoked", tags={"reason": "empty"}, skip_internal=False
+                        )
+                        self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+                        continue
+                    batch.append(self._load_payload(values))
+
+                updated = self.process_batch(batch)
+            finally:
+                with self.cluster.map() as client:
+                    for key in claimed:
+                        client.delete(self._make_lock_key(key))
+
+        metrics.timing("buffer.process-batch.keys", len(batch_keys))
+        metrics.timing("buffer.process-batch.rows", len(batch))
+        metrics.timing("buffer.process-batch.bulk-updated", updated)
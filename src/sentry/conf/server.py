@@ -1425,6 +1425,11 @@ CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 # CACHES backend.
 CACHE_VERSION = 1
 
+# Keep instances of models that set ``process_cache_ttl`` on their manager in
+# memory in front of the cache. Every hit still reads a version stamp from the
+# cache, so the cache must be shared by all processes.
+SENTRY_MODEL_PROCESS_CACHE = False
+
 # Digests backend
 SENTRY_DIGESTS = "sentry.digests.backends.dummy.DummyBackend"
 SENTRY_DIGESTS_OPTIONS = {}
@@ -1467,6 +1472,13 @@ SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS = {}
 
+# Size in bytes of the per-process LRU cache in front of the ``nodedata`` cache, 0 disables
+# it. Entries are encoded node payloads, so this should be sized per worker type.
+SENTRY_NODESTORE_LOCAL_CACHE_MAX_BYTES = 0
+# Seconds an entry stays in the per-process nodestore cache. Deletes and writes only
+# invalidate the cache of the process doing them, so keep this short.
+SENTRY_NODESTORE_LOCAL_CACHE_TTL = 60
+
 # Tag storage backend
 SENTRY_TAGSTORE = os.environ.get("SENTRY_TAGSTORE", "sentry.tagstore.snuba.SnubaTagStorage")
 SENTRY_TAGSTORE_OPTIONS = {}
@@ -1516,6 +1528,10 @@ SENTRY_METRICS_SKIP_INTERNAL_PREFIXES = []  # Order this by most frequent prefix
 SENTRY_METRICS_INDEXER = "sentry.sentry_metrics.indexer.postgres.postgres_v2.PostgresIndexer"
 SENTRY_METRICS_INDEXER_OPTIONS = {}
 SENTRY_METRICS_INDEXER_CACHE_TTL = 3600 * 2
+# Number of strings and IDs every process keeps in memory in front of the
+# indexer cache, and for how many seconds. A size of 0 disables it.
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE = 10000
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_TTL = 60 * 10
 
 SENTRY_METRICS_INDEXER_SPANNER_OPTIONS = {}
 
@@ -2703,6 +2719,18 @@ SENTRY_REPROCESSING_PAGE_SIZE = 10
 # is about "remaining events" exclusively.
 SENTRY_REPROCESSING_REMAINING_EVENTS_BUF_SIZE = 500
 
+# Which backend the ingest consumer uses to remember processed events, to not
+# process them twice when they are consumed again.
+#
+# ``sentry.ingest.deduplication.redis.RedisDeduplicator`` stores them in Redis,
+# with these options:
+#
+# * ``cluster``: the Redis cluster to use.
+# * ``window``: the number of seconds (up to twice as many) to remember events for.
+# * ``shards``: the number of sets the events of a project are split into.
+SENTRY_INGEST_DEDUPLICATION_BACKEND = "sentry.ingest.deduplication.cache.CacheDeduplicator"
+SENTRY_INGEST_DEDUPLICATION_OPTIONS = {}
+
 # Which backend to use for RealtimeMetricsStore.
 #
 # Currently, only redis is supported.
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import copy
+import datetime
+import decimal
 import logging
 import threading
+import uuid
 import weakref
 from contextlib import contextmanager
 from typing import (
@@ -28,6 +32,7 @@ from sentry.db.models.query import create_or_update
 from sentry.silo import SiloLimit, SiloMode
 from sentry.utils.cache import cache
 from sentry.utils.hashlib import md5_text
+from sentry.utils.lru import LRUCache
 
 logger = logging.getLogger("sentry")
 
@@ -35,6 +40,21 @@ _local_cache = threading.local()
 _local_cache_generation = 0
 _local_cache_enabled = False
 
+# Field values that instances handed out by the process cache can share.
+_IMMUTABLE_FIELD_TYPES = (
+    type(None),
+    bool,
+    int,
+    float,
+    str,
+    bytes,
+    datetime.date,
+    datetime.time,
+    datetime.timedelta,
+    decimal.Decimal,
+    uuid.UUID,
+)
+
 
 class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  # type: ignore
     lookup_handlers = {"iexact": lambda x: x.upper()}
@@ -52,7 +72,16 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         self.cache_fields = kwargs.pop("cache_fields", [])
         self.cache_ttl = kwargs.pop("cache_ttl", 60 * 5)
         self._cache_version: Optional[str] = kwargs.pop("cache_version", None)
+        #: Number of seconds for which instances looked up by primary key are
+        #: kept in a bounded in-process cache in front of the shared cache, so
+        #: that hot lookups don't unpickle the same instance over and over.
+        #: Only used if ``SENTRY_MODEL_PROCESS_CACHE`` is enabled. Every hit is
+        #: validated against a version stamp in the shared cache, which saves
+        #: and deletes reset.
+        self.process_cache_ttl: Optional[float] = kwargs.pop("process_cache_ttl", None)
+        self.process_cache_size: int = kwargs.pop("process_cache_size", 1000)
         self.__local_cache = threading.local()
+        self.__process_cache = self.__make_process_cache()
         super().__init__(*args, **kwargs)
 
     @staticmethod
@@ -95,6 +124,77 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
     def _set_cache(self, value: Any) -> None:
         self.__local_cache.value = value
 
+    def __make_process_cache(self) -> Optional[LRUCache[str, Tuple[str, M]]]:
+        if not self.process_cache_ttl:
+            return None
+        return LRUCache(max_items=self.process_cache_size, ttl=self.process_cache_ttl)
+
+    @staticmethod
+    def __get_stamp_key(cache_key: str) -> str:
+        return f"{cache_key}:stamp"
+
+    def __get_process_cache_stamps(self, cache_keys: Sequence[str]) -> Optional[Mapping[str, str]]:
+        """
+        Returns the current version stamps of instances by cache key, or
+        ``None`` if the process cache is not in use. Instances without a stamp
+        get a new one, so that entries cached before it was reset are ignored.
+        """
+        if self.__process_cache is None or not settings.SENTRY_MODEL_PROCESS_CACHE:
+            return None
+
+        stamp_keys = {self.__get_stamp_key(cache_key): cache_key for cache_key in cache_keys}
+        stamps = cache.get_many(list(stamp_keys), version=self.cache_version)
+
+        rv = {}
+        for stamp_key, cache_key in stamp_keys.items():
+            stamp = stamps.get(stamp_key)
+            if stamp is None:
+                stamp = uuid.uuid4().hex
+                cache.add(stamp_key, stamp, self.cache_ttl, version=self.cache_version)
+            rv[cache_key] = stamp
+        return rv
+
+    def __get_many_from_process_cache(self, stamps: Mapping[str, str]) -> Mapping[str, M]:
+        assert self.__process_cache is not None
+
+        # Callers are free to modify the instances they get back, so only
+        # ever hand out copies of the cached ones.
+        return {
+            cache_key: self.__copy_instance(instance)
+            for cache_key, (stamp, instance) in self.__process_cache.get_many(stamps).items()
+            if stamp == stamps[cache_key]
+        }
+
+    def __set_many_in_process_cache(
+        self, instances: Mapping[str, M], stamps: Mapping[str, str]
+    ) -> None:
+        assert self.__process_cache is not None
+        self.__process_cache.set_many(
+            {
+                cache_key: (stamps[cache_key], self.__copy_instance(instance))
+                for cache_key, instance in instances.items()
+            }
+        )
+
+    def __reset_process_cache_stamp(self, instance: M, **kwargs: Any) -> None:
+        """
+        Invalidates an instance in the process caches of all processes.
+        """
+        cache_key = self.__get_lookup_cache_key(**{instance._meta.pk.name: instance.pk})
+        cache.delete(self.__get_stamp_key(cache_key), version=self.cache_version)
+
+    @staticmethod
+    def __copy_instance(instance: M) -> M:
+        rv = copy.copy(instance)
+        rv._state = copy.copy(instance._state)
+        rv._state.fields_cache = {}
+        # Some field values are changed in place, e.g. the handlers of a
+        # `BitField` or the dicts of a `JSONField`, so they can't be shared.
+        for name, value in instance.__dict__.items():
+            if name != "_state" and not isinstance(value, _IMMUTABLE_FIELD_TYPES):
+                rv.__dict__[name] = copy.deepcopy(value)
+        return rv
+
     @property
     def cache_version(self) -> str:
         if self._cache_version is None:
@@ -110,12 +210,14 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         # we can't serialize weakrefs
         d.pop("_BaseManager__cache", None)
         d.pop("_BaseManager__local_cache", None)
+        d.pop("_BaseManager__process_cache", None)
         return d
 
     def __setstate__(self, state: Mapping[str, Any]) -> None:
         self.__dict__.update(state)
         # TODO(typing): Basically everywhere else we set this to `threading.local()`.
         self.__local_cache = weakref.WeakKeyDictionary()  # type: ignore
+        self.__process_cache = self.__make_process_cache()
 
     def __class_prepared(self, sender: Any, **kwargs: Any) -> None:
         """
@@ -131,6 +233,10 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         post_save.connect(self.__post_save, sender=sender, weak=False)
         post_delete.connect(self.__post_delete, sender=sender, weak=False)
 
+        if self.process_cache_ttl:
+            post_save.connect(self.__reset_process_cache_stamp, sender=sender, weak=False)
+            post_delete.connect(self.__reset_process_cache_stamp, sender=sender, weak=False)
+
     def __cache_state(self, instance: M) -> None:
         """
         Updates the tracked state of an instance.
@@ -151,35 +257,12 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         Pushes changes to an instance into the cache, and removes invalid (changed)
         lookup values.
         """
-        pk_name = instance._meta.pk.name
-        pk_names = ("pk", pk_name)
-        pk_val = instance.pk
-        for key in self.cache_fields:
-            if key in pk_names:
-                continue
-            # store pointers
-            value = self.__value_for_field(instance, key)
-            cache.set(
-                key=self.__get_lookup_cache_key(**{key: value}),
-                value=pk_val,
-                timeout=self.cache_ttl,
-                version=self.cache_version,
-            )
+        self.__set_many_in_cache([instance])
 
-        # Ensure we don't serialize the database into the cache
-        db = instance._state.db
-        instance._state.db = None
-        # store actual object
-        try:
-            cache.set(
-                key=self.__get_lookup_cache_key(**{pk_name: pk_val}),
-                value=instance,
-                timeout=self.cache_ttl,
-                version=self.cache_version,
+        if self.__process_cache is not None:
+            self.__process_cache.delete(
+                self.__get_lookup_cache_key(**{instance._meta.pk.name: instance.pk})
             )
-        except Exception as e:
-            logger.error(e, exc_info=True)
-        instance._state.db = db
 
         # Kill off any keys which are no longer valid
         if instance in self.__cache:
@@ -195,6 +278,38 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
         self.__cache_state(instance)
 
+    def __set_many_in_cache(self, instances: Sequence[M]) -> None:
+        """
+        Stores instances, and pointers to them for every cache field, with a
+        single cache write.
+        """
+        if not instances:
+            return
+
+        values: MutableMapping[str, Any] = {}
+        for instance in instances:
+            pk_name = instance._meta.pk.name
+            for key in self.cache_fields:
+                if key in ("pk", pk_name):
+                    continue
+                # store pointers
+                value = self.__value_for_field(instance, key)
+                values[self.__get_lookup_cache_key(**{key: value})] = instance.pk
+            # store actual object
+            values[self.__get_lookup_cache_key(**{pk_name: instance.pk})] = instance
+
+        # Ensure we don't serialize the database into the cache
+        dbs = [instance._state.db for instance in instances]
+        for instance in instances:
+            instance._state.db = None
+        try:
+            cache.set_many(values, timeout=self.cache_ttl, version=self.cache_version)
+        except Exception as e:
+            logger.error(e, exc_info=True)
+        finally:
+            for instance, db in zip(instances, dbs):
+                instance._state.db = db
+
     def __post_delete(self, instance: M, **kwargs: Any) -> None:
         """
         Drops instance from all cache storages.
@@ -209,9 +324,10 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 key=self.__get_lookup_cache_key(**{key: value}), version=self.cache_version
             )
         # remove actual object
-        cache.delete(
-            key=self.__get_lookup_cache_key(**{pk_name: instance.pk}), version=self.cache_version
-        )
+        cache_key = self.__get_lookup_cache_key(**{pk_name: instance.pk})
+        cache.delete(key=cache_key, version=self.cache_version)
+        if self.__process_cache is not None:
+            self.__process_cache.delete(cache_key)
 
     def __get_lookup_cache_key(self, **kwargs: Any) -> str:
         return make_key(self.model, "modelcache", kwargs)
@@ -268,13 +384,25 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 if result is not None:
                     return result
 
-            retval = cache.get(cache_key, version=self.cache_version)
+            retval = None
+            from_process_cache = False
+            # Stamps are read before instances, so that an instance saved in
+            # the meantime ends up cached under the stamp its save reset.
+            stamps = self.__get_process_cache_stamps([cache_key]) if key == pk_name else None
+            if stamps is not None:
+                retval = self.__get_many_from_process_cache(stamps).get(cache_key)
+                from_process_cache = retval is not None
+
+            if retval is None:
+                retval = cache.get(cache_key, version=self.cache_version)
             if retval is None:
                 result = self.using_replica().get(**kwargs) if use_replica else self.get(**kwargs)
                 # need to satisfy mypy
                 assert result
                 # Ensure we're pushing it into the cache
                 self.__post_save(instance=result)
+                if stamps is not None:
+                    self.__set_many_in_process_cache({cache_key: result}, stamps)
                 if local_cache is not None:
                     local_cache[cache_key] = result
                 return result
@@ -299,6 +427,14 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 logger.error("Cache response returned invalid value %r", retval)
                 result = self.using_replica().get(**kwargs) if use_replica else self.get(**kwargs)
 
+            if (
+                stamps is not None
+                and not from_process_cache
+                and isinstance(retval, self.model)
+                and int(value) == retval.pk
+            ):
+                self.__set_many_in_process_cache({cache_key: retval}, stamps)
+
             kwargs = {**kwargs, "replica": True} if use_replica else {**kwargs}
             retval._state.db = router.db_for_read(self.model, **kwargs)
 
@@ -308,7 +444,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         else:
             raise ValueError("We cannot cache this query. Just hit the database.")
 
-    def get_many_from_cache(self, values: Sequence[str], key: str = "pk") -> Sequence[Any]:
+    def get_many_from_cache(
+        self, values: Sequence[str], key: str = "pk", use_replica: bool = False
+    ) -> Sequence[Any]:
         """
         Wrapper around `QuerySet.filter(pk__in=values)` which supports caching of
         the intermediate value.  Callee is responsible for making sure the
@@ -322,6 +460,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
         For most models, if one attempts to use a non-PK value this will just
         degrade to a DB query, like with `get_from_cache`.
+
+        With ``use_replica``, values that aren't cached are queried from the
+        read replica, like with `get_from_cache`.
         """
 
         pk_name = self.model._meta.pk.name
@@ -350,6 +491,24 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 cache_lookup_cache_keys.append(cache_key)
                 cache_lookup_values.append(value)
 
+        # Instances in the process cache don't have to be unpickled again.
+        stamps = (
+            self.__get_process_cache_stamps(cache_lookup_cache_keys)
+            if key == pk_name and cache_lookup_cache_keys
+            else None
+        )
+        if stamps is not None:
+            process_cache_results = self.__get_many_from_process_cache(stamps)
+            if process_cache_results:
+                final_results.extend(process_cache_results.values())
+                remaining = [
+                    (cache_key, value)
+                    for cache_key, value in zip(cache_lookup_cache_keys, cache_lookup_values)
+                    if cache_key not in process_cache_results
+                ]
+                cache_lookup_cache_keys = [cache_key for cache_key, _ in remaining]
+                cache_lookup_values = [value for _, value in remaining]
+
         if not cache_lookup_cache_keys:
             return final_results
 
@@ -361,6 +520,8 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         nested_lookup_cache_keys = []
         nested_lookup_values = []
 
+        process_cache_writes: MutableMapping[str, M] = {}
+
         for cache_key, value in zip(cache_lookup_cache_keys, cache_lookup_values):
             cache_result = cache_results.get(cache_key)
             if cache_result is None:
@@ -390,10 +551,16 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
                 db_lookup_values.append(value)
                 continue
 
+            process_cache_writes[cache_key] = cache_result
             final_results.append(cache_result)
 
+        if stamps is not None:
+            self.__set_many_in_process_cache(process_cache_writes, stamps)
+
         if nested_lookup_values:
-            nested_results = self.get_many_from_cache(nested_lookup_values, key=pk_name)
+            nested_results = self.get_many_from_cache(
+                nested_lookup_values, key=pk_name, use_replica=use_replica
+            )
             final_results.extend(nested_results)
             if local_cache is not None:
                 for nested_result in nested_results:
@@ -405,8 +572,12 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
             return final_results
 
         cache_writes = []
+        process_cache_writes = {}
 
-        db_results = {getattr(x, key): x for x in self.filter(**{key + "__in": db_lookup_values})}
+        queryset = self.using_replica() if use_replica else self
+        db_results = {
+            getattr(x, key): x for x in queryset.filter(**{key + "__in": db_lookup_values})
+        }
         for cache_key, value in zip(db_lookup_cache_keys, db_lookup_values):
             db_result = db_results.get(value)
             if db_result is None:
@@ -414,14 +585,17 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
 
             # Ensure we're pushing it into the cache
             cache_writes.append(db_result)
+            process_cache_writes[cache_key] = db_result
             if local_cache is not None:
                 local_cache[cache_key] = db_result
 
             final_results.append(db_result)
 
-        # XXX: Should use set_many here, but __post_save code is too complex
-        for instance in cache_writes:
-            self.__post_save(instance=instance)
+        # Freshly loaded instances have nothing to invalidate, so unlike
+        # `__post_save` this only needs to write them.
+        self.__set_many_in_cache(cache_writes)
+        if stamps is not None:
+            self.__set_many_in_process_cache(process_cache_writes, stamps)
 
         return final_results
 
@@ -432,6 +606,9 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         pk_name = self.model._meta.pk.name
         cache_key = self.__get_lookup_cache_key(**{pk_name: instance_id})
         cache.delete(cache_key, version=self.cache_version)
+        if self.__process_cache is not None:
+            self.__process_cache.delete(cache_key)
+            cache.delete(self.__get_stamp_key(cache_key), version=self.cache_version)
 
     def post_save(self, instance: M, **kwargs: Any) -> None:
         """
@@ -484,6 +661,11 @@ class BaseManager(DjangoBaseManager.from_queryset(BaseQuerySet), Generic[M]):  #
         manager_instance.cache_ttl = self.cache_ttl
         manager_instance._cache_version = self._cache_version
         manager_instance.__local_cache = threading.local()
+        # Share the process cache, so that the signal handlers connected by
+        # this manager also invalidate the copy.
+        manager_instance.process_cache_ttl = self.process_cache_ttl
+        manager_instance.process_cache_size = self.process_cache_size
+        manager_instance.__process_cache = self.__process_cache
 
         # Dynamically extend and replace the queryset class. This will affect all
         # queryset objects later returned from the new manager.
@@ -1,7 +1,15 @@
 import pickle
+import random
 import zlib
 from typing import Any
 
+import msgpack
+
+# Compact notification payloads are prefixed with a version byte. zlib streams
+# always start with ``0x78``, so this can never be confused with a compressed
+# pickle written by ``CompressedPickleCodec``.
+COMPACT_VERSION = b"\x01"
+
 
 class Codec:
     def encode(self, value: Any) -> bytes:
@@ -17,3 +25,37 @@ class CompressedPickleCodec(Codec):
 
     def decode(self, value: bytes) -> Any:
         return pickle.loads(zlib.decompress(value))
+
+
+class CompactNotificationCodec(CompressedPickleCodec):
+    """
+    Encodes digest notifications as a msgpack list of identifiers instead of
+    pickling the entire event. Decoded events are unfetched: their payload is
+    loaded from nodestore when the digest is delivered (see
+    ``sentry.digests.notifications.fetch_state``.)
+
+    Compressed pickles are still decoded, and are still written for a fraction
+    of records controlled by the ``digests.compact-codec-write-rate`` option,
+    so that this codec can be rolled out while older workers are running.
+    """
+
+    def encode(self, value: Any) -> bytes:
+        from sentry import options
+
+        if random.random() >= options.get("digests.compact-codec-write-rate"):
+            return super().encode(value)
+
+        event, rules = value
+        return COMPACT_VERSION + msgpack.packb(
+            [event.project_id, event.event_id, event.group_id, list(rules)]
+        )
+
+    def decode(self, value: bytes) -> Any:
+        if not value.startswith(COMPACT_VERSION):
+            return super().decode(value)
+
+        from sentry.digests.notifications import Notification
+        from sentry.eventstore.models import Event
+
+        project_id, event_id, group_id, rules = msgpack.unpackb(value[len(COMPACT_VERSION) :])
+        return Notification(Event(project_id, event_id, group_id=group_id), rules)
@@ -6,7 +6,7 @@ import logging
 from collections import defaultdict, namedtuple
 from typing import Any, Mapping, MutableMapping, MutableSequence, Sequence
 
-from sentry import tsdb
+from sentry import eventstore, tsdb
 from sentry.digests import Digest, Record
 from sentry.eventstore.models import Event
 from sentry.models import Group, GroupStatus, Project, Rule
@@ -60,6 +60,12 @@ def fetch_state(project: Project, records: Sequence[Record]) -> Mapping[str, Any
     start = records[-1].datetime
     end = records[0].datetime
 
+    # Records written by ``CompactNotificationCodec`` only carry identifiers,
+    # so fetch the payloads of all of their events in a single nodestore call
+    # rather than lazily one at a time while rendering the digest.
+    events = [record.value.event for record in records]
+    eventstore.bind_nodes([event for event in events if event.data._node_data is None], "data")
+
     groups = Group.objects.in_bulk(record.value.event.group_id for record in records)
     return {
         "project": project,
@@ -7,7 +7,6 @@ import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from hashlib import md5
-from io import BytesIO
 from typing import Optional, Sequence, TypedDict
 
 import sentry_sdk
@@ -37,6 +36,7 @@ from sentry.constants import (
     DataCategory,
 )
 from sentry.culprit import generate_culprit
+from sentry.db.models.fields.node import NodeData
 from sentry.eventstore.processing import event_processing_store
 from sentry.grouping.api import (
     BackgroundGroupingConfigLoader,
@@ -49,6 +49,7 @@ from sentry.grouping.api import (
     get_grouping_config_dict_for_project,
     load_grouping_config,
 )
+from sentry.grouping.grouphash_cache import cache_group_hashes, get_cached_group_id
 from sentry.grouping.result import CalculatedHashes
 from sentry.ingest.inbound_filters import FilterStatKeys
 from sentry.killswitches import killswitch_matches_context
@@ -1048,6 +1049,7 @@ def _tsdb_record_all_metrics(jobs):
 @metrics.wraps("save_event.nodestore_save_many")
 def _nodestore_save_many(jobs):
     inserted_time = datetime.utcnow().replace(tzinfo=UTC).timestamp()
+    nodes = []
     for job in jobs:
         # Write the event to Nodestore
         subkeys = {}
@@ -1063,7 +1065,9 @@ def _nodestore_save_many(jobs):
                 subkeys["unprocessed"] = unprocessed
 
         job["event"].data["nodestore_insert"] = inserted_time
-        job["event"].data.save(subkeys=subkeys)
+        nodes.append((job["event"].data, subkeys))
+
+    NodeData.save_many(nodes)
 
 
 @metrics.wraps("save_event.eventstream_insert_many")
@@ -1253,19 +1257,36 @@ def get_culprit(data):
 def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwargs) -> GroupInfo:
     project = event.project
 
-    flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
-    ]
-
-    # The root_hierarchical_hash is the least specific hash within the tree, so
-    # typically hierarchical_hashes[0], unless a hash `n` has been split in
-    # which case `root_hierarchical_hash = hierarchical_hashes[n + 1]`. Chosing
-    # this for select_for_update mostly provides sufficient synchronization
-    # when groups are created and also relieves contention by locking a more
-    # specific hash than `hierarchical_hashes[0]`.
-    existing_grouphash, root_hierarchical_hash = _find_existing_grouphash(
-        project, flat_grouphashes, hashes.hierarchical_hashes
-    )
+    # Hierarchical hashes can be split, which is only known from the rows of
+    # all hashes, so these are always resolved from the database.
+    cached_group = None
+    cache_generation = None
+    if (
+        options.get("store.grouphash-cache.enabled")
+        and hashes.hashes
+        and not hashes.hierarchical_hashes
+    ):
+        cached_group, cache_generation = _get_cached_group(project, hashes.hashes)
+
+    if cached_group is not None:
+        # All hashes are assigned to the group already, so there is nothing
+        # to look up or associate.
+        flat_grouphashes = []
+        existing_grouphash, root_hierarchical_hash = None, None
+    else:
+        flat_grouphashes = [
+            GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
+        ]
+
+        # The root_hierarchical_hash is the least specific hash within the tree, so
+        # typically hierarchical_hashes[0], unless a hash `n` has been split in
+        # which case `root_hierarchical_hash = hierarchical_hashes[n + 1]`. Chosing
+        # this for select_for_update mostly provides sufficient synchronization
+        # when groups are created and also relieves contention by locking a more
+        # specific hash than `hierarchical_hashes[0]`.
+        existing_grouphash, root_hierarchical_hash = _find_existing_grouphash(
+            project, flat_grouphashes, hashes.hierarchical_hashes
+        )
 
     if root_hierarchical_hash is not None:
         root_hierarchical_grouphash = GroupHash.objects.get_or_create(
@@ -1295,7 +1316,7 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
     )
     kwargs["data"]["last_received"] = received_timestamp
 
-    if existing_grouphash is None:
+    if cached_group is None and existing_grouphash is None:
 
         if killswitch_matches_context(
             "store.load-shed-group-creation-projects",
@@ -1346,6 +1367,14 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
                     state=GroupHash.State.LOCKED_IN_MIGRATION
                 ).update(group=group)
 
+                if cache_generation is not None:
+                    cache_group_hashes(
+                        project.id,
+                        cache_generation,
+                        [h.hash for h in new_hashes if h.state == GroupHash.State.UNLOCKED],
+                        group.id,
+                    )
+
                 is_new = True
                 is_regression = False
 
@@ -1360,7 +1389,23 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
 
                 return GroupInfo(group, is_new, is_regression)
 
-    group = Group.objects.get(id=existing_grouphash.group_id)
+    if cached_group is not None:
+        group = cached_group
+    else:
+        group = Group.objects.get(id=existing_grouphash.group_id)
+
+        if cache_generation is not None:
+            cache_group_hashes(
+                project.id,
+                cache_generation,
+                [
+                    h.hash
+                    for h in flat_grouphashes
+                    if h.group_id == group.id and h.state == GroupHash.State.UNLOCKED
+                ],
+                group.id,
+            )
+
     if group.issue_category != GroupCategory.ERROR:
         logger.info(
             "event_manager.category_mismatch",
@@ -1420,6 +1465,34 @@ def _save_aggregate(event, hashes, release, metadata, received_timestamp, **kwar
     return GroupInfo(group, is_new, is_regression)
 
 
+def _get_cached_group(project, hashes):
+    """
+    Returns the group that all of ``hashes`` are cached as assigned to, if it
+    still takes new events, together with the generation of the cache. See
+    `sentry.grouping.grouphash_cache`.
+    """
+    group_id, generation = get_cached_group_id(project.id, hashes)
+    if group_id is None:
+        return None, generation
+
+    try:
+        group = Group.objects.get(id=group_id)
+    except Group.DoesNotExist:
+        return None, generation
+
+    # Events of groups that are being deleted, merged or reprocessed take the
+    # regular path, which finds the hashes wherever they have been moved to.
+    if group.status in (
+        GroupStatus.PENDING_DELETION,
+        GroupStatus.DELETION_IN_PROGRESS,
+        GroupStatus.PENDING_MERGE,
+        GroupStatus.REPROCESSING,
+    ):
+        return None, generation
+
+    return group, generation
+
+
 def _find_existing_grouphash(
     project,
     flat_grouphashes,
@@ -1863,9 +1936,21 @@ def save_attachment(
     else:
         timestamp = datetime.utcnow().replace(tzinfo=UTC)
 
+    file = None
     try:
-        data = attachment.data
+        fileobj = attachment.getfile()
+        file = File.objects.create(
+            name=attachment.name,
+            type=attachment.type,
+            headers={"Content-Type": attachment.content_type},
+        )
+        file.putfile(fileobj, blob_size=settings.SENTRY_ATTACHMENT_BLOB_SIZE)
     except MissingAttachmentChunks:
+        # Chunks are streamed into the file, so a missing chunk may only be
+        # noticed after some blobs were written already.
+        if file is not None:
+            file.delete()
+
         track_outcome(
             org_id=project.organization_id,
             project_id=project.id,
@@ -1880,13 +1965,6 @@ def save_attachment(
         logger.exception("Missing chunks for cache_key=%s", cache_key)
         return
 
-    file = File.objects.create(
-        name=attachment.name,
-        type=attachment.type,
-        headers={"Content-Type": attachment.content_type},
-    )
-    file.putfile(BytesIO(data), blob_size=settings.SENTRY_ATTACHMENT_BLOB_SIZE)
-
     EventAttachment.objects.create(
         event_id=event_id,
         project_id=project.id,
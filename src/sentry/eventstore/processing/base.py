@@ -23,10 +23,19 @@ class EventProcessingStore:
 
     Separating processing store from the cache allows use of different
     implementations.
+
+    Backends may also provide ``raw_inner``, a view of the same storage that
+    accepts events which are already JSON encoded. Writing an event through it
+    must make it readable through ``inner`` as if it had been stored decoded.
+    This allows to store payloads without parsing them first, see
+    ``store_raw``.
     """
 
-    def __init__(self, inner: KVStorage[str, Event]):
+    def __init__(
+        self, inner: KVStorage[str, Event], raw_inner: Optional[KVStorage[str, bytes]] = None
+    ):
         self.inner = inner
+        self.raw_inner = raw_inner
         self.timeout = timedelta(seconds=DEFAULT_TIMEOUT)
 
     def __get_unprocessed_key(self, key: str) -> str:
@@ -40,6 +49,21 @@ class EventProcessingStore:
             self.inner.set(key, event, self.timeout)
             return key
 
+    @property
+    def supports_raw(self) -> bool:
+        return self.raw_inner is not None
+
+    def store_raw(self, project_id: int, event_id: str, payload: bytes) -> str:
+        """
+        Store the JSON encoded event ``payload`` as is. It is decoded on
+        reading, just like events stored with ``store``.
+        """
+        assert self.raw_inner is not None, "backend does not support storing raw events"
+        with sentry_sdk.start_span(op="eventstore.processing.store_raw"):
+            key = cache_key_for_event({"project": project_id, "event_id": event_id})
+            self.raw_inner.set(key, payload, self.timeout)
+            return key
+
     def get(self, key: str, unprocessed: bool = False) -> Optional[Event]:
         with sentry_sdk.start_span(op="eventstore.processing.get"):
             if unprocessed:
@@ -12,9 +12,11 @@ def BigtableEventProcessingStore(**options) -> EventProcessingStore:
 
     Keyword argument are forwarded to the ``BigtableKVStorage`` constructor.
     """
+    store = BigtableKVStorage(**options)
     return EventProcessingStore(
         KVStorageCodecWrapper(
-            BigtableKVStorage(**options),
+            store,
             JSONCodec() | BytesCodec(),  # maintains functional parity with cache backend
-        )
+        ),
+        raw_inner=store,
     )
@@ -1,4 +1,5 @@
 from sentry.cache import default_cache
+from sentry.cache.redis import CommonRedisCache
 from sentry.utils.kvstore.cache import CacheKVStorage
 
 from .base import EventProcessingStore
@@ -9,4 +10,11 @@ def DefaultEventProcessingStore() -> EventProcessingStore:
     Creates an instance of the processing store which uses the
     ``default_cache`` as its backend.
     """
-    return EventProcessingStore(CacheKVStorage(default_cache))
+    # Only the Redis caches store values JSON encoded, other caches pickle
+    # them and can't store raw events.
+    raw_inner = (
+        CacheKVStorage(default_cache, raw=True)
+        if isinstance(default_cache, CommonRedisCache)
+        else None
+    )
+    return EventProcessingStore(CacheKVStorage(default_cache), raw_inner=raw_inner)
@@ -11,4 +11,9 @@ def RedisClusterEventProcessingStore(**options) -> EventProcessingStore:
 
     Keyword argument are forwarded to the ``RedisClusterCache`` constructor.
     """
-    return EventProcessingStore(CacheKVStorage(RedisClusterCache(**options)))
+    cache = RedisClusterCache(**options)
+    return EventProcessingStore(
+        CacheKVStorage(cache),
+        # The Redis cache stores values JSON encoded, raw values are stored as is.
+        raw_inner=CacheKVStorage(cache, raw=True),
+    )
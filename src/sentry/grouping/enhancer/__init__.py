@@ -1,4 +1,5 @@
 import base64
+import functools
 import os
 import zlib
 
@@ -16,6 +17,7 @@ from .matchers import (
     CalleeMatch,
     CallerMatch,
     ExceptionFieldMatch,
+    FamilyMatch,
     FrameMatch,
     Match,
     create_match_frame,
@@ -116,6 +118,24 @@ class Enhancements:
         self._modifier_rules = [rule for rule in self.iter_rules() if rule.is_modifier]
         self._updater_rules = [rule for rule in self.iter_rules() if rule.is_updater]
 
+        # Rules that can match frames of the given families, see
+        # ``_get_rules_for_frames``.
+        self._rules_by_families = {}
+
+    def _get_rules_for_frames(self, rules, match_frames):
+        """Returns the rules that can match any of the given frames, based on
+        their families.  Most rules only apply to one family, so this skips
+        the majority of them for most stack traces.
+        """
+        families = frozenset(frame["family"] for frame in match_frames)
+        cache_key = (id(rules), families)
+        rv = self._rules_by_families.get(cache_key)
+        if rv is None:
+            rv = self._rules_by_families[cache_key] = [
+                rule for rule in rules if rule._families is None or rule._families & families
+            ]
+        return rv
+
     def apply_modifications_to_frame(self, frames, platform, exception_data):
         """This applies the frame modifications to the frames itself.  This
         does not affect grouping.
@@ -125,7 +145,7 @@ class Enhancements:
 
         match_frames = [create_match_frame(frame, platform) for frame in frames]
 
-        for rule in self._modifier_rules:
+        for rule in self._get_rules_for_frames(self._modifier_rules, match_frames):
             for idx, action in rule.get_matching_frame_actions(
                 match_frames, platform, exception_data, cache
             ):
@@ -139,7 +159,7 @@ class Enhancements:
 
         stacktrace_state = StacktraceState()
         # Apply direct frame actions and update the stack state alongside
-        for rule in self._updater_rules:
+        for rule in self._get_rules_for_frames(self._updater_rules, match_frames):
 
             for idx, action in rule.get_matching_frame_actions(
                 match_frames, platform, exception_data, cache
@@ -251,6 +271,14 @@ class Enhancements:
     def loads(cls, data):
         if isinstance(data, str):
             data = data.encode("ascii", "ignore")
+        return cls._loads(data)
+
+    @classmethod
+    @functools.lru_cache(maxsize=100)
+    def _loads(cls, data):
+        # Enhancements are loaded for every event that is grouped, but there
+        # are only a few different ones in use. They are never modified, so
+        # the same instance can be shared.
         padded = data + b"=" * (4 - (len(data) % 4))
         try:
             return cls._from_config_structure(
@@ -285,6 +313,19 @@ class Rule:
             else:
                 self._other_matchers.append(matcher)
 
+        # Evaluate cheap matchers first, to avoid glob matching frames that
+        # don't match anyway.
+        self._other_matchers.sort(key=lambda m: not getattr(m, "is_cheap", False))
+
+        # The families of frames this rule can match, ``None`` if any.
+        self._families = None
+        for matcher in self._other_matchers:
+            if isinstance(matcher, FamilyMatch) and matcher.families is not None:
+                if self._families is None:
+                    self._families = matcher.families
+                else:
+                    self._families &= matcher.families
+
         self.actions = actions
         self._is_updater = any(action.is_updater for action in actions)
         self._is_modifier = any(action.is_modifier for action in actions)
@@ -27,6 +27,10 @@ SHORT_MATCH_KEYS = {v: k for k, v in MATCH_KEYS.items()}
 assert len(SHORT_MATCH_KEYS) == len(MATCH_KEYS)  # assert short key names are not reused
 
 FAMILIES = {"native": "N", "javascript": "J", "all": "a"}
+
+# Characters with a special meaning in glob patterns. Everything before the
+# first of them is matched literally.
+GLOB_SPECIAL_CHARS = b"*?[]{}\\"
 REVERSE_FAMILIES = {v: k for k, v in FAMILIES.items()}
 
 
@@ -113,11 +117,22 @@ class Match:
         return FrameMatch.from_key(key, arg, negated)
 
 
+def get_literal_prefix(pattern: bytes) -> bytes:
+    """Return the part of a glob pattern that must match literally."""
+    for idx, char in enumerate(pattern):
+        if char in GLOB_SPECIAL_CHARS:
+            return pattern[:idx]
+    return pattern
+
+
 class FrameMatch(Match):
 
     # Global registry of matchers
     instances = {}
 
+    # Matchers that are cheap to evaluate are checked first by rules.
+    is_cheap = False
+
     @classmethod
     def from_key(cls, key, pattern, negated):
 
@@ -221,10 +236,20 @@ class PathMatch(PathLikeMatch):
 
 
 class FamilyMatch(FrameMatch):
+
+    is_cheap = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._flags = set(self._encoded_pattern.split(b","))
 
+    @property
+    def families(self):
+        """The families of frames this can match, or ``None`` if any."""
+        if self.negated or b"all" in self._flags:
+            return None
+        return frozenset(self._flags)
+
     def _positive_frame_match(self, match_frame, platform, exception_data, cache):
         if b"all" in self._flags:
             return True
@@ -233,6 +258,9 @@ class FamilyMatch(FrameMatch):
 
 
 class InAppMatch(FrameMatch):
+
+    is_cheap = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._ref_val = get_rule_bool(self.pattern)
@@ -243,15 +271,27 @@ class InAppMatch(FrameMatch):
 
 
 class FunctionMatch(FrameMatch):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._literal_prefix = get_literal_prefix(self._encoded_pattern)
+
     def _positive_frame_match(self, match_frame, platform, exception_data, cache):
+        function = match_frame["function"]
+        # Most frames can be ruled out without matching the whole pattern.
+        if not function.startswith(self._literal_prefix):
+            return False
 
-        return cached(cache, glob_match, match_frame["function"], self._encoded_pattern)
+        return cached(cache, glob_match, function, self._encoded_pattern)
 
 
 class FrameFieldMatch(FrameMatch):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._literal_prefix = get_literal_prefix(self._encoded_pattern)
+
     def _positive_frame_match(self, match_frame, platform, exception_data, cache):
         field = match_frame[self.field]
-        if field is None:
+        if field is None or not field.startswith(self._literal_prefix):
             return False
 
         return cached(cache, glob_match, field, self._encoded_pattern)
@@ -0,0 +1,112 @@
+"""
+Cache of the groups that the hashes of a project are assigned to.
+
+Nearly all events belong to existing groups, whose hashes keep mapping to the
+same group from one event to the next. `get_cached_group_id` lets
+`_save_aggregate` find that group without querying ``GroupHash`` rows, once
+it has resolved them from Postgres and cached them with `cache_group_hashes`.
+
+Entries are kept in the default cache and in a process-local tier, and are
+stamped with a generation of their project. Everything that changes the
+group or state of existing ``GroupHash`` rows (discards, deletions, merges,
+unmerges and splits) calls `invalidate_grouphash_cache`, which starts a new
+generation and so invalidates every entry of the project, in all processes.
+"""
+
+import uuid
+from typing import Iterable, Optional, Sequence, Tuple
+
+from django.core.cache import cache
+from django.db import router, transaction
+
+from sentry.models.grouphash import GroupHash
+from sentry.utils import metrics
+from sentry.utils.lru import LRUCache
+
+__all__ = ("get_cached_group_id", "cache_group_hashes", "invalidate_grouphash_cache")
+
+GROUPHASH_CACHE_TTL = 300
+
+# Generations outlive the entries stamped with them. Once a generation
+# expires, a new one is started and existing entries are ignored.
+GENERATION_TTL = 3600
+
+# Entries of recently seen hashes by cache key, as pairs of generation and
+# group ID. Only the generation of the project is read from the default
+# cache for these.
+_local_cache: LRUCache[str, Tuple[str, int]] = LRUCache(max_items=10000, ttl=GROUPHASH_CACHE_TTL)
+
+
+def _generation_key(project_id: int) -> str:
+    return f"grouphash-gen:{project_id}"
+
+
+def _hash_key(project_id: int, hash: str) -> str:
+    return f"grouphash:{project_id}:{hash}"
+
+
+def get_cached_group_id(
+    project_id: int, hashes: Sequence[str]
+) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Returns the ID of the group that all of ``hashes`` are cached as assigned
+    to, if any, together with the current generation of the project. Pass
+    the generation to `cache_group_hashes` after resolving the hashes from
+    the database, so that these entries are dropped if the hashes have been
+    invalidated in the meantime.
+    """
+    hash_keys = [_hash_key(project_id, hash) for hash in hashes]
+    generation_key = _generation_key(project_id)
+
+    entries = _local_cache.get_many(hash_keys)
+    results = cache.get_many([generation_key] + [key for key in hash_keys if key not in entries])
+    generation = results.pop(generation_key, None)
+    _local_cache.set_many(results)
+    entries.update(results)
+
+    if generation is None:
+        # Either no generation was started yet or it was evicted. Entries that
+        # are stamped with an older generation can't be trusted anymore.
+        generation = uuid.uuid4().hex
+        cache.add(generation_key, generation, GENERATION_TTL)
+
+    group_ids = set()
+    for key in hash_keys:
+        entry = entries.get(key)
+        if entry is None or entry[0] != generation:
+            group_ids.add(None)
+        else:
+            group_ids.add(entry[1])
+
+    group_id = group_ids.pop() if len(group_ids) == 1 else None
+    metrics.incr("grouphash_cache.lookup", tags={"cache_hit": str(group_id is not None).lower()})
+    return group_id, generation
+
+
+def cache_group_hashes(
+    project_id: int, generation: str, hashes: Iterable[str], group_id: int
+) -> None:
+    """
+    Caches ``hashes`` as assigned to the group once the current transaction,
+    if any, is committed.
+    """
+    entries = {_hash_key(project_id, hash): (generation, group_id) for hash in hashes}
+    if not entries:
+        return
+
+    def set_entries() -> None:
+        cache.set_many(entries, GROUPHASH_CACHE_TTL)
+        _local_cache.set_many(entries)
+
+    transaction.on_commit(set_entries, using=router.db_for_write(GroupHash))
+
+
+def invalidate_grouphash_cache(project_id: int) -> None:
+    """
+    Invalidates the cached groups of all hashes of the project once the
+    current transaction, if any, is committed.
+    """
+    transaction.on_commit(
+        lambda: cache.set(_generation_key(project_id), uuid.uuid4().hex, GENERATION_TTL),
+        using=router.db_for_write(GroupHash),
+    )
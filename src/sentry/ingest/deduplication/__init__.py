@@ -0,0 +1,22 @@
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+
+from sentry.utils.services import LazyServiceWrapper
+
+from .base import Deduplicator
+
+backend = LazyServiceWrapper(
+    Deduplicator,
+    settings.SENTRY_INGEST_DEDUPLICATION_BACKEND,
+    settings.SENTRY_INGEST_DEDUPLICATION_OPTIONS,
+)
+backend.expose(locals())
+
+if TYPE_CHECKING:
+    # This is all too dynamic for mypy, so manually set the same attributes from
+    # Deduplicator.__all__:
+    __deduplicator__ = Deduplicator()
+    validate = __deduplicator__.validate
+    get_duplicates = __deduplicator__.get_duplicates
+    mark_seen = __deduplicator__.mark_seen
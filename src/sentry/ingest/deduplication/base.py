@@ -0,0 +1,36 @@
+from typing import Collection, Set, Tuple
+
+from sentry.utils.services import Service
+
+# An event is identified by its project ID and event ID.
+EventKey = Tuple[int, str]
+
+
+class Deduplicator(Service):
+    """
+    Remembers which events have been processed by the ingest consumer, so
+    events that are consumed a second time (e.g. because a consumer died
+    before it could commit its offsets) are not processed again.
+
+    Both methods take a whole batch of events, so that backends can check and
+    mark them with a single round trip.
+    """
+
+    __all__ = ("validate", "get_duplicates", "mark_seen")
+
+    def validate(self) -> None:
+        pass
+
+    def get_duplicates(self, events: Collection[EventKey]) -> Set[EventKey]:
+        """
+        Return the events that have been marked as seen already.
+        """
+        return set()
+
+    def mark_seen(self, events: Collection[EventKey]) -> None:
+        """
+        Mark events as seen. This should be called once the events have been
+        processed, so events that failed to process are not dropped when they
+        are consumed again.
+        """
+        pass
@@ -0,0 +1,35 @@
+from typing import Any, Collection, Set
+
+from django.core.cache import cache
+
+from .base import Deduplicator, EventKey
+
+
+class CacheDeduplicator(Deduplicator):
+    """
+    Remembers seen events in the Django cache for ``timeout`` seconds.
+
+    This is only as reliable as the cache it is backed by. With memcached,
+    which gives no consistency guarantees, it is not much more than a best
+    effort to not process events twice while a consumer is in a restart loop.
+    """
+
+    def __init__(self, timeout: int = 3600, **options: Any) -> None:
+        self.timeout = timeout
+
+    def _make_key(self, event: EventKey) -> str:
+        project_id, event_id = event
+        return f"ev:{project_id}:{event_id}"
+
+    def get_duplicates(self, events: Collection[EventKey]) -> Set[EventKey]:
+        if not events:
+            return set()
+
+        keys = {self._make_key(event): event for event in events}
+        return {keys[key] for key in cache.get_many(list(keys))}
+
+    def mark_seen(self, events: Collection[EventKey]) -> None:
+        if not events:
+            return
+
+        cache.set_many({self._make_key(event): "" for event in events}, self.timeout)
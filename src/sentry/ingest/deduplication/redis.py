@@ -0,0 +1,94 @@
+import logging
+import time
+import zlib
+from collections import defaultdict
+from typing import Collection, DefaultDict, List, Set
+
+from redis.exceptions import RedisError
+
+from sentry.exceptions import InvalidConfiguration
+from sentry.utils import metrics, redis
+
+from .base import Deduplicator, EventKey
+
+logger = logging.getLogger(__name__)
+
+
+class RedisDeduplicator(Deduplicator):
+    """
+    Remembers seen events in Redis sets of event IDs.
+
+    Sets are bucketed by time: events are added to the set of the current
+    bucket of ``window`` seconds and looked up in the sets of the current and
+    the previous bucket, so they are remembered for at least ``window`` and at
+    most two times ``window`` seconds. Each project's bucket is split into
+    ``shards`` sets, to spread the events of large projects across a Redis
+    cluster.
+    """
+
+    def __init__(self, cluster: str = "default", window: int = 3600, shards: int = 16) -> None:
+        self.cluster = redis.redis_clusters.get(cluster)
+        self.window = window
+        self.shards = shards
+
+        self.validate()
+
+    def validate(self) -> None:
+        if self.window <= 0:
+            raise InvalidConfiguration("window must be positive")
+
+        if self.shards <= 0:
+            raise InvalidConfiguration("shards must be positive")
+
+    def _make_key(self, event: EventKey, bucket: int) -> str:
+        project_id, event_id = event
+        shard = zlib.crc32(event_id.encode("utf-8")) % self.shards
+        return f"ingest-dedup:{project_id}:{shard}:{bucket}"
+
+    def get_duplicates(self, events: Collection[EventKey]) -> Set[EventKey]:
+        if not events:
+            return set()
+
+        events = list(events)
+        bucket = int(time.time() // self.window)
+        try:
+            with self.cluster.pipeline(transaction=False) as pipeline:
+                for event in events:
+                    _, event_id = event
+                    pipeline.sismember(self._make_key(event, bucket), event_id)
+                    pipeline.sismember(self._make_key(event, bucket - 1), event_id)
+                results = pipeline.execute()
+        except RedisError:
+            # Rather process events twice than not at all.
+            logger.exception("Failed to look up seen events")
+            metrics.incr("ingest_consumer.deduplication.error", tags={"op": "get_duplicates"})
+            return set()
+
+        return {
+            event
+            for event, current, previous in zip(events, results[::2], results[1::2])
+            if current or previous
+        }
+
+    def mark_seen(self, events: Collection[EventKey]) -> None:
+        if not events:
+            return
+
+        bucket = int(time.time() // self.window)
+        event_ids: DefaultDict[str, List[str]] = defaultdict(list)
+        for event in events:
+            _, event_id = event
+            event_ids[self._make_key(event, bucket)].append(event_id)
+
+        try:
+            with self.cluster.pipeline(transaction=False) as pipeline:
+                for key, ids in event_ids.items():
+                    pipeline.sadd(key, *ids)
+                    # Keep the set until the bucket after it is over.
+                    pipeline.expire(key, 2 * self.window)
+                pipeline.execute()
+        except RedisError:
+            # Processing the events succeeded, failing the batch would only
+            # cause them to be processed again.
+            logger.exception("Failed to mark events as seen")
+            metrics.incr("ingest_consumer.deduplication.error", tags={"op": "mark_seen"})
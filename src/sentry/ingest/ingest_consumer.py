@@ -1,11 +1,14 @@
 import functools
 import logging
+import multiprocessing
 import random
+import signal
 import time
-from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from typing import (
     Any,
     Callable,
+    List,
     Mapping,
     MutableMapping,
     MutableSequence,
@@ -20,12 +23,14 @@ from typing import (
 import msgpack
 import sentry_sdk
 from django.conf import settings
-from django.core.cache import cache
+from django.db import connections
 
-from sentry import eventstore, features
+from sentry import eventstore, features, options
 from sentry.attachments import CachedAttachment, attachment_cache
 from sentry.event_manager import save_attachment
 from sentry.eventstore.processing import event_processing_store
+from sentry.ingest import deduplication
+from sentry.ingest.deduplication.base import EventKey
 from sentry.ingest.types import ConsumerType
 from sentry.ingest.userreport import Conflict, save_userreport
 from sentry.killswitches import killswitch_matches_context
@@ -56,9 +61,48 @@ class AsyncResult(NamedTuple):  # TODO: Use Generic[T] with 3.7+
 Message = Any
 
 
+class UnparsedEvent(NamedTuple):
+    """
+    An event payload that is stored in the processing store as is, without
+    parsing it first. The routing fields are taken from the Kafka message.
+    """
+
+    project_id: int
+    event_id: str
+    payload: bytes
+
+
 class IngestConsumerWorker(AbstractBatchWorker):
-    def __init__(self, process_event_executor: Optional[ThreadPoolExecutor] = None) -> None:
+    """
+    Events are processed in one of three ways:
+
+    * by default, synchronously on the consumer thread,
+    * with a ``process_event_executor``, storing events in the processing
+      store happens on the thread pool while the rest runs on the consumer
+      thread,
+    * with ``processes``, events are sharded by project across a pool of
+      worker processes, which do all of the processing including parsing the
+      payload. Events of one project are processed in order by a single
+      process.
+
+    In all cases the batch is only done (and its offsets get committed) once
+    every message of it has been processed.
+
+    Events of a batch are checked for duplicates all at once before they are
+    processed, and marked as seen all at once afterwards (per shard if
+    processed on the process pool).
+    """
+
+    def __init__(
+        self,
+        process_event_executor: Optional[ThreadPoolExecutor] = None,
+        processes: Optional[int] = None,
+    ) -> None:
+        assert not (process_event_executor and processes), "executor and processes are exclusive"
         self.__process_event_executor = process_event_executor
+        self.__transactions_topic = get_transactions_topic()
+        self.__processes = processes
+        self.__process_pool = create_process_pool(processes) if processes else None
         if self.__process_event_executor is None:
             self.__process_event = process_event
         else:
@@ -67,7 +111,12 @@ class IngestConsumerWorker(AbstractBatchWorker):
             )
 
     def process_message(self, message) -> Message:
+        topic = message.topic()
         message = msgpack.unpackb(message.value(), use_list=False)
+        if topic == self.__transactions_topic and message["type"] == "event":
+            # Relay only produces transactions to this topic, which allows to
+            # route them without parsing the payload.
+            message["is_transaction"] = True
         return message
 
     def flush_batch(self, batch):
@@ -94,15 +143,29 @@ class IngestConsumerWorker(AbstractBatchWorker):
             ]
         ] = []
 
+        # Events to be processed on the process pool, if there is one.
+        events: MutableSequence[Message] = []
+
+        # Events processed by this process, to be marked as seen once the
+        # batch is done.
+        seen_events: MutableSequence[EventKey] = []
+        process_event_func = functools.partial(self.__process_event, seen_events=seen_events)
+
         projects_to_fetch = set()
 
+        with metrics.timer("ingest_consumer.deduplicate_events"):
+            batch = filter_duplicate_events(batch)
+
         with metrics.timer("ingest_consumer.prepare_messages"):
             for message in batch:
                 message_type = message["type"]
                 projects_to_fetch.add(message["project_id"])
 
                 if message_type == "event":
-                    other_messages.append((self.__process_event, message))
+                    if self.__process_pool is not None:
+                        events.append(message)
+                    else:
+                        other_messages.append((process_event_func, message))
                 elif message_type == "attachment_chunk":
                     attachment_chunks.append(message)
                 elif message_type == "attachment":
@@ -124,6 +187,21 @@ class IngestConsumerWorker(AbstractBatchWorker):
                 for attachment_chunk in attachment_chunks:
                     process_attachment_chunk(attachment_chunk, projects=projects)
 
+        shard_futures: List["Future[None]"] = []
+        if events:
+            assert self.__process_pool is not None and self.__processes
+            for shard in shard_messages_by_project(events, self.__processes):
+                # Only send the projects the shard needs to the worker.
+                shard_projects = {
+                    project_id: projects[project_id]
+                    for project_id in {int(message["project_id"]) for message in shard}
+                    if project_id in projects
+                }
+                shard_futures.append(
+                    self.__process_pool.submit(process_event_shard, shard, shard_projects)
+                )
+            metrics.timing("ingest_consumer.process_event_shards", len(shard_futures))
+
         if other_messages:
             with metrics.timer("ingest_consumer.process_other_messages_batch"):
                 other_messages_flush_start = time.monotonic()
@@ -132,25 +210,41 @@ class IngestConsumerWorker(AbstractBatchWorker):
                 # easily associate a future with its callback once completed.
                 results: MutableMapping["Future[Any]", "AsyncResult[Any]"] = {}
 
-                # Execute synchronous tasks and dispatch asynchronous tasks.
-                for processing_func, message in other_messages:
-                    result = processing_func(message, projects)
-                    if isinstance(result, AsyncResult):
-                        results[result.future] = result
-
-                # Wait for any asynchronous work to be completed, invoking
-                # callbacks (on the main thread) as results are ready.
-                for future in as_completed(results.keys()):
-                    results[future].callback(future)
+                try:
+                    # Execute synchronous tasks and dispatch asynchronous tasks.
+                    for processing_func, message in other_messages:
+                        result = processing_func(message, projects)
+                        if isinstance(result, AsyncResult):
+                            results[result.future] = result
+
+                    # Wait for any asynchronous work to be completed, invoking
+                    # callbacks (on the main thread) as results are ready.
+                    for future in as_completed(results.keys()):
+                        results[future].callback(future)
+                finally:
+                    # Also if the batch fails, so the events that have been
+                    # processed already are not processed again when it is
+                    # retried.
+                    with metrics.timer("ingest_consumer.mark_events_seen"):
+                        deduplication.mark_seen(seen_events)
 
                 metrics.timing(
                     "ingest_consumer.process_other_messages_batch.normalized",
                     (time.monotonic() - other_messages_flush_start) / len(other_messages),
                 )
 
+        if shard_futures:
+            with metrics.timer("ingest_consumer.wait_for_process_event_shards"):
+                # Raise the first error, if any, to fail the batch before
+                # its offsets are committed.
+                for future in shard_futures:
+                    future.result()
+
     def shutdown(self):
         if self.__process_event_executor is not None:
             self.__process_event_executor.shutdown()
+        if self.__process_pool is not None:
+            self.__process_pool.shutdown()
 
 
 def trace_func(**span_kwargs):
@@ -169,8 +263,12 @@ def trace_func(**span_kwargs):
 
 
 @metrics.wraps("ingest_consumer.process_event")
-def _do_process_event(message: Message, projects: Mapping[int, Project]) -> None:
-    result = _load_event(message, projects)
+def _do_process_event(
+    message: Message,
+    projects: Mapping[int, Project],
+    seen_events: Optional[MutableSequence[EventKey]] = None,
+) -> None:
+    result = _load_event(message, projects, seen_events)
     if result is None:
         return
 
@@ -179,7 +277,9 @@ def _do_process_event(message: Message, projects: Mapping[int, Project]) -> None
 
 
 def _load_event(
-    message: Message, projects: Mapping[int, Project]
+    message: Message,
+    projects: Mapping[int, Project],
+    seen_events: Optional[MutableSequence[EventKey]] = None,
 ) -> Optional[Tuple[Any, Callable[[str], None]]]:
     """
     Perform some initial filtering and deserialize the message payload. If the
@@ -187,6 +287,14 @@ def _load_event(
     function that can be called with the event's storage key to resume
     processing after the event has been persisted and is available to be read by
     other processing components.
+
+    Transactions may skip deserialization and are returned as
+    ``UnparsedEvent`` instead, see ``_should_store_unparsed``.
+
+    If ``seen_events`` is given, the event is part of a batch that has been
+    checked for duplicates already, see ``filter_duplicate_events``. Instead
+    of marking the event as seen right away, it's added to ``seen_events`` to
+    be marked as seen with the rest of the batch.
     """
     payload = message["payload"]
     start_time = float(message["start_time"])
@@ -194,6 +302,7 @@ def _load_event(
     project_id = int(message["project_id"])
     remote_addr = message.get("remote_addr")
     attachments = message.get("attachments") or ()
+    is_transaction = bool(message.get("is_transaction"))
 
     sentry_sdk.set_extra("event_id", event_id)
     sentry_sdk.set_extra("len_attachments", len(attachments))
@@ -203,20 +312,7 @@ def _load_event(
 
     # check that we haven't already processed this event (a previous instance of the forwarder
     # died before it could commit the event queue offset)
-    #
-    # XXX(markus): I believe this code is extremely broken:
-    #
-    # * it practically uses memcached in prod which has no consistency
-    #   guarantees (no idea how we don't run into issues there)
-    #
-    # * a TTL of 1h basically doesn't guarantee any deduplication at all. It
-    #   just guarantees a good error message... for one hour.
-    #
-    # This code has been ripped from the old python store endpoint. We're
-    # keeping it around because it does provide some protection against
-    # reprocessing good events if a single consumer is in a restart loop.
-    deduplication_key = f"ev:{project_id}:{event_id}"
-    if cache.get(deduplication_key) is not None:
+    if seen_events is None and deduplication.get_duplicates([(project_id, event_id)]):
         logger.warning(
             "pre-process-forwarder detected a duplicated event" " with id:%s for project:%s.",
             event_id,
@@ -242,17 +338,25 @@ def _load_event(
         logger.error("Project for ingested event does not exist: %s", project_id)
         return
 
-    # Parse the JSON payload. This is required to compute the cache key and
-    # call process_event. The payload will be put into Kafka raw, to avoid
-    # serializing it again.
-    # XXX: Do not use CanonicalKeyDict here. This may break preprocess_event
-    # which assumes that data passed in is a raw dictionary.
-    data = json.loads(payload)
+    data: Union[Any, UnparsedEvent]
+    if is_transaction and _should_store_unparsed():
+        # Transactions don't need to be looked at before save_event_transaction,
+        # which parses them when reading them from the processing store.
+        data = UnparsedEvent(project_id, event_id, payload)
+        event_type = "transaction"
+    else:
+        # Parse the JSON payload. This is required to compute the cache key and
+        # call process_event. The payload will be put into Kafka raw, to avoid
+        # serializing it again.
+        # XXX: Do not use CanonicalKeyDict here. This may break preprocess_event
+        # which assumes that data passed in is a raw dictionary.
+        data = json.loads(payload)
+        event_type = data.get("type") or "null"
 
     if project_id == settings.SENTRY_PROJECT:
         metrics.incr(
             "internal.captured.ingest_consumer.parsed",
-            tags={"event_type": data.get("type") or "null"},
+            tags={"event_type": event_type},
         )
 
     if killswitch_matches_context(
@@ -260,7 +364,7 @@ def _load_event(
         {
             "organization_id": project.organization_id,
             "project_id": project.id,
-            "event_type": data.get("type") or "null",
+            "event_type": event_type,
             "has_attachments": bool(attachments),
             "event_id": event_id,
         },
@@ -279,7 +383,7 @@ def _load_event(
                     cache_key, attachments=attachment_objects, timeout=CACHE_TIMEOUT
                 )
 
-        if data.get("type") == "transaction":
+        if event_type == "transaction":
             # No need for preprocess/process for transactions thus submit
             # directly transaction specific save_event task.
             save_event_transaction.delay(
@@ -303,8 +407,11 @@ def _load_event(
                     has_attachments=bool(attachments),
                 )
 
-        # remember for an 1 hour that we saved this event (deduplication protection)
-        cache.set(deduplication_key, "", CACHE_TIMEOUT)
+        # remember that we saved this event (deduplication protection)
+        if seen_events is None:
+            deduplication.mark_seen([(project_id, event_id)])
+        else:
+            seen_events.append((project_id, event_id))
 
         # emit event_accepted once everything is done
         event_accepted.send_robust(ip=remote_addr, data=data, project=project, sender=process_event)
@@ -312,20 +419,51 @@ def _load_event(
     return data, dispatch_task
 
 
-def _store_event(data) -> str:
+def _should_store_unparsed() -> bool:
+    return (
+        event_processing_store.supports_raw
+        # Receivers of event_accepted expect the parsed event.
+        and not event_accepted.has_listeners(sender=process_event)
+        and random.random() < options.get("store.unparsed-transactions-ingest-consumer-rate")
+    )
+
+
+def _store_event(data: Union[Any, UnparsedEvent]) -> str:
     with metrics.timer("ingest_consumer._store_event"):
+        if isinstance(data, UnparsedEvent):
+            return event_processing_store.store_raw(data.project_id, data.event_id, data.payload)
         return event_processing_store.store(data)
 
 
+def get_transactions_topic() -> Optional[str]:
+    """
+    Return the name of the topic that only contains transactions, unless it
+    is shared with other consumer types.
+    """
+    topic = ConsumerType.get_topic_name(ConsumerType.Transactions)
+    other_topics = {
+        ConsumerType.get_topic_name(ConsumerType.Events),
+        ConsumerType.get_topic_name(ConsumerType.Attachments),
+    }
+    return topic if topic not in other_topics else None
+
+
 @trace_func(name="ingest_consumer.process_event")
-def process_event(message: Message, projects: Mapping[int, Project]) -> None:
-    return _do_process_event(message, projects)
+def process_event(
+    message: Message,
+    projects: Mapping[int, Project],
+    seen_events: Optional[MutableSequence[EventKey]] = None,
+) -> None:
+    return _do_process_event(message, projects, seen_events)
 
 
 def process_event_async(
-    executor: ThreadPoolExecutor, message: Message, projects: Mapping[int, Project]
+    executor: ThreadPoolExecutor,
+    message: Message,
+    projects: Mapping[int, Project],
+    seen_events: Optional[MutableSequence[EventKey]] = None,
 ) -> Optional["AsyncResult[str]"]:
-    result = _load_event(message, projects)
+    result = _load_event(message, projects, seen_events)
     if result is None:
         return None
 
@@ -336,6 +474,107 @@ def process_event_async(
     )
 
 
+def filter_duplicate_events(messages: Sequence[Message]) -> Sequence[Message]:
+    """
+    Drop events that have been processed already, or that occur more than
+    once in ``messages``. All events are checked with a single call to the
+    deduplication backend.
+    """
+    events = {
+        (int(message["project_id"]), message["event_id"])
+        for message in messages
+        if message["type"] == "event"
+    }
+    if not events:
+        return messages
+
+    duplicates = set(deduplication.get_duplicates(events))
+
+    rv = []
+    for message in messages:
+        if message["type"] == "event":
+            event = (int(message["project_id"]), message["event_id"])
+            if event in duplicates:
+                logger.warning(
+                    "pre-process-forwarder detected a duplicated event with id:%s for project:%s.",
+                    event[1],
+                    event[0],
+                )
+                metrics.incr("ingest_consumer.duplicate_events")
+                continue
+            # Further occurrences of the event in this batch are duplicates.
+            duplicates.add(event)
+        rv.append(message)
+
+    return rv
+
+
+def shard_messages_by_project(
+    messages: Sequence[Message], num_shards: int
+) -> Sequence[Sequence[Message]]:
+    """
+    Split messages into at most ``num_shards`` shards, keeping all messages
+    of a project in the same shard and in their original order.
+    """
+    shards: MutableMapping[int, MutableSequence[Message]] = {}
+    for message in messages:
+        shards.setdefault(int(message["project_id"]) % num_shards, []).append(message)
+    return list(shards.values())
+
+
+@metrics.wraps("ingest_consumer.process_event_shard")
+def process_event_shard(messages: Sequence[Message], projects: Mapping[int, Project]) -> None:
+    """
+    Process the events of a shard in order. This runs in a worker process of
+    the pool created by ``create_process_pool``.
+    """
+    mark_scope_as_unsafe()
+    seen_events: MutableSequence[EventKey] = []
+    try:
+        for message in messages:
+            process_event(message, projects, seen_events)
+    finally:
+        deduplication.mark_seen(seen_events)
+
+
+def _process_pool_initializer() -> None:
+    # Shutdown is coordinated by the consumer process, which lets the pool
+    # finish the batch in flight before exiting. Interrupts sent to the whole
+    # process group must not abort the workers in the middle of it.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+
+def _process_pool_ready() -> None:
+    pass
+
+
+def create_process_pool(processes: int) -> ProcessPoolExecutor:
+    """
+    Create a pool of worker processes to process events on. The workers are
+    forked from the consumer process, which saves them from having to load
+    and configure Sentry again.
+
+    The workers are started right away, before the consumer starts any
+    threads of its own.
+    """
+    # Database connections can't be shared between processes. A worker
+    # can't even get rid of an inherited connection without terminating
+    # the session of the consumer process, so close them before forking.
+    # Both sides establish new ones on demand.
+    connections.close_all()
+
+    pool = ProcessPoolExecutor(
+        processes,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_process_pool_initializer,
+    )
+    # The pool forks its workers when tasks are submitted.
+    for future in [pool.submit(_process_pool_ready) for _ in range(processes)]:
+        future.result()
+    return pool
+
+
 @trace_func(name="ingest_consumer.process_attachment_chunk")
 @metrics.wraps("ingest_consumer.process_attachment_chunk")
 def process_attachment_chunk(message, projects):
@@ -424,14 +663,21 @@ def process_userreport(message, projects) -> None:
 
 
 def get_ingest_consumer(
-    consumer_types, once=False, executor: Optional[ThreadPoolExecutor] = None, **options
+    consumer_types,
+    once=False,
+    executor: Optional[ThreadPoolExecutor] = None,
+    processes: Optional[int] = None,
+    **options,
 ):
     """
     Handles events coming via a kafka queue.
 
     The events should have already been processed (normalized... ) upstream (by Relay).
+
+    Events are processed on a pool of ``processes`` worker processes if set,
+    see ``IngestConsumerWorker``.
     """
     topic_names = {ConsumerType.get_topic_name(consumer_type) for consumer_type in consumer_types}
     return create_batching_kafka_consumer(
-        topic_names=topic_names, worker=IngestConsumerWorker(executor), **options
+        topic_names=topic_names, worker=IngestConsumerWorker(executor, processes), **options
     )
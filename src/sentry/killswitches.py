@@ -9,7 +9,19 @@ features and more performant.
 
 import copy
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import click
 
@@ -21,6 +33,15 @@ KillswitchConfig = List[Condition]
 LegacyKillswitchConfig = Union[KillswitchConfig, List[int]]
 Context = Dict[str, Any]
 
+#: A killswitch config compiled into lookup tables. Conditions are grouped by
+#: the fields they constrain, and every group holds the set of value tuples
+#: that match.
+CompiledKillswitchConfig = List[Tuple[Tuple[str, ...], FrozenSet[Tuple[str, ...]]]]
+
+#: The most recently compiled config of every killswitch, along with the raw
+#: option value it was compiled from.
+_compiled_killswitches: Dict[str, Tuple[Any, CompiledKillswitchConfig]] = {}
+
 
 def _update_project_configs(
     old_option_value: Sequence[Mapping[str, Any]], new_option_value: Sequence[Mapping[str, Any]]
@@ -251,24 +272,43 @@ def killswitch_matches_context(killswitch_name: str, context: Context) -> bool:
     return rv
 
 
+def _compile_value(option_value: KillswitchConfig) -> CompiledKillswitchConfig:
+    groups: Dict[Tuple[str, ...], Set[Tuple[str, ...]]] = {}
+    for condition in option_value:
+        fields = tuple(sorted(k for k, v in condition.items() if v is not None))
+        groups.setdefault(fields, set()).add(tuple(condition[k] for k in fields))
+
+    return [(fields, frozenset(values)) for fields, values in groups.items()]
+
+
+def _get_compiled_value(
+    killswitch_name: str, raw_option_value: LegacyKillswitchConfig
+) -> CompiledKillswitchConfig:
+    # Option values are served from the options store's local cache, so the
+    # same object is returned until that cache expires. Fall back to comparing
+    # by value so that a config that did not change is not compiled again.
+    cached = _compiled_killswitches.get(killswitch_name)
+    if cached is not None and (cached[0] is raw_option_value or cached[0] == raw_option_value):
+        return cached[1]
+
+    compiled = _compile_value(normalize_value(killswitch_name, copy.deepcopy(raw_option_value)))
+    _compiled_killswitches[killswitch_name] = (raw_option_value, compiled)
+    return compiled
+
+
 def _value_matches(
     killswitch_name: str, raw_option_value: LegacyKillswitchConfig, context: Context
 ) -> bool:
-    option_value = normalize_value(killswitch_name, raw_option_value)
-
-    for condition in option_value:
-        for field, matching_value in condition.items():
-            if matching_value is None:
-                continue
-
+    for fields, values in _get_compiled_value(killswitch_name, raw_option_value):
+        key = []
+        for field in fields:
             value = context.get(field)
             if value is None:
                 break
-
-            if str(value) != matching_value:
-                break
+            key.append(str(value))
         else:
-            return True
+            if tuple(key) in values:
+                return True
 
     return False
 
@@ -1,8 +1,18 @@
+from typing import Any, NamedTuple, Optional, Sequence, Tuple
+
 from symbolic import SourceView
 
+from sentry.utils.lru import LRUCache
 from sentry.utils.strings import codec_lookup
 
-__all__ = ["SourceCache", "SourceMapCache"]
+__all__ = ["SourceCache", "SourceMapCache", "artifact_cache", "artifact_index_cache"]
+
+#: Upper bound for the size of fetched artifacts kept in ``artifact_cache``.
+ARTIFACT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+#: Number of seconds for which fetched artifacts are shared between events.
+#: This bounds how long a re-uploaded release artifact may go unnoticed.
+ARTIFACT_CACHE_TTL = 60
 
 
 def is_utf8(codec):
@@ -10,6 +20,55 @@ def is_utf8(codec):
     return name in ("utf-8", "ascii")
 
 
+def make_source_view(source, encoding=None):
+    if isinstance(source, SourceView):
+        return source
+
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    # If an encoding is provided and it's not utf-8 compatible
+    # we try to re-encoding the source and create a source view
+    # from it.
+    elif encoding is not None and not is_utf8(encoding):
+        try:
+            source = source.decode(encoding).encode("utf-8")
+        except UnicodeError:
+            pass
+    return SourceView.from_bytes(source)
+
+
+class FetchedSource(NamedTuple):
+    url: str
+    body: bytes
+    view: SourceView
+    sourcemap_url: Optional[str]
+    size: int
+
+
+class FetchedSourceMap(NamedTuple):
+    view: Any
+    # (url, SourceView) pairs of sources embedded in the source map
+    inline_sources: Sequence[Tuple[str, SourceView]]
+    size: int
+
+
+class FetchError(NamedTuple):
+    type: type
+    data: dict
+    size: int = 1
+
+
+#: Process-wide cache of fetched and parsed sources and source maps, so that
+#: events of the same release do not fetch and parse them over and over. Holds
+#: ``FetchedSource``, ``FetchedSourceMap`` and ``FetchError`` entries.
+artifact_cache = LRUCache(
+    max_bytes=ARTIFACT_CACHE_MAX_BYTES, ttl=ARTIFACT_CACHE_TTL, sizeof=lambda entry: entry.size
+)
+
+#: Process-wide cache of decoded artifact indexes by release and dist.
+artifact_index_cache = LRUCache(max_items=100, ttl=ARTIFACT_CACHE_TTL)
+
+
 class SourceCache:
     def __init__(self):
         self._cache = {}
@@ -38,20 +97,7 @@ class SourceCache:
 
     def add(self, url, source, encoding=None):
         url = self._get_canonical_url(url)
-
-        if not isinstance(source, SourceView):
-            if isinstance(source, str):
-                source = source.encode("utf-8")
-            # If an encoding is provided and it's not utf-8 compatible
-            # we try to re-encoding the source and create a source view
-            # from it.
-            elif encoding is not None and not is_utf8(encoding):
-                try:
-                    source = source.decode(encoding).encode("utf-8")
-                except UnicodeError:
-                    pass
-            source = SourceView.from_bytes(source)
-        self._cache[url] = source
+        self._cache[url] = make_source_view(source, encoding)
 
     def add_error(self, url, error):
         url = self._get_canonical_url(url)
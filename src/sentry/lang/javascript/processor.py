@@ -37,7 +37,16 @@ from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path, set_path
 from sentry.utils.urls import non_standard_url_join
 
-from .cache import SourceCache, SourceMapCache
+from .cache import (
+    FetchedSource,
+    FetchedSourceMap,
+    FetchError,
+    SourceCache,
+    SourceMapCache,
+    artifact_cache,
+    artifact_index_cache,
+    make_source_view,
+)
 
 __all__ = ["JavaScriptStacktraceProcessor"]
 
@@ -430,6 +439,62 @@ def fetch_release_file(filename, release, dist=None):
     return result
 
 
+@metrics.wraps("sourcemaps.release_files")
+def fetch_release_files(filenames, release, dist=None):
+    """
+    Bulk version of ``fetch_release_file`` for release artifacts that are
+    known to be missing from the cache. Looks up all of them with a single
+    database query and returns a mapping of filename to result.
+    """
+    if not filenames:
+        return {}
+
+    dist_name = dist and dist.name or None
+    filename_idents = {
+        filename: [ReleaseFile.get_ident(f, dist_name) for f in ReleaseFile.normalize(filename)]
+        for filename in filenames
+    }
+
+    with metrics.timer("sourcemaps.release_artifacts_from_file"):
+        releasefiles = {
+            releasefile.ident: releasefile
+            for releasefile in ReleaseFile.objects.filter(
+                release_id=release.id,
+                dist_id=dist.id if dist else dist,
+                ident__in={ident for idents in filename_idents.values() for ident in idents},
+            ).select_related("file")
+        }
+
+    results = {}
+    missing_cache_keys = []
+    for filename, idents in filename_idents.items():
+        cache_key, cache_key_meta = get_cache_keys(filename, release, dist)
+
+        # Pick first one that matches in priority order.
+        releasefile = next((releasefiles[ident] for ident in idents if ident in releasefiles), None)
+        if releasefile is None:
+            missing_cache_keys.append(cache_key)
+            results[filename] = None
+            continue
+
+        with sentry_sdk.start_span(
+            op="JavaScriptStacktraceProcessor.fetch_release_files.fetch_and_cache"
+        ):
+            results[filename] = fetch_and_cache_artifact(
+                filename,
+                lambda: ReleaseFile.cache.getfile(releasefile),
+                cache_key,
+                cache_key_meta,
+                releasefile.file.headers,
+                compress_file,
+            )
+
+    if missing_cache_keys:
+        cache.set_many({cache_key: -1 for cache_key in missing_cache_keys}, 60)
+
+    return results
+
+
 @metrics.wraps("sourcemaps.get_from_archive")
 def get_from_archive(url: str, archive: ReleaseArchive) -> Tuple[bytes, dict]:
     candidates = ReleaseFile.normalize(url)
@@ -443,8 +508,23 @@ def get_from_archive(url: str, archive: ReleaseArchive) -> Tuple[bytes, dict]:
     raise KeyError(f"Not found in archive: '{url}'")
 
 
-@metrics.wraps("sourcemaps.load_artifact_index")
 def get_artifact_index(release, dist):
+    if not options.get("sourcemaps.process-cache.enabled"):
+        return load_artifact_index(release, dist)
+
+    # The index is wrapped in a tuple so that releases without an index are
+    # cached as well.
+    key = (release.id, dist and dist.id)
+    cached = artifact_index_cache.get(key)
+    if cached is None:
+        cached = (load_artifact_index(release, dist),)
+        artifact_index_cache.set(key, cached)
+
+    return cached[0]
+
+
+@metrics.wraps("sourcemaps.load_artifact_index")
+def load_artifact_index(release, dist):
     dist_name = dist and dist.name or None
 
     ident = ReleaseFile.get_ident(ARTIFACT_INDEX_FILENAME, dist_name)
@@ -470,6 +550,10 @@ def get_index_entry(release, dist, url) -> Optional[dict]:
         logger.error("sourcemaps.index_read_failed", exc_info=exc)
         return None
 
+    return find_index_entry(index, url)
+
+
+def find_index_entry(index, url) -> Optional[dict]:
     if index:
         for candidate in ReleaseFile.normalize(url):
             entry = index.get("files", {}).get(candidate)
@@ -579,6 +663,62 @@ def fetch_release_artifact(url, release, dist):
     if result:
         return result_from_cache(url, result)
 
+    return fetch_uncached_release_artifact(url, release, dist, cache_key, cache_key_meta)
+
+
+def fetch_release_artifacts(urls, release, dist):
+    """
+    Bulk version of ``fetch_release_artifact``, returning a mapping of url to
+    result for all ``urls``.
+
+    Looks up all urls in the cache with a single round trip. Artifacts that
+    are not cached and not part of a release archive are then looked up with
+    a single database query, instead of one per url.
+    """
+    cache_keys = {url: get_cache_keys(url, release, dist) for url in urls}
+    cached = cache.get_many([cache_key for cache_key, _ in cache_keys.values()])
+
+    results = {}
+    uncached_urls = []
+    for url in urls:
+        result = cached.get(cache_keys[url][0])
+        if result == -1:  # Cached as unavailable
+            results[url] = None
+        elif result:
+            results[url] = result_from_cache(url, result)
+        else:
+            uncached_urls.append(url)
+
+    if not uncached_urls:
+        return results
+
+    try:
+        index = get_artifact_index(release, dist)
+    except Exception as exc:
+        logger.error("sourcemaps.index_read_failed", exc_info=exc)
+        index = None
+
+    release_file_urls = []
+    for url in uncached_urls:
+        if find_index_entry(index, url) is None:
+            release_file_urls.append(url)
+        else:
+            cache_key, cache_key_meta = cache_keys[url]
+            results[url] = fetch_uncached_release_artifact(
+                url, release, dist, cache_key, cache_key_meta
+            )
+
+    # Fall back to maintain compatibility with old releases and versions of
+    # sentry-cli which upload files individually
+    with sentry_sdk.start_span(
+        op="JavaScriptStacktraceProcessor.fetch_release_artifacts.fetch_release_files"
+    ):
+        results.update(fetch_release_files(release_file_urls, release, dist))
+
+    return results
+
+
+def fetch_uncached_release_artifact(url, release, dist, cache_key, cache_key_meta):
     start = time.monotonic()
     with sentry_sdk.start_span(
         op="JavaScriptStacktraceProcessor.fetch_release_artifact.fetch_release_archive_for_url"
@@ -640,7 +780,9 @@ def fetch_release_artifact(url, release, dist):
     return result
 
 
-def fetch_file(url, project=None, release=None, dist=None, allow_scraping=True):
+def fetch_file(
+    url, project=None, release=None, dist=None, allow_scraping=True, release_artifacts=None
+):
     """
     Pull down a URL, returning a UrlResult object.
 
@@ -648,6 +790,9 @@ def fetch_file(url, project=None, release=None, dist=None, allow_scraping=True):
     event), then the internet. Caches the result of each of those two attempts
     separately, whether or not those attempts are successful. Used for both
     source files and source maps.
+
+    ``release_artifacts`` can hold results of ``fetch_release_artifacts`` for
+    the release, which are used instead of fetching the url from the database.
     """
     # If our url has been truncated, it'd be impossible to fetch
     # so we check for this early and bail
@@ -655,7 +800,9 @@ def fetch_file(url, project=None, release=None, dist=None, allow_scraping=True):
         raise http.CannotFetch({"type": EventError.JS_MISSING_SOURCE, "url": http.expose_url(url)})
 
     # if we've got a release to look on, try that first (incl associated cache)
-    if release:
+    if release and release_artifacts is not None and url in release_artifacts:
+        result = release_artifacts[url]
+    elif release:
         with sentry_sdk.start_span(
             op="JavaScriptStacktraceProcessor.fetch_file.fetch_release_artifact"
         ):
@@ -785,6 +932,13 @@ def get_max_age(headers):
 def fetch_sourcemap(
     url, source=b"", project=None, release=None, dist=None, allow_scraping=True, use_smcache=True
 ):
+    body = fetch_sourcemap_body(
+        url, project=project, release=release, dist=dist, allow_scraping=allow_scraping
+    )
+    return parse_sourcemap(url, body, source=source, use_smcache=use_smcache)
+
+
+def fetch_sourcemap_body(url, project=None, release=None, dist=None, allow_scraping=True):
     if is_data_uri(url):
         try:
             body = base64.b64decode(
@@ -807,6 +961,11 @@ def fetch_sourcemap(
                 allow_scraping=allow_scraping,
             )
         body = result.body
+    return body
+
+
+# TODO(smcache): Remove unnecessary `use_smcache` flag.
+def parse_sourcemap(url, body, source=b"", use_smcache=True):
     try:
         # TODO(smcache): Remove unnecessary `use_smcache` flag and use `SmCache` only.
         if use_smcache:
@@ -920,6 +1079,9 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         self.release = None
         self.dist = None
 
+        # release artifacts prefetched for the frames of the stacktrace
+        self.release_artifacts = {}
+
         # We only want to check the feature flag for this specific class, and not for
         # `JavaScriptSmCacheStacktraceProcessor`., as it's asking remote Flagr for that data.
         if not isinstance(self, JavaScriptSmCacheStacktraceProcessor):
@@ -1274,12 +1436,8 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 op="JavaScriptStacktraceProcessor.cache_source.fetch_file"
             ) as span:
                 span.set_data("filename", filename)
-                result = fetch_file(
-                    filename,
-                    project=self.project,
-                    release=self.release,
-                    dist=self.dist,
-                    allow_scraping=self.allow_scraping,
+                source = self.fetch_cached(
+                    ("source", filename), lambda: self.fetch_source_artifact(filename)
                 )
         except http.BadSource as exc:
             # most people don't upload release artifacts for their third-party libraries,
@@ -1292,35 +1450,33 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
             # either way, there's no more for us to do here, since we don't have
             # a valid file to cache
             return
-        cache.add(filename, result.body, result.encoding)
-        cache.alias(result.url, filename)
+        cache.add(filename, source.view)
+        cache.alias(source.url, filename)
 
-        sourcemap_url = discover_sourcemap(result)
+        sourcemap_url = source.sourcemap_url
         if not sourcemap_url:
             return
 
         logger.debug(
-            "Found sourcemap URL %r for minified script %r", sourcemap_url[:256], result.url
+            "Found sourcemap URL %r for minified script %r", sourcemap_url[:256], source.url
         )
         sourcemaps.link(filename, sourcemap_url)
         if sourcemap_url in sourcemaps:
             return
 
         # pull down sourcemap
+        # TODO(smcache): Remove unnecessary `use_smcache` flag.
+        use_smcache = isinstance(self, JavaScriptSmCacheStacktraceProcessor)
         try:
             with sentry_sdk.start_span(
                 op="JavaScriptStacktraceProcessor.cache_source.fetch_sourcemap"
             ) as span:
                 span.set_data("sourcemap_url", sourcemap_url)
-                sourcemap_view = fetch_sourcemap(
-                    sourcemap_url,
-                    source=result.body,
-                    project=self.project,
-                    release=self.release,
-                    dist=self.dist,
-                    allow_scraping=self.allow_scraping,
-                    # TODO(smcache): Remove unnecessary `use_smcache` flag.
-                    use_smcache=isinstance(self, JavaScriptSmCacheStacktraceProcessor),
+                # A SmCache is built from the minified source as well, so it
+                # can only be shared for the same source file.
+                sourcemap = self.fetch_cached(
+                    ("sourcemap", sourcemap_url, filename if use_smcache else None),
+                    lambda: self.fetch_sourcemap_artifact(sourcemap_url, source.body, use_smcache),
                 )
         except http.BadSource as exc:
             # we don't perform the same check here as above, because if someone has
@@ -1335,18 +1491,89 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
         with sentry_sdk.start_span(
             op="JavaScriptStacktraceProcessor.cache_source.cache_sourcemap_view"
         ) as span:
-            sourcemaps.add(sourcemap_url, sourcemap_view)
+            sourcemaps.add(sourcemap_url, sourcemap.view)
 
             # TODO(smcache): Remove this whole iteration block
-            if not isinstance(self, JavaScriptSmCacheStacktraceProcessor):
-                span.set_data("source_count", sourcemap_view.source_count)
+            if not use_smcache:
+                span.set_data("source_count", sourcemap.view.source_count)
                 # cache any inlined sources
-                for src_id, source_name in sourcemap_view.iter_sources():
-                    source_view = sourcemap_view.get_sourceview(src_id)
-                    if source_view is not None:
-                        self.cache.add(
-                            non_standard_url_join(sourcemap_url, source_name), source_view
-                        )
+                for url, source_view in sourcemap.inline_sources:
+                    self.cache.add(url, source_view)
+
+    def fetch_source_artifact(self, filename):
+        result = fetch_file(
+            filename,
+            project=self.project,
+            release=self.release,
+            dist=self.dist,
+            allow_scraping=self.allow_scraping,
+            release_artifacts=self.release_artifacts,
+        )
+        return FetchedSource(
+            url=result.url,
+            body=result.body,
+            view=make_source_view(result.body, result.encoding),
+            sourcemap_url=discover_sourcemap(result),
+            # the body is held on to alongside its source view
+            size=2 * len(result.body),
+        )
+
+    def fetch_sourcemap_artifact(self, sourcemap_url, source, use_smcache):
+        body = fetch_sourcemap_body(
+            sourcemap_url,
+            project=self.project,
+            release=self.release,
+            dist=self.dist,
+            allow_scraping=self.allow_scraping,
+        )
+        sourcemap_view = parse_sourcemap(
+            sourcemap_url, body, source=source, use_smcache=use_smcache
+        )
+
+        inline_sources = []
+        # TODO(smcache): Remove this whole iteration block
+        if not use_smcache:
+            for src_id, source_name in sourcemap_view.iter_sources():
+                source_view = sourcemap_view.get_sourceview(src_id)
+                if source_view is not None:
+                    inline_sources.append(
+                        (non_standard_url_join(sourcemap_url, source_name), source_view)
+                    )
+
+        return FetchedSourceMap(view=sourcemap_view, inline_sources=inline_sources, size=len(body))
+
+    def fetch_cached(self, key, fetch):
+        """
+        Calls ``fetch`` unless another event of the same release has done so
+        in this process within the last ``ARTIFACT_CACHE_TTL`` seconds, and
+        returns its result. ``BadSource`` errors are cached and re-raised as
+        well.
+        """
+        key = self.get_fetch_cache_key(key)
+        if key is None:
+            return fetch()
+
+        entry = artifact_cache.get(key)
+        metrics.incr("sourcemaps.process_cache", tags={"hit": entry is not None})
+
+        if entry is None:
+            try:
+                entry = fetch()
+            except http.BadSource as exc:
+                entry = FetchError(type(exc), exc.data)
+            evicted = artifact_cache.set(key, entry)
+            if evicted:
+                metrics.incr("sourcemaps.process_cache.evictions", amount=evicted)
+
+        if isinstance(entry, FetchError):
+            raise entry.type(dict(entry.data))
+        return entry
+
+    def get_fetch_cache_key(self, key):
+        if self.release is None or not options.get("sourcemaps.process-cache.enabled"):
+            return None
+
+        return (self.project.id, self.release.id, self.dist and self.dist.id) + key
 
     def populate_source_cache(self, frames):
         """
@@ -1369,6 +1596,20 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 continue
             pending_file_list.add(f["abs_path"])
 
+        if self.release is not None:
+            # Resolve all release artifacts at once rather than one by one
+            # in `cache_source`, skipping those that are cached in-process.
+            urls = []
+            for filename in list(pending_file_list)[: self.max_fetches - self.fetch_count]:
+                cache_key = self.get_fetch_cache_key(("source", filename))
+                if cache_key is None or cache_key not in artifact_cache:
+                    urls.append(filename)
+
+            with sentry_sdk.start_span(
+                op="JavaScriptStacktraceProcessor.populate_source_cache.fetch_release_artifacts"
+            ):
+                self.release_artifacts = fetch_release_artifacts(urls, self.release, self.dist)
+
         for idx, filename in enumerate(pending_file_list):
             with sentry_sdk.start_span(
                 op="JavaScriptStacktraceProcessor.populate_source_cache.cache_source"
@@ -1376,6 +1617,8 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 span.set_data("filename", filename)
                 self.cache_source(filename=filename)
 
+        self.release_artifacts = {}
+
     def close(self):
         StacktraceProcessor.close(self)
         if self.sourcemaps_touched:
@@ -0,0 +1,168 @@
+__all__ = ["AggregatingMetricsBackend"]
+
+import atexit
+import logging
+import threading
+import time
+
+from sentry.utils.imports import import_string
+
+from .base import MetricsBackend
+
+logger = logging.getLogger(__name__)
+
+# How often the flusher thread looks for buffers that are due, in seconds.
+FLUSHER_TICK = 0.5
+
+
+class _Buffer:
+    """
+    The metrics buffered by one thread. The thread adds to it and flushes it
+    once it's due, and the flusher thread flushes it if the thread goes idle.
+    """
+
+    def __init__(self, backend, flush_interval):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.thread = threading.current_thread()
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.gauges = {}
+        self.last_flush = time.monotonic()
+
+    def is_due(self, max_keys):
+        return (
+            len(self.counters) + len(self.gauges) >= max_keys
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        )
+
+    def flush(self):
+        with self.lock:
+            counters, self.counters = self.counters, {}
+            gauges, self.gauges = self.gauges, {}
+            self.last_flush = time.monotonic()
+
+        for (key, instance, tags), amount in counters.items():
+            # Sampled increments are scaled up to floats, but the wrapped
+            # backends send integer counts.
+            self.backend.incr(key, instance, dict(tags), round(amount), 1)
+
+        for (key, instance, tags), value in gauges.items():
+            self.backend.gauge(key, value, instance, dict(tags), 1)
+
+
+class _Flusher:
+    """
+    Flushes the buffers of all threads from a daemon thread once they are due,
+    and once more when the process exits.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.buffers = []
+        self.started = False
+
+    def register(self, buffer):
+        with self.lock:
+            self.buffers.append(buffer)
+            if not self.started:
+                self.started = True
+                thread = threading.Thread(target=self.run, name="metrics-flusher")
+                thread.daemon = True
+                thread.start()
+                atexit.register(self.flush_all)
+
+    def flush_all(self, due_only=False):
+        with self.lock:
+            buffers = list(self.buffers)
+            # Buffers of threads that have exited are flushed one last time.
+            self.buffers = [buffer for buffer in buffers if buffer.thread.is_alive()]
+
+        now = time.monotonic()
+        for buffer in buffers:
+            if due_only and buffer.thread.is_alive():
+                if now - buffer.last_flush < buffer.flush_interval:
+                    continue
+            try:
+                buffer.flush()
+            except Exception:
+                logger.exception("Unable to flush aggregated metrics")
+
+    def run(self):
+        while True:
+            time.sleep(FLUSHER_TICK)
+            self.flush_all(due_only=True)
+
+
+_flusher = _Flusher()
+
+
+class AggregatingMetricsBackend(MetricsBackend):
+    """
+    Wraps another metrics backend and merges counters and gauges in memory
+    before forwarding them, so that hot loops emit one packet per distinct
+    metric per flush instead of one per call.
+
+    Counters are summed and gauges keep their most recent value for every
+    combination of key, instance and tags. Both are forwarded to the wrapped
+    backend once ``flush_interval`` seconds have passed since the last flush,
+    or once ``max_keys`` distinct metrics are buffered. Timings are forwarded
+    unchanged, since the wrapped clients sample them on their own.
+
+    Like every metrics backend this is a thread local, so each thread buffers
+    its own metrics and flushes them on its next call once they are due. A
+    daemon thread flushes the buffers of threads that went idle, and all
+    buffers are flushed when the process exits.
+
+    Configure it with the wrapped backend and its options::
+
+        SENTRY_METRICS_BACKEND = "sentry.metrics.aggregating.AggregatingMetricsBackend"
+        SENTRY_METRICS_OPTIONS = {
+            "backend": "sentry.metrics.statsd.StatsdMetricsBackend",
+            "backend_options": {"host": "127.0.0.1", "port": 8125},
+        }
+    """
+
+    def __init__(self, backend, backend_options=None, flush_interval=1.0, max_keys=1000, **kwargs):
+        self.backend = import_string(backend)(**(backend_options or {}))
+        self.max_keys = max_keys
+        self.__buffer = _Buffer(self.backend, flush_interval)
+        _flusher.register(self.__buffer)
+        super().__init__(**kwargs)
+
+    def __get_bucket_key(self, key, instance, tags):
+        return key, instance, tuple(sorted(tags.items())) if tags else ()
+
+    def __maybe_flush(self):
+        if self.__buffer.is_due(self.max_keys):
+            self.__buffer.flush()
+
+    def flush(self):
+        self.__buffer.flush()
+
+    def incr(self, key, instance=None, tags=None, amount=1, sample_rate=1):
+        if not self._should_sample(sample_rate):
+            return
+
+        # The merged value is forwarded unsampled, so scale the sampled amount
+        # up here the same way a statsd server would.
+        if sample_rate < 1:
+            amount = amount / sample_rate
+
+        bucket_key = self.__get_bucket_key(key, instance, tags)
+        buffer = self.__buffer
+        with buffer.lock:
+            buffer.counters[bucket_key] = buffer.counters.get(bucket_key, 0) + amount
+        self.__maybe_flush()
+
+    def timing(self, key, value, instance=None, tags=None, sample_rate=1):
+        self.backend.timing(key, value, instance, tags, sample_rate)
+
+    def gauge(self, key, value, instance=None, tags=None, sample_rate=1):
+        if not self._should_sample(sample_rate):
+            return
+
+        buffer = self.__buffer
+        with buffer.lock:
+            buffer.gauges[self.__get_bucket_key(key, instance, tags)] = value
+        self.__maybe_flush()
@@ -171,7 +171,7 @@ class Organization(Model, SnowflakeIdMixin):
         default=1,
     )
 
-    objects = OrganizationManager(cache_fields=("pk", "slug"))
+    objects = OrganizationManager(cache_fields=("pk", "slug"), process_cache_ttl=10)
 
     class Meta:
         app_label = "sentry"
@@ -145,7 +145,7 @@ class Project(Model, PendingDeletionMixin, SnowflakeIdMixin):
         null=True,
     )
 
-    objects = ProjectManager(cache_fields=["pk"])
+    objects = ProjectManager(cache_fields=["pk"], process_cache_ttl=10)
     platform = models.CharField(max_length=64, null=True)
 
     class Meta:
@@ -7,12 +7,18 @@ from django.utils import timezone
 from sentry.db.models import Model, region_silo_model, sane_repr
 from sentry.db.models.fields import FlexibleForeignKey, JSONField
 from sentry.models import ActorTuple
-from sentry.ownership.grammar import Rule, load_schema, resolve_actors
-from sentry.utils import metrics
+from sentry.ownership.grammar import CompiledRules, Rule, load_schema, resolve_actors
+from sentry.utils import json, metrics
 from sentry.utils.cache import cache
+from sentry.utils.hashlib import md5_text
+from sentry.utils.lru import LRUCache
 
 READ_CACHE_DURATION = 3600
 
+# Compiled rules of recently used schemas, keyed by project and schema
+# checksum. See `ProjectOwnership.get_compiled_rules`.
+compiled_rules_cache: LRUCache[Tuple[int, str], CompiledRules] = LRUCache(max_items=1000)
+
 
 @region_silo_model
 class ProjectOwnership(Model):
@@ -212,17 +218,33 @@ class ProjectOwnership(Model):
                 actor_source,
             )
 
+    @classmethod
+    def get_compiled_rules(cls, project_id: int, schema: Mapping[str, Any]) -> CompiledRules:
+        """
+        Returns the rules of ``schema`` compiled for matching. These are
+        cached in the process per project and version of the schema, which
+        is identified by its checksum as the schema may be combined from
+        Ownership Rules and CODEOWNERS.
+        """
+        key = (project_id, md5_text(json.dumps(schema)).hexdigest())
+        compiled_rules = compiled_rules_cache.get(key)
+        metrics.incr(
+            "projectownership.compiled_rules_cache",
+            tags={"cache_hit": str(compiled_rules is not None).lower()},
+        )
+        if compiled_rules is None:
+            compiled_rules = CompiledRules(load_schema(schema))
+            compiled_rules_cache.set(key, compiled_rules)
+        return compiled_rules
+
     @classmethod
     def _matching_ownership_rules(
         cls, ownership: "ProjectOwnership", project_id: int, data: Mapping[str, Any]
     ) -> Sequence["Rule"]:
-        rules = []
-        if ownership.schema is not None:
-            for rule in load_schema(ownership.schema):
-                if rule.test(data):
-                    rules.append(rule)
+        if ownership.schema is None:
+            return []
 
-        return rules
+        return cls.get_compiled_rules(project_id, ownership.schema).get_matching_rules(data)
 
 
 # Signals update the cached reads used in post_processing
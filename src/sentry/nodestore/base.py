@@ -1,10 +1,15 @@
-from threading import local
+import random
+import struct
+from threading import Lock, local
 
 import sentry_sdk
+from django.conf import settings
 from django.core.cache import InvalidCacheBackendError, caches
 
-from sentry.utils import json
+from sentry import options
+from sentry.utils import json, metrics
 from sentry.utils.cache import memoize
+from sentry.utils.lru import LRUCache
 from sentry.utils.services import Service
 
 # Cache an instance of the encoder we want to use
@@ -22,6 +27,51 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json._default_decoder.decode
 
+# Blobs in the indexed encoding start with this magic and a version byte. Neither JSON
+# nor pickle payloads can start with a NUL byte. See ``NodeStorage._encode``.
+INDEXED_MAGIC = b"\x00ns"
+INDEXED_VERSION = 1
+INDEXED_PREFIX = INDEXED_MAGIC + bytes([INDEXED_VERSION])
+# subkey count, then per subkey: key length, key, payload offset, payload length
+_indexed_count = struct.Struct("<H")
+_indexed_entry = struct.Struct("<HII")
+
+# The process-wide L1 cache, shared by all threads (``NodeStorage`` itself is thread-local).
+# Keyed by the settings it was built from so it is rebuilt when they change.
+_local_cache = None
+_local_cache_lock = Lock()
+
+
+def get_local_cache():
+    """
+    Returns the in-process LRU cache that sits in front of the ``nodedata``
+    cache, or ``None`` if it is disabled.
+
+    Entries are ``(blob, complete)`` tuples. ``blob`` is an encoded node as
+    produced by ``NodeStorage._encode``, so every hit is decoded again and
+    callers never share (and mutate) the same payload. ``complete`` is
+    ``False`` if the blob was rebuilt from the ``nodedata`` cache, which only
+    holds the default subkey.
+    """
+    global _local_cache
+
+    config = (
+        settings.SENTRY_NODESTORE_LOCAL_CACHE_MAX_BYTES,
+        settings.SENTRY_NODESTORE_LOCAL_CACHE_TTL,
+    )
+    if not config[0]:
+        return None
+
+    if _local_cache is None or _local_cache[0] != config:
+        with _local_cache_lock:
+            if _local_cache is None or _local_cache[0] != config:
+                max_bytes, ttl = config
+                _local_cache = (
+                    config,
+                    LRUCache(max_bytes=max_bytes, ttl=ttl, sizeof=lambda entry: len(entry[0])),
+                )
+    return _local_cache[1]
+
 
 class NodeStorage(local, Service):
     """
@@ -64,7 +114,9 @@ class NodeStorage(local, Service):
         "get",
         "get_multi",
         "set",
+        "set_multi",
         "set_subkeys",
+        "set_subkeys_multi",
         "cleanup",
         "validate",
         "bootstrap",
@@ -92,6 +144,9 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
+        if value[: len(INDEXED_PREFIX)] == INDEXED_PREFIX:
+            return self._decode_indexed(value, subkey)
+
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -112,6 +167,37 @@ class NodeStorage(local, Service):
         except StopIteration:
             return None
 
+    def _decode_indexed(self, value, subkey):
+        """
+        Decodes a single subkey out of a blob in the indexed encoding, without
+        touching (or copying) the payloads of any other subkey.
+        """
+        # Those keys should be statically known identifiers in the app, such as
+        # "unprocessed_event". There is really no reason to allow anything but
+        # ASCII here.
+        wanted = b"" if subkey is None else subkey.encode("ascii")
+
+        view = memoryview(value)
+        pos = len(INDEXED_PREFIX)
+        (count,) = _indexed_count.unpack_from(view, pos)
+        pos += _indexed_count.size
+
+        # payload offsets are relative to the end of the header, which we only know
+        # once we have walked all of it
+        match = None
+        for _ in range(count):
+            key_length, offset, length = _indexed_entry.unpack_from(view, pos)
+            pos += _indexed_entry.size
+            if match is None and view[pos : pos + key_length] == wanted:
+                match = (offset, length)
+            pos += key_length
+
+        if match is None:
+            return None
+
+        offset, length = match
+        return json_loads(bytes(view[pos + offset : pos + offset + length]))
+
     def _get_bytes(self, id):
         """
         >>> nodestore._get_bytes('key1')
@@ -126,9 +212,17 @@ class NodeStorage(local, Service):
         """
         with sentry_sdk.start_span(op="nodestore.get") as span:
             span.set_tag("node_id", id)
+            local_items = self._get_local_cache_items([id], subkey=subkey)
+            if local_items:
+                rv = self._decode(local_items[id], subkey=subkey)
+                span.set_tag("origin", "from_local_cache")
+                span.set_tag("found", bool(rv))
+                return rv
+
             if subkey is None:
                 item_from_cache = self._get_cache_item(id)
                 if item_from_cache:
+                    self._set_local_cache_items({id: json_dumps(item_from_cache).encode("utf8")})
                     span.set_tag("origin", "from_cache")
                     span.set_tag("found", bool(item_from_cache))
                     return item_from_cache
@@ -139,6 +233,8 @@ class NodeStorage(local, Service):
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
+            if bytes_data:
+                self._set_local_cache_items({id: bytes_data}, complete=True)
 
             span.set_tag("result", "from_service")
             if bytes_data:
@@ -169,23 +265,38 @@ class NodeStorage(local, Service):
             span.set_tag("subkey", str(subkey))
             span.set_tag("num_ids", len(id_list))
 
+            local_items = {
+                id: self._decode(value, subkey=subkey)
+                for id, value in self._get_local_cache_items(id_list, subkey=subkey).items()
+            }
+            if len(local_items) == len(id_list):
+                span.set_tag("result", "from_local_cache")
+                return local_items
+            id_list = [id for id in id_list if id not in local_items]
+
             if subkey is None:
                 cache_items = self._get_cache_items(id_list)
-                if len(cache_items) == len(id_list):
+                self._set_local_cache_items(
+                    {id: json_dumps(item).encode("utf8") for id, item in cache_items.items()}
+                )
+                cache_items.update(local_items)
+                if len(cache_items) == len(id_list) + len(local_items):
                     span.set_tag("result", "from_cache")
                     return cache_items
 
                 uncached_ids = [id for id in id_list if id not in cache_items]
             else:
+                cache_items = local_items
                 uncached_ids = id_list
 
-            items = {
-                id: self._decode(value, subkey=subkey)
-                for id, value in self._get_bytes_multi(uncached_ids).items()
-            }
+            bytes_items = self._get_bytes_multi(uncached_ids)
+            items = {id: self._decode(value, subkey=subkey) for id, value in bytes_items.items()}
             if subkey is None:
                 self._set_cache_items(items)
-                items.update(cache_items)
+            self._set_local_cache_items(
+                {id: value for id, value in bytes_items.items() if value}, complete=True
+            )
+            items.update(cache_items)
 
             span.set_tag("result", "from_service")
             span.set_tag("found", len(items))
@@ -200,7 +311,13 @@ class NodeStorage(local, Service):
 
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
+
+        Depending on the ``nodestore.indexed-encoding-write-rate`` option the
+        indexed encoding (see ``_encode_indexed``) is used instead.
         """
+        if random.random() < options.get("nodestore.indexed-encoding-write-rate"):
+            return self._encode_indexed(data)
+
         lines = [json_dumps(data.pop(None)).encode("utf8")]
         for key, value in data.items():
             lines.append(key.encode("ascii"))
@@ -208,12 +325,46 @@ class NodeStorage(local, Service):
 
         return b"\n".join(lines)
 
+    def _encode_indexed(self, data):
+        """
+        Encode data dict with a header of subkey offsets and lengths, so a
+        single subkey can be decoded without scanning the others:
+
+        - ``INDEXED_PREFIX``
+        - the number of subkeys (uint16)
+        - per subkey: key length (uint16), payload offset and payload length
+          (uint32, relative to the end of the header), key (the default
+          subkey is stored as an empty key)
+        - all payloads, concatenated
+
+        All integers are little-endian.
+        """
+        header = [INDEXED_PREFIX, _indexed_count.pack(len(data))]
+        payloads = []
+        offset = 0
+        for key, value in data.items():
+            key_bytes = b"" if key is None else key.encode("ascii")
+            payload = json_dumps(value).encode("utf8")
+            header.append(_indexed_entry.pack(len(key_bytes), offset, len(payload)))
+            header.append(key_bytes)
+            payloads.append(payload)
+            offset += len(payload)
+
+        return b"".join(header + payloads)
+
     def _set_bytes(self, id, data, ttl=None):
         """
         >>> nodestore.set('key1', b"{'foo': 'bar'}")
         """
         raise NotImplementedError
 
+    def _set_bytes_multi(self, items, ttl=None):
+        """
+        >>> nodestore._set_bytes_multi({'key1': b"{'foo': 'bar'}"})
+        """
+        for id, data in items.items():
+            self._set_bytes(id, data, ttl=ttl)
+
     def set(self, id, data, ttl=None):
         """
         Set value for `id`. Note that this deletes existing subkeys for `id` as
@@ -242,9 +393,44 @@ class NodeStorage(local, Service):
             span.set_data("subkeys_count", len(data))
             cache_item = data.get(None)
             bytes_data = self._encode(data)
+            self._delete_local_cache_items([id])
             self._set_bytes(id, bytes_data, ttl=ttl)
             # set cache only after encoding and write to nodestore has succeeded
             self._set_cache_item(id, cache_item)
+            self._set_local_cache_items({id: bytes_data}, complete=True)
+
+    def set_multi(self, items, ttl=None):
+        """
+        Set values for multiple ids. Like `set`, this deletes existing subkeys.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+
+        >>> nodestore.set_multi({'key1': {'foo': 'bar'}, 'key2': {'foo': 'baz'}})
+        """
+        return self.set_subkeys_multi({id: {None: data} for id, data in items.items()}, ttl=ttl)
+
+    def set_subkeys_multi(self, items, ttl=None):
+        """
+        Set values and subkeys for multiple ids, see `set_subkeys`.
+
+        Note: This is not guaranteed to be atomic and may result in a partial
+        write.
+
+        >>> nodestore.set_subkeys_multi({
+        ...    'key1': {None: {'foo': 'bar'}, "reprocessing": {'foo': 'bam'}},
+        ...    'key2': {None: {'foo': 'baz'}},
+        ... })
+        """
+        with sentry_sdk.start_span(op="nodestore.set_subkeys_multi") as span:
+            span.set_data("num_ids", len(items))
+            cache_items = {id: data.get(None) for id, data in items.items()}
+            bytes_items = {id: self._encode(data) for id, data in items.items()}
+            self._delete_local_cache_items(list(bytes_items))
+            self._set_bytes_multi(bytes_items, ttl=ttl)
+            # set cache only after encoding and write to nodestore has succeeded
+            self._set_cache_items({id: item for id, item in cache_items.items() if item})
+            self._set_local_cache_items(bytes_items, complete=True)
 
     def cleanup(self, cutoff_timestamp):
         raise NotImplementedError
@@ -270,13 +456,47 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, id):
+        self._delete_local_cache_items([id])
         if self.cache:
             self.cache.delete(id)
 
     def _delete_cache_items(self, id_list):
+        self._delete_local_cache_items(id_list)
         if self.cache:
             self.cache.delete_many([id for id in id_list])
 
+    def _get_local_cache_items(self, id_list, subkey=None):
+        local_cache = get_local_cache()
+        if local_cache is None:
+            return {}
+
+        rv = {}
+        for id, (blob, complete) in local_cache.get_many(id_list).items():
+            # only complete blobs know about subkeys
+            if complete or subkey is None:
+                rv[id] = blob
+
+        metrics.incr("nodestore.local_cache", amount=len(rv), tags={"result": "hit"})
+        metrics.incr(
+            "nodestore.local_cache", amount=len(id_list) - len(rv), tags={"result": "miss"}
+        )
+        return rv
+
+    def _set_local_cache_items(self, items, complete=False):
+        local_cache = get_local_cache()
+        if local_cache is None or not items:
+            return
+
+        evicted = local_cache.set_many({id: (blob, complete) for id, blob in items.items()})
+        if evicted:
+            metrics.incr("nodestore.local_cache", amount=evicted, tags={"result": "evicted"})
+        metrics.gauge("nodestore.local_cache.bytes", local_cache.nbytes)
+
+    def _delete_local_cache_items(self, id_list):
+        local_cache = get_local_cache()
+        if local_cache is not None:
+            local_cache.delete_many(id_list)
+
     @memoize
     def cache(self):
         try:
@@ -1,10 +1,27 @@
 import os
 
 import sentry_sdk
+import zstandard
 
 from sentry.nodestore.base import NodeStorage
 from sentry.utils.kvstore.bigtable import BigtableKVStorage
 
+# Trained compression dictionaries are stored as ``<dict_id>.zdict`` files, see
+# ``sentry nodestore train-compression-dictionary``.
+COMPRESSION_DICTIONARY_SUFFIX = ".zdict"
+
+
+def load_compression_dictionaries(path):
+    """
+    Load all zstd compression dictionaries from the directory at ``path``.
+    """
+    dictionaries = []
+    for filename in sorted(os.listdir(path)):
+        if filename.endswith(COMPRESSION_DICTIONARY_SUFFIX):
+            with open(os.path.join(path, filename), "rb") as f:
+                dictionaries.append(zstandard.ZstdCompressionDict(f.read()))
+    return dictionaries
+
 
 class BigtableNodeStorage(NodeStorage):
     """
@@ -18,6 +35,11 @@ class BigtableNodeStorage(NodeStorage):
         valid for reading + returning)
     :param compression: A boolean whether to enable zlib-compression, or the
         string "zstd" to use zstd.
+    :param compression_dictionaries_path: A directory of trained zstd
+        dictionaries. Every dictionary that was ever used for writing needs
+        to stay in there for the data to remain readable.
+    :param compression_dictionary_id: The ID of the dictionary to compress new
+        nodes with. Takes precedence over ``compression``.
 
     >>> BigtableNodeStorage(
     ...     project='some-project',
@@ -38,6 +60,8 @@ class BigtableNodeStorage(NodeStorage):
         automatic_expiry=False,
         default_ttl=None,
         compression=False,
+        compression_dictionaries_path=None,
+        compression_dictionary_id=None,
         **client_options,
     ):
         if compression is True:
@@ -45,6 +69,10 @@ class BigtableNodeStorage(NodeStorage):
         elif compression is False:
             compression = None
 
+        compression_dictionaries = None
+        if compression_dictionaries_path is not None:
+            compression_dictionaries = load_compression_dictionaries(compression_dictionaries_path)
+
         self.store = self.store_class(
             project=project,
             instance=instance,
@@ -52,6 +80,8 @@ class BigtableNodeStorage(NodeStorage):
             default_ttl=default_ttl,
             compression=compression,
             client_options=client_options,
+            compression_dictionaries=compression_dictionaries,
+            compression_dictionary_id=compression_dictionary_id,
         )
         self.automatic_expiry = automatic_expiry
         self.skip_deletes = automatic_expiry and "_SENTRY_CLEANUP" in os.environ
@@ -67,6 +97,11 @@ class BigtableNodeStorage(NodeStorage):
     def _set_bytes(self, id, data, ttl=None):
         self.store.set(id, data, ttl)
 
+    def _set_bytes_multi(self, items, ttl=None):
+        with sentry_sdk.start_span(op="nodestore.bigtable.set_bytes_multi") as span:
+            span.set_tag("num_ids", len(items))
+            self.store.set_many(list(items.items()), ttl)
+
     def delete(self, id):
         if self.skip_deletes:
             return
@@ -2,10 +2,11 @@ import logging
 import math
 import pickle
 
+from django.db import connections, router
 from django.utils import timezone
 
 from sentry.db.models import create_or_update
-from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.base import INDEXED_PREFIX, NodeStorage, get_local_cache
 from sentry.utils.strings import compress, decompress
 
 from .models import Node
@@ -14,6 +15,9 @@ logger = logging.getLogger("sentry")
 
 
 class DjangoNodeStorage(NodeStorage):
+    # Maximum number of nodes written by a single statement in ``_set_bytes_multi``
+    set_batch_size = 100
+
     def delete(self, id):
         Node.objects.filter(id=id).delete()
         self._delete_cache_item(id)
@@ -23,7 +27,7 @@ class DjangoNodeStorage(NodeStorage):
             return None
 
         try:
-            if value.startswith(b"{"):
+            if value.startswith((b"{", INDEXED_PREFIX)):
                 return NodeStorage._decode(self, value, subkey=subkey)
 
             if subkey is None:
@@ -51,6 +55,30 @@ class DjangoNodeStorage(NodeStorage):
     def _set_bytes(self, id, data, ttl=None):
         create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
 
+    def _set_bytes_multi(self, items, ttl=None):
+        connection = connections[router.db_for_write(Node)]
+        quote_name = connection.ops.quote_name
+        timestamp = timezone.now()
+        items = list(items.items())
+
+        for i in range(0, len(items), self.set_batch_size):
+            batch = items[i : i + self.set_batch_size]
+            query = """
+                insert into %(table)s (id, data, timestamp)
+                values %(values)s
+                on conflict (id) do update
+                set data = excluded.data, timestamp = excluded.timestamp
+            """ % dict(
+                table=quote_name(Node._meta.db_table),
+                values=", ".join(["(%s, %s, %s)"] * len(batch)),
+            )
+            params = []
+            for id, data in batch:
+                params.extend((id, compress(data), timestamp))
+
+            with connection.cursor() as cursor:
+                cursor.execute(query, params)
+
     def cleanup(self, cutoff_timestamp):
         from sentry.db.deletion import BulkDeleteQuery
 
@@ -60,6 +88,9 @@ class DjangoNodeStorage(NodeStorage):
         BulkDeleteQuery(model=Node, dtfield="timestamp", days=days).execute()
         if self.cache:
             self.cache.clear()
+        local_cache = get_local_cache()
+        if local_cache is not None:
+            local_cache.clear()
 
     def bootstrap(self):
         # Nothing for Django backend to do during bootstrap
@@ -136,6 +136,10 @@ register(
 
 register("api.rate-limit.org-create", default=5, flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK)
 
+# Run the independent attribute loaders of API serializers (see
+# sentry.api.serializers.loaders) concurrently instead of one after another.
+register("api.serializers.concurrent-loaders.enabled", default=False)
+
 # Beacon
 register("beacon.anonymous", type=Bool, flags=FLAG_REQUIRED)
 
@@ -322,6 +326,10 @@ register("outcomes.tsdb-in-consumer-sample-rate", default=0.0)  # unused
 register("nodedata.cache-sample-rate", default=0.0, flags=FLAG_PRIORITIZE_DISK)
 register("nodedata.cache-on-save", default=False, flags=FLAG_PRIORITIZE_DISK)
 
+# Rate of nodestore writes that use the subkey-indexed encoding. All readers need to
+# understand it before this is turned on.
+register("nodestore.indexed-encoding-write-rate", default=0.0, flags=FLAG_PRIORITIZE_DISK)
+
 # Use nodestore for eventstore.get_events
 register("eventstore.use-nodestore", default=False, flags=FLAG_PRIORITIZE_DISK)
 
@@ -363,6 +371,10 @@ register("store.reprocessing-force-disable", default=False)
 
 register("store.race-free-group-creation-force-disable", default=False)
 
+# Resolve the groups of events from the cached groups of their hashes. See
+# `sentry.grouping.grouphash_cache`.
+register("store.grouphash-cache.enabled", default=False, flags=FLAG_PRIORITIZE_DISK)
+
 
 # ## sentry.killswitches
 #
@@ -425,6 +437,22 @@ register("post-process-forwarder:kafka-headers", default=True)
 # Number of threads to use for post processing
 register("post-process-forwarder:concurrency", default=1)
 
+# Rate of buffer increments that serialize their filters and extra values with msgpack
+# instead of pickle. Reads understand both, so this can be rolled out gradually.
+register("buffer.msgpack-write-rate", default=0.0)
+
+# Rate of digest records that are written as compact msgpack identifiers instead
+# of pickled events. Reads understand both, so this can be rolled out gradually.
+register("digests.compact-codec-write-rate", default=0.0)
+
+# Number of seconds for which issue alert frequency conditions share the rate they
+# computed for a group. 0 disables the shared cache.
+register("rules.event-frequency.rate-cache-ttl", default=0)
+
+# Share fetched and parsed release artifacts between JavaScript events of the
+# same release within a processing worker.
+register("sourcemaps.process-cache.enabled", default=False)
+
 # Subscription queries sampling rate
 register("subscriptions-query.sample-rate", default=0.01)
 
@@ -443,6 +471,10 @@ register("performance.suspect-spans-ingestion.rollout-rate", default=0)
 # special save_event task for transactions avoiding the preprocess.
 register("store.save-transactions-ingest-consumer-rate", default=0.0)
 
+# Rate of transactions from the transactions topic that ingest-consumer stores in the
+# processing store without parsing them first. They are only parsed by save_event_transaction.
+register("store.unparsed-transactions-ingest-consumer-rate", default=0.0)
+
 # Drop delete_old_primary_hash messages for a particular project.
 register("reprocessing2.drop-delete-old-primary-hash", default=[])
 
@@ -4,7 +4,20 @@ import operator
 import re
 from collections import namedtuple
 from functools import reduce
-from typing import Any, Callable, Iterable, List, Mapping, Optional, Pattern, Sequence, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from django.db.models import Q
 from parsimonious.exceptions import ParseError
@@ -18,7 +31,7 @@ from sentry.utils.event_frames import find_stack_frames, get_sdk_name, munged_fi
 from sentry.utils.glob import glob_match
 from sentry.utils.safe import PathSearchable, get_path
 
-__all__ = ("parse_rules", "dump_schema", "load_schema")
+__all__ = ("parse_rules", "dump_schema", "load_schema", "CompiledRules")
 
 VERSION = 1
 
@@ -375,6 +388,138 @@ def _path_to_regex(pattern: str) -> Pattern[str]:
     return re.compile(regex)
 
 
+def _codeowners_prefix(pattern: str) -> str:
+    """
+    Returns the literal part that every path matched by the CODEOWNERS
+    ``pattern`` starts with, without leading slashes. This is empty for
+    patterns that are not anchored, and can match anywhere in a path.
+
+    Mirrors the anchoring rules of `_path_to_regex`.
+    """
+    if pattern[0] == "\\":
+        return ""
+
+    slash_pos = pattern.find("/")
+    if slash_pos == -1 or slash_pos == len(pattern) - 1:
+        return ""
+
+    # Directory patterns match paths inside of the directory, whatever
+    # number of trailing slashes they end with.
+    pattern = pattern.rstrip("/")
+    for i, ch in enumerate(pattern):
+        if ch in "*?":
+            pattern = pattern[:i]
+            break
+    return pattern.lstrip("/")
+
+
+class _PrefixTrie:
+    """
+    Maps string prefixes to values, to find the values of all prefixes of a
+    string in a single pass over it.
+    """
+
+    def __init__(self) -> None:
+        # (children by character, values of the prefix ending here)
+        self.root: Tuple[Dict[str, Any], List[Any]] = ({}, [])
+
+    def insert(self, prefix: str, value: Any) -> None:
+        children, values = self.root
+        for ch in prefix:
+            children, values = children.setdefault(ch, ({}, []))
+        values.append(value)
+
+    def find(self, string: str) -> Iterator[Any]:
+        children, values = self.root
+        yield from values
+        for ch in string:
+            node = children.get(ch)
+            if node is None:
+                return
+            children, values = node
+            yield from values
+
+
+def _frame_values(frames: Sequence[Mapping[str, Any]], keys: Sequence[str]) -> Sequence[str]:
+    """
+    The distinct values that `Matcher.test_frames` would test against.
+    """
+    values = {}
+    for frame in (f for f in frames if isinstance(f, Mapping)):
+        for key in keys:
+            value = frame.get(key)
+            if value and isinstance(value, str):
+                values[value] = True
+    return list(values)
+
+
+class CompiledRules:
+    """
+    The rules of an ownership schema, prepared once to be tested against many
+    events.
+
+    Testing every `Rule` on its own extracts and munges the frames of the
+    event once per rule, and CODEOWNERS rules build a regex for every frame
+    they look at. Here the frame values are extracted once per event, the
+    regexes are compiled up front, and CODEOWNERS rules anchored to a
+    directory are kept in a prefix trie, so every path is only tested
+    against the rules for directories it is in.
+
+    ``get_matching_rules(data)`` returns the same rules, in the same order,
+    as ``[rule for rule in rules if rule.test(data)]``.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        self.rules = rules
+        self.codeowners_regexes: Dict[int, Pattern[str]] = {}
+        self.codeowners_trie = _PrefixTrie()
+        self.has_path_rules = False
+        self.has_module_rules = False
+
+        for index, rule in enumerate(rules):
+            type = rule.matcher.type
+            if type == CODEOWNERS:
+                self.codeowners_regexes[index] = _path_to_regex(rule.matcher.pattern)
+                self.codeowners_trie.insert(_codeowners_prefix(rule.matcher.pattern), index)
+            self.has_path_rules |= type in (PATH, CODEOWNERS)
+            self.has_module_rules |= type == MODULE
+
+    def get_matching_rules(self, data: PathSearchable) -> Sequence[Rule]:
+        path_values: Sequence[str] = ()
+        if self.has_path_rules:
+            path_values = _frame_values(*Matcher.munge_if_needed(data))
+
+        module_values: Sequence[str] = ()
+        if self.has_module_rules:
+            module_values = _frame_values(find_stack_frames(data), ["module"])
+
+        matching_codeowners = set()
+        for value in path_values:
+            for index in self.codeowners_trie.find(value.lstrip("/")):
+                if index not in matching_codeowners and self.codeowners_regexes[index].search(
+                    value
+                ):
+                    matching_codeowners.add(index)
+
+        rules = []
+        for index, rule in enumerate(self.rules):
+            matcher = rule.matcher
+            if matcher.type == CODEOWNERS:
+                matches = index in matching_codeowners
+            elif matcher.type in (PATH, MODULE):
+                matches = any(
+                    glob_match(value, matcher.pattern, ignorecase=True, path_normalize=True)
+                    for value in (path_values if matcher.type == PATH else module_values)
+                )
+            else:
+                matches = matcher.test(data)
+
+            if matches:
+                rules.append(rule)
+
+        return rules
+
+
 def parse_rules(data: str) -> Any:
     """Convert a raw text input into a Rule tree"""
     tree = ownership_grammar.parse(data)
@@ -58,11 +58,11 @@ from sentry.sentry_metrics import indexer
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.utils import (
     MetricIndexNotFound,
+    bulk_reverse_resolve,
     resolve,
     resolve_many_weak,
     resolve_tag_key,
     resolve_weak,
-    reverse_resolve,
 )
 from sentry.snuba.dataset import Dataset, EntityKey
 from sentry.snuba.metrics.naming_layer.mri import SessionMRI
@@ -219,9 +219,13 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             request, referrer="release_health.metrics.get_crash_free_data", use_cache=False
         )["data"]
 
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, org_id, {row[session_status] for row in count_data}
+        )
+
         for row in count_data:
             project_data = data.setdefault(row["project_id"], {})
-            tag_value = reverse_resolve(USE_CASE_ID, org_id, row[session_status])
+            tag_value = resolved[row[session_status]]
             project_data[tag_value] = row["value"]
 
         return data
@@ -640,18 +644,16 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             column_names = ["project_id"]
 
         def extract_row_info_func(
-            include_releases: bool,
+            include_releases: bool, resolved: Mapping[int, str]
         ) -> Callable[[Mapping[str, Union[int, str]]], ProjectOrRelease]:
             def f(row: Mapping[str, Union[int, str]]) -> ProjectOrRelease:
                 if include_releases:
-                    return row["project_id"], reverse_resolve(USE_CASE_ID, org_id, row.get(release_column_name))  # type: ignore
+                    return row["project_id"], resolved[row[release_column_name]]  # type: ignore
                 else:
                     return row["project_id"]  # type: ignore
 
             return f
 
-        extract_row_info = extract_row_info_func(includes_releases)
-
         query_cols = [Column(column_name) for column_name in column_names]
         group_by_clause = query_cols
 
@@ -667,6 +669,13 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             request, referrer="release_health.metrics.check_has_health_data", use_cache=False
         )
 
+        resolved: Mapping[int, str] = {}
+        if includes_releases:
+            resolved = bulk_reverse_resolve(
+                USE_CASE_ID, org_id, {row[release_column_name] for row in result["data"]}
+            )
+
+        extract_row_info = extract_row_info_func(includes_releases, resolved)
         return {extract_row_info(row) for row in result["data"]}
 
     def check_releases_have_health_data(
@@ -705,10 +714,10 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             use_cache=False,
         )
 
-        def extract_row_info(row: Mapping[str, Union[OrganizationId, str]]) -> ReleaseName:
-            return reverse_resolve(USE_CASE_ID, organization_id, row.get(release_column_name))  # type: ignore
-
-        return {extract_row_info(row) for row in result["data"]}
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, organization_id, {row[release_column_name] for row in result["data"]}
+        )
+        return set(resolved.values())
 
     @staticmethod
     def _get_session_duration_data_for_overview(
@@ -727,7 +736,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             Column("project_id"),
         ]
 
-        for row in raw_snql_query(
+        rows = raw_snql_query(
             Request(
                 dataset=Dataset.Metrics.value,
                 app_id=SnubaAppID,
@@ -759,11 +768,16 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 ),
             ),
             referrer="release_health.metrics.get_session_duration_data_for_overview",
-        )["data"]:
+        )["data"]
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, org_id, {row[release_column_name] for row in rows}
+        )
+
+        for row in rows:
             # See https://github.com/getsentry/snuba/blob/8680523617e06979427bfa18c6b4b4e8bf86130f/snuba/datasets/entities/metrics.py#L184 for quantiles
             key = (
                 row["project_id"],
-                reverse_resolve(USE_CASE_ID, org_id, row[release_column_name]),
+                resolved[row[release_column_name]],
             )
             rv_durations[key] = {
                 "duration_p50": row["percentiles"][0],
@@ -790,7 +804,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             Column("project_id"),
         ]
 
-        for row in raw_snql_query(
+        rows = raw_snql_query(
             Request(
                 dataset=Dataset.Metrics.value,
                 app_id=SnubaAppID,
@@ -810,8 +824,13 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 ),
             ),
             referrer="release_health.metrics.get_errored_sessions_for_overview",
-        )["data"]:
-            key = row["project_id"], reverse_resolve(USE_CASE_ID, org_id, row[release_column_name])
+        )["data"]
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, org_id, {row[release_column_name] for row in rows}
+        )
+
+        for row in rows:
+            key = row["project_id"], resolved[row[release_column_name]]
             rv_errored_sessions[key] = row["value"]
 
         return rv_errored_sessions
@@ -834,7 +853,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         rv_sessions: Dict[Tuple[int, str, str], int] = {}
 
-        for row in raw_snql_query(
+        rows = raw_snql_query(
             Request(
                 dataset=Dataset.Metrics.value,
                 app_id=SnubaAppID,
@@ -863,11 +882,19 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 ),
             ),
             referrer="release_health.metrics.get_abnormal_and_crashed_sessions_for_overview",
-        )["data"]:
+        )["data"]
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID,
+            org_id,
+            {row[release_column_name] for row in rows}
+            | {row[session_status_column_name] for row in rows},
+        )
+
+        for row in rows:
             key = (
                 row["project_id"],
-                reverse_resolve(USE_CASE_ID, org_id, row[release_column_name]),
-                reverse_resolve(USE_CASE_ID, org_id, row[session_status_column_name]),
+                resolved[row[release_column_name]],
+                resolved[row[session_status_column_name]],
             )
             rv_sessions[key] = row["value"]
 
@@ -914,7 +941,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             ),
         ]
 
-        for row in raw_snql_query(
+        rows = raw_snql_query(
             Request(
                 dataset=Dataset.Metrics.value,
                 app_id=SnubaAppID,
@@ -927,8 +954,13 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 ),
             ),
             referrer="release_health.metrics.get_users_and_crashed_users_for_overview",
-        )["data"]:
-            release = reverse_resolve(USE_CASE_ID, org_id, row[release_column_name])
+        )["data"]
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, org_id, {row[release_column_name] for row in rows}
+        )
+
+        for row in rows:
+            release = resolved[row[release_column_name]]
             for subkey in ("crashed_users", "all_users"):
                 key = (
                     row["project_id"],
@@ -995,7 +1027,7 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 ),
             )
 
-        for row in raw_snql_query(
+        rows = raw_snql_query(
             Request(
                 dataset=Dataset.Metrics.value,
                 app_id=SnubaAppID,
@@ -1008,12 +1040,17 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
                 ),
             ),
             referrer="release_health.metrics.get_health_stats_for_overview",
-        )["data"]:
+        )["data"]
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, org_id, {row[release_column_name] for row in rows}
+        )
+
+        for row in rows:
             time_bucket = int(
                 (parse_snuba_datetime(row["bucketed_time"]) - stats_start).total_seconds()
                 / stats_rollup
             )
-            key = row["project_id"], reverse_resolve(USE_CASE_ID, org_id, row[release_column_name])
+            key = row["project_id"], resolved[row[release_column_name]]
             timeseries = rv[key]
             if time_bucket < len(timeseries):
                 timeseries[time_bucket][1] = row["value"]
@@ -1395,8 +1432,12 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             use_cache=False,
         )
 
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, org_id, {row[release_column_name] for row in result["data"]}
+        )
+
         def extract_row_info(row: Mapping[str, Union[OrganizationId, str]]) -> ProjectRelease:
-            return row.get("project_id"), reverse_resolve(USE_CASE_ID, org_id, row.get(release_column_name))  # type: ignore
+            return row.get("project_id"), resolved[row[release_column_name]]  # type: ignore
 
         return [extract_row_info(row) for row in result["data"]]
 
@@ -1455,12 +1496,15 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             use_cache=False,
         )["data"]
 
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, org_id, {row[release_column_name] for row in rows}
+        )
         result = {}
 
         for row in rows:
             result[
                 row["project_id"],
-                reverse_resolve(USE_CASE_ID, org_id, row[release_column_name]),
+                resolved[row[release_column_name]],
             ] = row["oldest"]
 
         return result
@@ -1638,10 +1682,14 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
 
         series: DefaultDict[datetime, SessionCounts] = defaultdict(self._default_session_counts)
 
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, org_id, {row[session_status_key] for row in session_series_data}
+        )
+
         for row in session_series_data:
             dt = parse_snuba_datetime(row["bucketed_time"])
             target = series[dt]
-            status = reverse_resolve(USE_CASE_ID, org_id, row[session_status_key])
+            status = resolved[row[session_status_key]]
             value = int(row["value"])
             if status == "init":
                 target["sessions"] = value
@@ -2251,7 +2299,11 @@ class MetricsReleaseHealthBackend(ReleaseHealthBackend):
             use_cache=False,
         )
 
+        resolved = bulk_reverse_resolve(
+            USE_CASE_ID, org_id, {row[release_column_name] for row in rows["data"]}
+        )
+
         def extract_row_info(row: Mapping[str, Union[OrganizationId, str]]) -> ProjectRelease:
-            return row.get("project_id"), reverse_resolve(USE_CASE_ID, org_id, row.get(release_column_name))  # type: ignore
+            return row.get("project_id"), resolved[row[release_column_name]]  # type: ignore
 
         return [extract_row_info(row) for row in rows["data"]]
@@ -11,13 +11,14 @@ from django import forms
 from django.core.cache import cache
 from django.utils import timezone
 
-from sentry import release_health, tsdb
+from sentry import options, release_health, tsdb
 from sentry.eventstore.models import Event
 from sentry.issues.constants import ISSUE_TSDB_GROUP_MODELS, ISSUE_TSDB_USER_GROUP_MODELS
 from sentry.receivers.rules import DEFAULT_RULE_LABEL
 from sentry.rules import EventState
 from sentry.rules.conditions.base import EventCondition
 from sentry.utils import metrics
+from sentry.utils.hashlib import hash_values
 from sentry.utils.snuba import options_override
 
 standard_intervals = {
@@ -137,8 +138,39 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
         raise NotImplementedError  # subclass must implement
 
     def get_rate(self, event: Event, interval: str, environment_id: str) -> int:
-        _, duration = self.intervals[interval]
+        """
+        Return the rate for the event's group. Rules that check the same
+        condition for a group within ``rules.event-frequency.rate-cache-ttl``
+        seconds of each other share a single query.
+        """
+        ttl = options.get("rules.event-frequency.rate-cache-ttl")
+        if not ttl:
+            return self.calculate_rate(event, interval, environment_id)
+
         end = timezone.now()
+        cache_key = "r.c.efr:%s" % hash_values(
+            [
+                self.id,
+                event.group_id,
+                environment_id,
+                interval,
+                self.get_option("comparisonType", COMPARISON_TYPE_COUNT),
+                self.get_option("comparisonInterval"),
+                int(end.timestamp()) // ttl,
+            ]
+        )
+        result: int | None = cache.get(cache_key)
+        metrics.incr("rules.conditions.rate_cache", tags={"hit": result is not None})
+        if result is None:
+            result = self.calculate_rate(event, interval, environment_id, end=end)
+            cache.set(cache_key, result, ttl)
+        return result
+
+    def calculate_rate(
+        self, event: Event, interval: str, environment_id: str, end: datetime | None = None
+    ) -> int:
+        _, duration = self.intervals[interval]
+        end = end or timezone.now()
         # For conditions with interval >= 1 hour we don't need to worry about read your writes
         # consistency. Disable it so that we can scale to more nodes.
         option_override_cm = contextlib.nullcontext()
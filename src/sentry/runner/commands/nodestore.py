@@ -0,0 +1,72 @@
+import os
+import random
+
+import click
+
+from sentry.runner.decorators import configuration
+
+
+@click.group()
+def nodestore():
+    """Tools for managing the node store."""
+
+
+@nodestore.command("train-compression-dictionary")
+@click.argument("output_dir", type=click.Path(file_okay=False, writable=True), required=True)
+@click.option("--samples", default=10000, show_default=True, help="The number of nodes to sample.")
+@click.option(
+    "--size", default=112640, show_default=True, help="The maximum dictionary size in bytes."
+)
+@click.option("--level", default=3, show_default=True, help="The zstd compression level.")
+@click.option("--dict-id", type=int, default=None, help="The dictionary ID (random by default).")
+@configuration
+def train_compression_dictionary(output_dir, samples, size, level, dict_id):
+    """
+    Train a zstd compression dictionary from sampled nodes.
+
+    The dictionary is written to OUTPUT_DIR as `<dict_id>.zdict`. Deploy it to
+    the `compression_dictionaries_path` of the Bigtable node store on every
+    host before setting `compression_dictionary_id` to start writing with it,
+    and keep it there for as long as nodes compressed with it are retained.
+
+    A tenth of the samples is held back to compare the compression ratio with
+    and without the dictionary.
+    """
+    import zstandard
+
+    from sentry import nodestore as nodestore_service
+    from sentry.nodestore.bigtable.backend import COMPRESSION_DICTIONARY_SUFFIX
+    from sentry.utils.kvstore.bigtable import BigtableKVStorage
+
+    store = getattr(nodestore_service.backend, "store", None)
+    if not isinstance(store, BigtableKVStorage):
+        raise click.ClickException("Compression dictionaries require the Bigtable node store.")
+
+    values = [value for _, value in store.sample(samples)]
+    if len(values) < 10:
+        raise click.ClickException(f"Not enough nodes to train a dictionary ({len(values)}).")
+
+    random.shuffle(values)
+    held_back = values[: len(values) // 10]
+    training = values[len(values) // 10 :]
+
+    if dict_id is None:
+        # IDs below 32768 are reserved by zstd
+        dict_id = random.randint(32768, 2**31 - 1)
+
+    click.echo(f"Training dictionary {dict_id} from {len(training)} nodes...")
+    dictionary = zstandard.train_dictionary(size, training, dict_id=dict_id, level=level)
+
+    raw_size = sum(len(value) for value in held_back)
+    plain = zstandard.ZstdCompressor(level=level)
+    with_dict = zstandard.ZstdCompressor(level=level, dict_data=dictionary)
+    plain_size = sum(len(plain.compress(value)) for value in held_back)
+    dict_size = sum(len(with_dict.compress(value)) for value in held_back)
+    click.echo(f"Compression ratio without dictionary: {raw_size / plain_size:.2f}")
+    click.echo(f"Compression ratio with dictionary:    {raw_size / dict_size:.2f}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{dictionary.dict_id()}{COMPRESSION_DICTIONARY_SUFFIX}")
+    with open(path, "wb") as f:
+        f.write(dictionary.as_bytes())
+    click.echo(f"Written to {path}")
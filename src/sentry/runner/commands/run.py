@@ -517,6 +517,12 @@ def batching_kafka_options(group):
     default=None,
     help="Thread pool size (only utilitized for message types that support concurrent processing)",
 )
+@click.option(
+    "--processes",
+    type=int,
+    default=None,
+    help="Process events on a pool of this many worker processes, sharded by project. Cannot be combined with --concurrency.",
+)
 @configuration
 def ingest_consumer(consumer_types, all_consumer_types, **options):
     """
@@ -540,6 +546,9 @@ def ingest_consumer(consumer_types, all_consumer_types, **options):
         raise click.ClickException("Need to specify --all-consumer-types or --consumer-type")
 
     concurrency = options.pop("concurrency", None)
+    if concurrency is not None and options.get("processes") is not None:
+        raise click.ClickException("Cannot specify --concurrency and --processes at the same time")
+
     if concurrency is not None:
         executor = ThreadPoolExecutor(concurrency)
     else:
@@ -0,0 +1,52 @@
+--[[
+
+Counter Sums
+============
+
+Sums counters of the ``RedisTSDB`` across rollup buckets, so that only the
+totals need to be returned to the client.
+
+Counters are stored as fields of hashes (one hash per model, rollup bucket and
+vnode). The hashes to sum are passed as ``KEYS``, they must all be stored on
+the host the script is executed on. ``ARGV`` starts with one argument per key,
+the (1-based) index of the group of fields to read from the hash. It is
+followed by the groups of fields, each consisting of the number of fields in
+the group, followed by the fields themselves.
+
+The sums of the fields are returned in the order in which they are passed in
+``ARGV``, across all groups. Fields that are missing count as zero.
+
+]]--
+
+local groups = {}
+local offset = #KEYS + 1
+while offset <= #ARGV do
+    local size = tonumber(ARGV[offset])
+    local fields = {}
+    for i = 1, size do
+        fields[i] = ARGV[offset + i]
+    end
+    table.insert(groups, {fields = fields, offset = 0})
+    offset = offset + size + 1
+end
+
+-- Every group gets a range of the result.
+local sums = {}
+for _, group in ipairs(groups) do
+    group.offset = #sums
+    for i = 1, #group.fields do
+        table.insert(sums, 0)
+    end
+end
+
+for k, key in ipairs(KEYS) do
+    local group = groups[tonumber(ARGV[k])]
+    for i, field in ipairs(group.fields) do
+        local value = redis.call('HGET', key, field)
+        if value then
+            sums[group.offset + i] = sums[group.offset + i] + tonumber(value)
+        end
+    end
+end
+
+return sums
@@ -1,6 +1,6 @@
 import logging
 import random
-from typing import Mapping, MutableMapping, Optional, Sequence, Set
+from typing import Collection, Mapping, MutableMapping, Optional, Sequence, Set, Tuple, Union
 
 from django.conf import settings
 from django.core.cache import caches
@@ -15,12 +15,23 @@ from sentry.sentry_metrics.indexer.base import (
 )
 from sentry.utils import metrics
 from sentry.utils.hashlib import md5_text
+from sentry.utils.lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
 _INDEXER_CACHE_METRIC = "sentry_metrics.indexer.memcache"
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+
+# (org_id, string) for lookups of ids, (org_id, id) for lookups of strings
+LocalCacheKey = Tuple[int, Union[str, int]]
+
+
+def jittered_ttl(ttl: int) -> int:
+    # introduce jitter in the cache_ttl so that when we have large
+    # amount of new keys written into the cache, they don't expire all at once
+    return int(ttl + random.uniform(0, 0.25) * ttl)
 
 
 class StringIndexerCache:
@@ -31,11 +42,7 @@ class StringIndexerCache:
 
     @property
     def randomized_ttl(self) -> int:
-        # introduce jitter in the cache_ttl so that when we have large
-        # amount of new keys written into the cache, they don't expire all at once
-        cache_ttl = settings.SENTRY_METRICS_INDEXER_CACHE_TTL
-        jitter = random.uniform(0, 0.25) * cache_ttl
-        return int(cache_ttl + jitter)
+        return jittered_ttl(settings.SENTRY_METRICS_INDEXER_CACHE_TTL)
 
     def make_cache_key(self, key: str, cache_namespace: str) -> str:
         hashed = md5_text(key).hexdigest()
@@ -80,7 +87,8 @@ class StringIndexerCache:
         results: Mapping[str, Optional[int]] = self.cache.get_many(
             cache_keys.keys(), version=self.version
         )
-        return self._format_results(keys, results, cache_namespace)
+        # same as `_format_results`, without hashing every key a second time
+        return {key: results.get(cache_key) for cache_key, key in cache_keys.items()}
 
     def set_many(self, key_values: Mapping[str, int], cache_namespace: str) -> None:
         cache_key_values = {
@@ -97,16 +105,84 @@ class StringIndexerCache:
         self.cache.delete_many(cache_keys, version=self.version)
 
 
+def make_local_cache() -> Optional[LRUCache]:
+    """
+    In-process cache of indexer mappings in both directions, keyed by
+    ``(use_case_id, org_id, string)`` and ``(use_case_id, org_id, id)``.
+
+    This is the first tier in front of `StringIndexerCache`: most strings of
+    a metrics batch (metric names, common tag keys and values) repeat from
+    one batch to the next, and are served from here without hashing keys or
+    a round trip to memcache.
+    """
+    size = settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE
+    if not size:
+        return None
+    return LRUCache(max_items=size, ttl=settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_TTL)
+
+
 class CachingIndexer(StringIndexer):
     def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
         self.cache = cache
         self.indexer = indexer
+        self.local_cache = make_local_cache()
+
+    def _get_local(
+        self, use_case_id: UseCaseKey, keys: Collection[LocalCacheKey], caller: str
+    ) -> Mapping[LocalCacheKey, Union[str, int]]:
+        if self.local_cache is None:
+            return {}
+
+        results = {
+            key[1:]: value
+            for key, value in self.local_cache.get_many(
+                (use_case_id.value, *key) for key in keys
+            ).items()
+        }
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "true", "caller": caller},
+            amount=len(results),
+        )
+        metrics.incr(
+            _INDEXER_LOCAL_CACHE_METRIC,
+            tags={"cache_hit": "false", "caller": caller},
+            amount=len(keys) - len(results),
+        )
+        return results
+
+    def _set_local(self, use_case_id: UseCaseKey, ids: Mapping[Tuple[int, str], int]) -> None:
+        if self.local_cache is None or not ids:
+            return
+
+        items: MutableMapping[object, Union[str, int]] = {}
+        for (org_id, string), id in ids.items():
+            items[(use_case_id.value, org_id, string)] = id
+            items[(use_case_id.value, org_id, id)] = string
+        self.local_cache.set_many(
+            items, ttl=jittered_ttl(settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_TTL)
+        )
 
     def bulk_record(
         self, use_case_id: UseCaseKey, org_strings: Mapping[int, Set[str]]
     ) -> KeyResults:
-        cache_keys = KeyCollection(org_strings)
-        metrics.gauge("sentry_metrics.indexer.lookups_per_batch", value=cache_keys.size)
+        keys = KeyCollection(org_strings)
+        metrics.gauge("sentry_metrics.indexer.lookups_per_batch", value=keys.size)
+
+        cache_key_results = KeyResults()
+        local_results = self._get_local(use_case_id, keys.as_tuples(), "get_many_ids")
+        cache_key_results.add_key_results(
+            [
+                KeyResult(org_id, str(string), int(id))
+                for (org_id, string), id in local_results.items()
+            ],
+            FetchType.CACHE_HIT,
+        )
+
+        cache_keys = cache_key_results.get_unmapped_keys(keys)
+        if cache_keys.size == 0:
+            return cache_key_results
+
         cache_key_strs = cache_keys.as_strings()
         cache_results = self.cache.get_many(cache_key_strs, use_case_id.value)
 
@@ -128,10 +204,13 @@ class CachingIndexer(StringIndexer):
             amount=cache_keys.size,
         )
 
-        cache_key_results = KeyResults()
-        cache_key_results.add_key_results(
-            [KeyResult.from_string(k, v) for k, v in cache_results.items() if v is not None],
-            FetchType.CACHE_HIT,
+        memcache_results = [
+            KeyResult.from_string(k, v) for k, v in cache_results.items() if v is not None
+        ]
+        cache_key_results.add_key_results(memcache_results, FetchType.CACHE_HIT)
+        self._set_local(
+            use_case_id,
+            {(result.org_id, result.string): int(result.id) for result in memcache_results},
         )
 
         db_record_keys = cache_key_results.get_unmapped_keys(cache_keys)
@@ -143,6 +222,15 @@ class CachingIndexer(StringIndexer):
         self.cache.set_many(
             db_record_key_results.get_mapped_key_strings_to_ints(), use_case_id.value
         )
+        self._set_local(
+            use_case_id,
+            {
+                (org_id, string): id
+                for org_id, strings in db_record_key_results.get_mapped_results().items()
+                for string, id in strings.items()
+                if id is not None
+            },
+        )
         return cache_key_results.merge(db_record_key_results)
 
     def record(self, use_case_id: UseCaseKey, org_id: int, string: str) -> Optional[int]:
@@ -150,11 +238,18 @@ class CachingIndexer(StringIndexer):
         return result[org_id][string]
 
     def resolve(self, use_case_id: UseCaseKey, org_id: int, string: str) -> Optional[int]:
+        local_result = self._get_local(use_case_id, [(org_id, string)], "resolve").get(
+            (org_id, string)
+        )
+        if local_result is not None:
+            return int(local_result)
+
         key = f"{org_id}:{string}"
         result = self.cache.get(key, use_case_id.value)
 
         if result and isinstance(result, int):
             metrics.incr(_INDEXER_CACHE_METRIC, tags={"cache_hit": "true", "caller": "resolve"})
+            self._set_local(use_case_id, {(org_id, string): result})
             return result
 
         metrics.incr(_INDEXER_CACHE_METRIC, tags={"cache_hit": "false", "caller": "resolve"})
@@ -162,8 +257,29 @@ class CachingIndexer(StringIndexer):
 
         if id is not None:
             self.cache.set(key, id, use_case_id.value)
+            self._set_local(use_case_id, {(org_id, string): id})
 
         return id
 
     def reverse_resolve(self, use_case_id: UseCaseKey, org_id: int, id: int) -> Optional[str]:
-        return self.indexer.reverse_resolve(use_case_id, org_id, id)
+        return self.bulk_reverse_resolve(use_case_id, org_id, [id]).get(id)
+
+    def bulk_reverse_resolve(
+        self, use_case_id: UseCaseKey, org_id: int, ids: Collection[int]
+    ) -> Mapping[int, str]:
+        results = {
+            int(key[1]): str(string)
+            for key, string in self._get_local(
+                use_case_id, [(org_id, id) for id in ids], "bulk_reverse_resolve"
+            ).items()
+        }
+        ids_left = [id for id in ids if id not in results]
+        if not ids_left:
+            return results
+
+        indexer_results = self.indexer.bulk_reverse_resolve(use_case_id, org_id, ids_left)
+        self._set_local(
+            use_case_id, {(org_id, string): id for id, string in indexer_results.items()}
+        )
+        results.update(indexer_results)
+        return results
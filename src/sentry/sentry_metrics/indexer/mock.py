@@ -1,6 +1,6 @@
 import itertools
 from collections import defaultdict
-from typing import DefaultDict, Dict, Mapping, Optional, Set
+from typing import Collection, DefaultDict, Dict, Mapping, Optional, Set
 
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.indexer.base import (
@@ -61,6 +61,11 @@ class RawSimpleIndexer(StringIndexer):
     def reverse_resolve(self, use_case_id: UseCaseKey, org_id: int, id: int) -> Optional[str]:
         return self._reverse.get(id)
 
+    def bulk_reverse_resolve(
+        self, use_case_id: UseCaseKey, org_id: int, ids: Collection[int]
+    ) -> Mapping[int, str]:
+        return {id: self._reverse[id] for id in ids if id in self._reverse}
+
     def _record(self, org_id: int, string: str) -> Optional[int]:
         index = self._strings[org_id][string]
         if index is not None:
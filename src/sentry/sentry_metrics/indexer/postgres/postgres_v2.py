@@ -1,7 +1,7 @@
 from functools import reduce
 from operator import or_
 from time import sleep
-from typing import Any, Mapping, Optional, Sequence, Set
+from typing import Any, Collection, Mapping, Optional, Sequence, Set
 
 from django.conf import settings
 from django.db.models import Q
@@ -191,6 +191,21 @@ class PGStringIndexerV2(StringIndexer):
         string: str = obj.string
         return string
 
+    def bulk_reverse_resolve(
+        self, use_case_id: UseCaseKey, org_id: int, ids: Collection[int]
+    ) -> Mapping[int, str]:
+        """Lookup the stored strings for multiple integer IDs, with a single
+        cache lookup and a single query for the IDs missing from the cache.
+        """
+        table = self._table(use_case_id)
+        objs = table.objects.get_many_from_cache(list(ids), use_replica=True)
+
+        results = {}
+        for obj in objs:
+            assert obj.organization_id == org_id
+            results[obj.id] = obj.string
+        return results
+
     def _table(self, use_case_id: UseCaseKey) -> IndexerTable:
         return TABLE_MAPPING[use_case_id]
 
@@ -1,4 +1,4 @@
-from typing import Optional, Sequence, Union
+from typing import Collection, Dict, Mapping, Optional, Sequence, Set, Union
 
 from sentry import options
 from sentry.api.utils import InvalidParams
@@ -41,6 +41,53 @@ def reverse_resolve(use_case_id: UseCaseKey, org_id: int, index: int) -> str:
     return resolved
 
 
+def bulk_reverse_resolve(
+    use_case_id: UseCaseKey, org_id: int, indexes: Collection[int]
+) -> Mapping[int, str]:
+    """
+    Bulk version of `reverse_resolve`, returning a mapping of index to string.
+    Raises `MetricIndexNotFound` if any of the indexes cannot be resolved.
+    """
+    indexes = set(indexes)
+    if not indexes:
+        return {}
+
+    assert all(index > 0 for index in indexes)
+    resolved = indexer.bulk_reverse_resolve(use_case_id, org_id, indexes)
+    # The indexer should never miss integers > 0:
+    if len(resolved) != len(indexes):
+        raise MetricIndexNotFound()
+
+    return resolved
+
+
+def bulk_reverse_resolve_tag_values(
+    use_case_id: UseCaseKey,
+    org_id: int,
+    indexes: Collection[Union[int, str, None]],
+    weak: bool = False,
+) -> Mapping[Union[int, str, None], Optional[str]]:
+    """
+    Bulk version of `reverse_resolve_tag_value`, returning a mapping of all
+    given tag values to their resolved strings. All integers are resolved with
+    a single indexer lookup.
+    """
+    results: Dict[Union[int, str, None], Optional[str]] = {}
+    int_indexes: Set[int] = set()
+    for index in indexes:
+        if isinstance(index, str) or index is None:
+            results[index] = index
+        elif weak and index == TAG_NOT_SET:
+            results[index] = None
+        else:
+            int_indexes.add(index)
+
+    if int_indexes:
+        results.update(bulk_reverse_resolve(use_case_id, org_id, int_indexes))
+
+    return results
+
+
 def reverse_resolve_weak(use_case_id: UseCaseKey, org_id: int, index: int) -> Optional[str]:
     """
     Resolve an index value back to a string, special-casing 0 to return None.
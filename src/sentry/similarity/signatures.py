@@ -1,3 +1,5 @@
+from itertools import repeat
+
 import mmh3
 
 
@@ -7,7 +9,11 @@ class MinHashSignatureBuilder:
         self.rows = rows
 
     def __call__(self, features):
+        # Repeated features cannot change the minimum of any column, so each
+        # distinct feature is only hashed once per column.
+        features = set(features)
+        rows = self.rows
         return [
-            min(mmh3.hash(feature, column) % self.rows for feature in features)
+            min(value % rows for value in map(mmh3.hash, features, repeat(column)))
             for column in range(self.columns)
         ]
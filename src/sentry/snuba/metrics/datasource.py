@@ -24,9 +24,10 @@ from sentry.sentry_metrics import indexer
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.utils import (
     MetricIndexNotFound,
+    bulk_reverse_resolve,
+    bulk_reverse_resolve_tag_values,
     resolve_tag_key,
     reverse_resolve,
-    reverse_resolve_tag_value,
 )
 from sentry.snuba.dataset import Dataset, EntityKey
 from sentry.snuba.metrics.fields import run_metrics_query
@@ -396,19 +397,18 @@ def _fetch_tags_or_values_per_ids(
 
     if column.startswith(("tags[", "tags_raw[")):
         tag_id = column.split("[")[1].split("]")[0]
+        tag_key = reverse_resolve(use_case_id, org_id, int(tag_id))
+        tag_values = bulk_reverse_resolve_tag_values(use_case_id, org_id, tag_or_value_ids)
         tags_or_values = [
-            {
-                "key": reverse_resolve(use_case_id, org_id, int(tag_id)),
-                "value": reverse_resolve_tag_value(use_case_id, org_id, value_id),
-            }
-            for value_id in tag_or_value_ids
+            {"key": tag_key, "value": tag_values[value_id]} for value_id in tag_or_value_ids
         ]
         tags_or_values.sort(key=lambda tag: (tag["key"], tag["value"]))
     else:
+        tag_keys = bulk_reverse_resolve(use_case_id, org_id, tag_or_value_ids)
         tags_or_values = [
             {"key": reversed_tag}
             for tag_id in tag_or_value_ids
-            if (reversed_tag := reverse_resolve(use_case_id, org_id, tag_id)) not in UNALLOWED_TAGS
+            if (reversed_tag := tag_keys[tag_id]) not in UNALLOWED_TAGS
         ]
         tags_or_values.sort(key=itemgetter("key"))
 
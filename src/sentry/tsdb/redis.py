@@ -25,6 +25,8 @@ SketchParameters = namedtuple("SketchParameters", "depth width capacity")
 
 CountMinScript = SentryScript(None, resource_string("sentry", "scripts/tsdb/cmsketch.lua"))
 
+CounterSumScript = SentryScript(None, resource_string("sentry", "scripts/tsdb/counters.lua"))
+
 
 class SuppressionWrapper:
     """\
@@ -291,26 +293,94 @@ class RedisTSDB(BaseTSDB):
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
         series = [to_datetime(item) for item in series]
 
-        results = []
+        # The counters of all keys that share a vnode are stored in the same
+        # hash for each rollup bucket, so they can be read with one command.
+        fields_by_hash_key = defaultdict(lambda: defaultdict(list))
+        for key in keys:
+            for timestamp in series:
+                hash_key, hash_field = self.make_counter_key(
+                    model, rollup, timestamp, key, environment_id
+                )
+                fields_by_hash_key[hash_key][hash_field].append((to_timestamp(timestamp), key))
+
+        responses = {}
         cluster, _ = self.get_cluster(environment_id)
         with cluster.map() as client:
-            for key in keys:
-                for timestamp in series:
-                    hash_key, hash_field = self.make_counter_key(
-                        model, rollup, timestamp, key, environment_id
-                    )
-                    results.append(
-                        (to_timestamp(timestamp), key, client.hget(hash_key, hash_field))
-                    )
+            for hash_key, fields in fields_by_hash_key.items():
+                responses[hash_key] = client.hmget(hash_key, list(fields))
 
         results_by_key = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
+        for hash_key, fields in fields_by_hash_key.items():
+            for points, count in zip(fields.values(), responses[hash_key].value):
+                for epoch, key in points:
+                    results_by_key[key][epoch] = int(count or 0)
 
         for key, points in results_by_key.items():
             results_by_key[key] = sorted(points.items())
         return dict(results_by_key)
 
+    def get_sums(
+        self,
+        model,
+        keys,
+        start,
+        end,
+        rollup=None,
+        environment_id=None,
+        use_cache=False,
+        jitter_value=None,
+    ):
+        """
+        Sums up the counters of each key on the hosts they are stored on,
+        using one command per host.
+        """
+        self.validate_arguments([model], [environment_id])
+
+        rollup, series = self.get_optimal_rollup_series(start, end, rollup)
+        series = [to_datetime(item) for item in series]
+
+        keys_by_field = defaultdict(set)
+        fields_by_hash_key = defaultdict(dict)
+        for key in keys:
+            for timestamp in series:
+                hash_key, hash_field = self.make_counter_key(
+                    model, rollup, timestamp, key, environment_id
+                )
+                fields_by_hash_key[hash_key][hash_field] = None
+                keys_by_field[hash_field].add(key)
+
+        cluster, _ = self.get_cluster(environment_id)
+        router = cluster.get_router()
+        hash_keys_by_host = defaultdict(list)
+        for hash_key in fields_by_hash_key:
+            hash_keys_by_host[router.get_host_for_key(hash_key)].append(hash_key)
+
+        # All hashes of a vnode have the same fields, pass them to the script
+        # once per host (see ``counters.lua`` for the format of the arguments.)
+        commands = {}
+        fields_by_command = {}
+        for hash_keys in hash_keys_by_host.values():
+            groups = {}
+            arguments = []
+            for hash_key in hash_keys:
+                fields = tuple(fields_by_hash_key[hash_key])
+                arguments.append(groups.setdefault(fields, len(groups) + 1))
+            for fields in groups:
+                arguments.append(len(fields))
+                arguments.extend(fields)
+
+            # The commands are routed to the host of their first key.
+            commands[hash_keys[0]] = [(CounterSumScript, hash_keys, arguments)]
+            fields_by_command[hash_keys[0]] = [field for fields in groups for field in fields]
+
+        results = {key: 0 for key in keys}
+        for routing_key, responses in cluster.execute_commands(commands).items():
+            for field, count in zip(fields_by_command[routing_key], responses[0].value):
+                for key in keys_by_field[field]:
+                    results[key] += int(count)
+
+        return results
+
     def merge(self, model, destination, sources, timestamp=None, environment_ids=None):
         environment_ids = (set(environment_ids) if environment_ids is not None else set()).union(
             [None]
@@ -5,6 +5,7 @@ from typing import Any, Collection, Mapping, Optional, Sequence, Tuple, Union
 
 from sentry import eventstream
 from sentry.eventstore.models import Event
+from sentry.grouping.grouphash_cache import invalidate_grouphash_cache
 from sentry.models.grouphash import GroupHash
 from sentry.models.project import Project
 from sentry.utils.datastructures import BidirectionalMapping
@@ -120,6 +121,7 @@ class PrimaryHashUnmergeReplacement(UnmergeReplacement):
         GroupHash.objects.filter(project_id=project.id, hash__in=locked_primary_hashes).update(
             group=destination_id
         )
+        invalidate_grouphash_cache(project.id)
 
     def get_activity_args(self) -> Mapping[str, Any]:
         return {"fingerprints": self.fingerprints}
@@ -1,3 +1,4 @@
+import threading
 import zlib
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar
@@ -92,3 +93,41 @@ class ZstdCodec(Codec[bytes, bytes]):
 
     def decode(self, value: bytes) -> bytes:
         return zstandard.ZstdDecompressor().decompress(value)
+
+
+class ZstdDictCodec(Codec[bytes, bytes]):
+    """
+    Encode/decode bytes with zstd, using a trained compression dictionary.
+
+    Loading the dictionary is the expensive part of creating a compressor or
+    decompressor, so those are kept around (per thread, as they can't be
+    shared between threads.)
+    """
+
+    def __init__(self, dictionary: zstandard.ZstdCompressionDict, level: int = 3) -> None:
+        self.dictionary = dictionary
+        self.level = level
+        self.dictionary.precompute_compress(level=level)
+        self.__local = threading.local()
+
+    @property
+    def dict_id(self) -> int:
+        return int(self.dictionary.dict_id())
+
+    def encode(self, value: bytes) -> bytes:
+        try:
+            compressor = self.__local.compressor
+        except AttributeError:
+            compressor = self.__local.compressor = zstandard.ZstdCompressor(
+                level=self.level, dict_data=self.dictionary
+            )
+        return compressor.compress(value)
+
+    def decode(self, value: bytes) -> bytes:
+        try:
+            decompressor = self.__local.decompressor
+        except AttributeError:
+            decompressor = self.__local.decompressor = zstandard.ZstdDecompressor(
+                dict_data=self.dictionary
+            )
+        return decompressor.decompress(value)
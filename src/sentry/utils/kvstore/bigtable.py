@@ -1,18 +1,21 @@
 import enum
 import logging
+import random
 import struct
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from threading import Lock
-from typing import Any, Iterator, Mapping, Optional, Sequence, Tuple, cast
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, cast
 
+import zstandard
 from django.utils import timezone
 from google.api_core import exceptions, retry
 from google.cloud import bigtable
-from google.cloud.bigtable.row import PartialRowData
+from google.cloud.bigtable.row import DirectRow, PartialRowData
 from google.cloud.bigtable.row_set import RowSet
 from google.cloud.bigtable.table import Table
 
-from sentry.utils.codecs import Codec, ZlibCodec, ZstdCodec
+from sentry.utils.codecs import Codec, ZlibCodec, ZstdCodec, ZstdDictCodec
 from sentry.utils.kvstore.abstract import KVStorage
 
 logger = logging.getLogger(__name__)
@@ -43,20 +46,30 @@ class BigtableKVStorage(KVStorage[str, bytes]):
     # The flags column contains a single byte that represents a bit set. The
     # structure of the bit set is defined in ``Flags``. If this column is not
     # present in the row returned by Bigtable, its value is assumed to be 0.
+    # If ``COMPRESSED_ZSTD_DICT`` is set, the bit set is followed by the ID of
+    # the compression dictionary the data was compressed with.
     flags_column = b"f"
     flags_struct = struct.Struct("B")
+    dictionary_id_struct = struct.Struct("<I")
 
     class Flags(enum.IntFlag):
         # XXX: Compression flags are assumed to be mutually exclusive, the
         # behavior is explicitly undefined if both bits are set on a record.
         COMPRESSED_ZLIB = 1 << 0
         COMPRESSED_ZSTD = 1 << 1
+        COMPRESSED_ZSTD_DICT = 1 << 2
 
     compression_strategies: Mapping[str, Tuple[Flags, Codec[bytes, bytes]]] = {
         "zlib": (Flags.COMPRESSED_ZLIB, ZlibCodec()),
         "zstd": (Flags.COMPRESSED_ZSTD, ZstdCodec()),
     }
 
+    # ``set_many`` and ``delete_many`` send their mutations in batches of at
+    # most ``mutate_batch_size`` rows, with up to ``mutate_concurrency``
+    # batches in flight at the same time.
+    mutate_batch_size = 100
+    mutate_concurrency = 4
+
     def __init__(
         self,
         instance: str,
@@ -66,7 +79,15 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         default_ttl: Optional[timedelta] = None,
         compression: Optional[str] = None,
         app_profile: Optional[str] = None,
+        compression_dictionaries: Optional[Sequence[zstandard.ZstdCompressionDict]] = None,
+        compression_dictionary_id: Optional[int] = None,
     ) -> None:
+        """
+        ``compression_dictionaries`` are the trained zstd dictionaries that
+        values may have been written with, all of them are needed for reading.
+        If ``compression_dictionary_id`` is set, new values are compressed with
+        that dictionary instead of ``compression``.
+        """
         client_options = client_options if client_options is not None else {}
         if "admin" in client_options:
             raise ValueError('"admin" cannot be provided as a client option')
@@ -74,12 +95,24 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         if compression is not None and compression not in self.compression_strategies:
             raise ValueError(f'"compression" must be one of {self.compression_strategies.keys()!r}')
 
+        self.dictionary_codecs: Dict[int, ZstdDictCodec] = {}
+        for dictionary in compression_dictionaries or ():
+            codec = ZstdDictCodec(dictionary)
+            self.dictionary_codecs[codec.dict_id] = codec
+
+        if (
+            compression_dictionary_id is not None
+            and compression_dictionary_id not in self.dictionary_codecs
+        ):
+            raise ValueError(f"unknown compression dictionary {compression_dictionary_id!r}")
+
         self.project = project
         self.instance = instance
         self.table_name = table_name
         self.client_options = client_options
         self.default_ttl = default_ttl
         self.compression = compression
+        self.compression_dictionary_id = compression_dictionary_id
         self.app_profile = app_profile
 
         self.__table: Table
@@ -133,6 +166,23 @@ class BigtableKVStorage(KVStorage[str, bytes]):
             if value is not None:
                 yield row.row_key.decode("utf-8"), value
 
+    def sample(self, limit: int, ranges: int = 10) -> Iterator[Tuple[str, bytes]]:
+        """
+        Read up to ``limit`` values from rows spread across the table, e.g. to
+        train compression dictionaries. Rows are read in up to ``ranges`` runs
+        that start at randomly picked tablet boundaries.
+        """
+        table = self._get_table()
+        boundaries = [sample.row_key for sample in table.sample_row_keys() if sample.row_key]
+        starts = random.sample(boundaries, min(ranges, len(boundaries))) if boundaries else [b""]
+        rows_per_range = max(1, limit // len(starts))
+
+        for start in starts:
+            for row in table.read_rows(start_key=start, limit=rows_per_range):
+                value = self.__decode_row(row)
+                if value is not None:
+                    yield row.row_key.decode("utf-8"), value
+
     def __decode_row(self, row: PartialRowData) -> Optional[bytes]:
         columns = row.cells[self.column_family]
 
@@ -153,7 +203,20 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         value = cast(bytes, cell.value)
 
         if self.flags_column in columns:
-            flags = self.Flags(self.flags_struct.unpack(columns[self.flags_column][0].value)[0])
+            flags_value = columns[self.flags_column][0].value
+            flags = self.Flags(self.flags_struct.unpack_from(flags_value)[0])
+
+            if self.Flags.COMPRESSED_ZSTD_DICT in flags:
+                [dictionary_id] = self.dictionary_id_struct.unpack_from(
+                    flags_value, self.flags_struct.size
+                )
+                try:
+                    codec = self.dictionary_codecs[dictionary_id]
+                except KeyError:
+                    raise BigtableError(
+                        f"Row {row.row_key!r} uses unknown compression dictionary {dictionary_id}"
+                    )
+                return codec.decode(value)
 
             # Check if there is a compression flag set, if so decompress the value.
             # XXX: If no compression flags are matched, we unfortunately can't
@@ -182,9 +245,33 @@ class BigtableKVStorage(KVStorage[str, bytes]):
             return self._set(key, value, ttl)
 
     def _set(self, key: str, value: bytes, ttl: Optional[timedelta] = None) -> None:
+        row = self._build_row(self._get_table(), key, value, ttl)
+
+        status = row.commit()
+        if status.code != 0:
+            raise BigtableError(status.code, status.message)
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]], ttl: Optional[timedelta] = None) -> None:
+        try:
+            return self._set_many(items, ttl)
+        except exceptions.InternalServerError:
+            # Delete cached client before retry, same as ``set``
+            with self.__table_lock:
+                del self.__table
+            return self._set_many(items, ttl)
+
+    def _set_many(
+        self, items: Sequence[Tuple[str, bytes]], ttl: Optional[timedelta] = None
+    ) -> None:
+        table = self._get_table()
+        self._mutate_rows([self._build_row(table, key, value, ttl) for key, value in items])
+
+    def _build_row(
+        self, table: Table, key: str, value: bytes, ttl: Optional[timedelta] = None
+    ) -> DirectRow:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
         # ``bytes`` but we are providing it with ``str``.
-        row = self._get_table().direct_row(key)
+        row = table.direct_row(key)
 
         # Call to delete is just a state mutation, and in this case is just
         # used to clear all columns so the entire row will be replaced.
@@ -222,19 +309,24 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         # Track flags for metadata about this row. This only flag we're
         # tracking now is whether compression is on or not for the data column.
         flags = self.Flags(0)
+        flags_suffix = b""
 
-        if self.compression:
+        if self.compression_dictionary_id is not None:
+            flags |= self.Flags.COMPRESSED_ZSTD_DICT
+            flags_suffix = self.dictionary_id_struct.pack(self.compression_dictionary_id)
+            value = self.dictionary_codecs[self.compression_dictionary_id].encode(value)
+        elif self.compression:
             compression_flag, strategy = self.compression_strategies[self.compression]
             flags |= compression_flag
             value = strategy.encode(value)
 
         # Only need to write the column at all if any flags are enabled. And if
-        # so, pack it into a single byte.
+        # so, pack it into a single byte (plus the dictionary ID, if any.)
         if flags:
             row.set_cell(
                 self.column_family,
                 self.flags_column,
-                self.flags_struct.pack(flags),
+                self.flags_struct.pack(flags) + flags_suffix,
                 timestamp=ts,
             )
 
@@ -242,9 +334,7 @@ class BigtableKVStorage(KVStorage[str, bytes]):
 
         row.set_cell(self.column_family, self.data_column, value, timestamp=ts)
 
-        status = row.commit()
-        if status.code != 0:
-            raise BigtableError(status.code, status.message)
+        return row
 
     def delete(self, key: str) -> None:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
@@ -267,11 +357,31 @@ class BigtableKVStorage(KVStorage[str, bytes]):
             row.delete()
             rows.append(row)
 
-        errors = []
-        for status in table.mutate_rows(rows):
-            if status.code != 0:
-                errors.append(BigtableError(status.code, status.message))
+        self._mutate_rows(rows)
+
+    def _mutate_rows(self, rows: Sequence[DirectRow]) -> None:
+        table = self._get_table()
+        batches = [
+            rows[i : i + self.mutate_batch_size]
+            for i in range(0, len(rows), self.mutate_batch_size)
+        ]
+
+        def mutate(batch: Sequence[DirectRow]) -> List[BigtableError]:
+            return [
+                BigtableError(status.code, status.message)
+                for status in table.mutate_rows(batch)
+                if status.code != 0
+            ]
+
+        if len(batches) > 1 and self.mutate_concurrency > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(len(batches), self.mutate_concurrency)
+            ) as executor:
+                results = list(executor.map(mutate, batches))
+        else:
+            results = [mutate(batch) for batch in batches]
 
+        errors = [error for result in results for error in result]
         if errors:
             raise BigtableError(errors)
 
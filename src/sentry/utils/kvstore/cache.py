@@ -25,14 +25,23 @@ class CacheKVStorage(KVStorage[Any, Any]):
     # value encoding strategies that are not always compatible (generally
     # pickle and JSON.)
 
-    def __init__(self, backend: BaseCache) -> None:
+    # If ``raw`` is set, values are passed to and returned from the backend
+    # without encoding them. Not all backends support this.
+
+    def __init__(self, backend: BaseCache, raw: bool = False) -> None:
         self.backend = backend
+        self.raw = raw
 
     def get(self, key: Any) -> Optional[Any]:
-        return self.backend.get(key)
+        return self.backend.get(key, raw=self.raw)
 
     def set(self, key: Any, value: Any, ttl: Optional[timedelta] = None) -> None:
-        self.backend.set(key, value, timeout=int(ttl.total_seconds()) if ttl is not None else None)
+        self.backend.set(
+            key,
+            value,
+            timeout=int(ttl.total_seconds()) if ttl is not None else None,
+            raw=self.raw,
+        )
 
     def delete(self, key: Any) -> None:
         self.backend.delete(key)
@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterable,
+    Mapping,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_missing = object()
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A bounded, thread-safe, in-process least-recently-used cache.
+
+    Entries are evicted in least-recently-used order once either ``max_items``
+    or ``max_bytes`` is exceeded. The size of an entry is passed to ``set``
+    explicitly, or computed with ``sizeof`` (defaults to ``1``, which makes
+    ``max_bytes`` behave like ``max_items``). If ``ttl`` is set, entries
+    expire that many seconds after they have been written, unless ``set``
+    is given a ``ttl`` of its own.
+
+    Hits, misses and evictions are counted so callers can report them as
+    metrics.
+
+    >>> cache = LRUCache(max_bytes=1024 * 1024, ttl=60, sizeof=len)
+    >>> cache.set("key", b"value")
+    >>> cache.get("key")
+    b'value'
+    """
+
+    def __init__(
+        self,
+        max_items: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        assert max_items or max_bytes, "LRUCache needs to be bounded"
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.timer = timer
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        # key -> (value, size, expires_at)
+        self._data: "OrderedDict[K, Tuple[V, int, Optional[float]]]" = OrderedDict()
+        self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key, _missing, count=False) is not _missing
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def _pop(self, key: K) -> None:
+        _, size, _ = self._data.pop(key)
+        self._nbytes -= size
+
+    def _get(self, key: K, now: float) -> Any:
+        try:
+            value, _, expires_at = self._data[key]
+        except KeyError:
+            return _missing
+        if expires_at is not None and expires_at <= now:
+            self._pop(key)
+            return _missing
+        self._data.move_to_end(key)
+        return value
+
+    def get(self, key: K, default: Any = None, count: bool = True) -> Any:
+        with self._lock:
+            value = self._get(key, self.timer())
+            if value is _missing:
+                if count:
+                    self.misses += 1
+                return default
+            if count:
+                self.hits += 1
+            return value
+
+    def get_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """
+        Returns a mapping of the keys that were found in the cache.
+        """
+        rv: Dict[K, V] = {}
+        with self._lock:
+            now = self.timer()
+            for key in keys:
+                value = self._get(key, now)
+                if value is _missing:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    rv[key] = value
+        return rv
+
+    def set(self, key: K, value: V, size: Optional[int] = None, ttl: Optional[float] = None) -> int:
+        """
+        Stores ``value`` and returns the number of entries that had to be
+        evicted to make room for it.
+        """
+        return self.set_many({key: value}, sizes={key: size} if size is not None else None, ttl=ttl)
+
+    def set_many(
+        self,
+        items: Mapping[K, V],
+        sizes: Optional[Mapping[K, int]] = None,
+        ttl: Optional[float] = None,
+    ) -> int:
+        evicted = 0
+        if ttl is None:
+            ttl = self.ttl
+        with self._lock:
+            now = self.timer()
+            expires_at = now + ttl if ttl is not None else None
+            for key, value in items.items():
+                size = sizes.get(key) if sizes else None
+                if size is None:
+                    size = self.sizeof(value) if self.sizeof is not None else 1
+
+                if key in self._data:
+                    self._pop(key)
+
+                if self.max_bytes is not None and size > self.max_bytes:
+                    # never going to fit, don't flush the whole cache for it
+                    continue
+
+                self._data[key] = (value, size, expires_at)
+                self._nbytes += size
+
+                while (self.max_items is not None and len(self._data) > self.max_items) or (
+                    self.max_bytes is not None and self._nbytes > self.max_bytes
+                ):
+                    self._pop(next(iter(self._data)))
+                    evicted += 1
+
+            self.evictions += evicted
+        return evicted
+
+    def delete(self, key: K) -> None:
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def delete_many(self, keys: Iterable[K]) -> None:
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._nbytes = 0
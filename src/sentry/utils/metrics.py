@@ -4,8 +4,9 @@ __all__ = ["timing", "incr"]
 import functools
 import logging
 import time
+from collections import defaultdict
 from contextlib import contextmanager
-from queue import Queue
+from queue import Empty, Queue
 from random import random
 from threading import Thread, local
 from typing import (
@@ -132,6 +133,9 @@ def _sampled_value(value: Union[int, float], sample_rate: float) -> Union[int, f
     return value
 
 
+INTERNAL_METRICS_BATCH_SIZE = 1000
+
+
 class InternalMetrics:
     def __init__(self) -> None:
         self._started = False
@@ -144,18 +148,32 @@ class InternalMetrics:
             from sentry import tsdb
 
             while True:
-                key, instance, tags, amount, sample_rate = q.get()
-                amount = _sampled_value(amount, sample_rate)
-                if instance:
-                    full_key = f"{key}.{instance}"
-                else:
-                    full_key = key
-                try:
-                    tsdb.incr(tsdb.models.internal, full_key, count=amount)
-                except Exception:
-                    logger = logging.getLogger("sentry.errors")
-                    logger.exception("Unable to incr internal metric")
-                finally:
+                # Drain everything that queued up while the previous batch was
+                # written, so that a burst of the same metric becomes a single
+                # increment.
+                batch = [q.get()]
+                while len(batch) < INTERNAL_METRICS_BATCH_SIZE:
+                    try:
+                        batch.append(q.get_nowait())
+                    except Empty:
+                        break
+
+                counts: MutableMapping[str, Union[float, int]] = defaultdict(int)
+                for key, instance, tags, amount, sample_rate in batch:
+                    if instance:
+                        full_key = f"{key}.{instance}"
+                    else:
+                        full_key = key
+                    counts[full_key] += _sampled_value(amount, sample_rate)
+
+                for full_key, amount in counts.items():
+                    try:
+                        tsdb.incr(tsdb.models.internal, full_key, count=amount)
+                    except Exception:
+                        logger = logging.getLogger("sentry.errors")
+                        logger.exception("Unable to incr internal metric")
+
+                for _ in batch:
                     q.task_done()
 
         t = Thread(target=worker)
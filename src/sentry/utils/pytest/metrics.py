@@ -38,6 +38,9 @@ def control_metrics_access(monkeypatch, request, set_sentry_option):
         monkeypatch.setattr(
             "sentry.sentry_metrics.indexer.reverse_resolve", mock_indexer.reverse_resolve
         )
+        monkeypatch.setattr(
+            "sentry.sentry_metrics.indexer.bulk_reverse_resolve", mock_indexer.bulk_reverse_resolve
+        )
 
         tag_values_are_strings = (
             os.environ.get("SENTRY_METRICS_SIMULATE_TAG_VALUES_IN_CLICKHOUSE") == "1"
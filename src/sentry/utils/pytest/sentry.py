@@ -111,6 +111,12 @@ def pytest_configure(config):
     settings.SENTRY_NEWSLETTER = "sentry.newsletter.dummy.DummyNewsletter"
     settings.SENTRY_NEWSLETTER_OPTIONS = {}
 
+    # The indexer is shared between tests, but database state is not.
+    settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE = 0
+
+    # Models are cached in memory across tests, but database state is not.
+    settings.SENTRY_MODEL_PROCESS_CACHE = False
+
     settings.BROKER_BACKEND = "memory"
     settings.BROKER_URL = "memory://"
     settings.CELERY_ALWAYS_EAGER = False
@@ -0,0 +1,119 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from sentry.api.serializers import serialize
+from sentry.api.serializers.loaders import _close_unusable_connections, _run_loader, run_loaders
+from sentry.api.serializers.models.group import GroupSerializer
+from sentry.api.serializers.models.group_stream import StreamGroupSerializerSnuba
+from sentry.app import env
+from sentry.models import GroupAssignee, GroupBookmark, GroupSnooze, GroupSubscription
+from sentry.testutils import SnubaTestCase, TransactionTestCase
+from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.silo import region_silo_test
+
+
+@pytest.fixture
+def request_sentinel():
+    env.request = request = object()
+    yield request
+    env.request = None
+
+
+def current_thread():
+    return threading.current_thread()
+
+
+def test_run_loaders(request_sentinel):
+    results = run_loaders({"a": current_thread, "b": lambda: env.request})
+    assert results == {"a": threading.current_thread(), "b": request_sentinel}
+
+
+@override_options({"api.serializers.concurrent-loaders.enabled": True})
+def test_run_loaders_concurrently(request_sentinel):
+    results = run_loaders(
+        {
+            "a": current_thread,
+            "b": lambda: env.request,
+            "nested": lambda: (current_thread(), run_loaders({"c": current_thread, "d": int})),
+        }
+    )
+    assert results["a"] is not threading.current_thread()
+    assert results["b"] is request_sentinel
+
+    # Loaders of a loader run on the thread of that loader.
+    thread, nested_results = results["nested"]
+    assert nested_results == {"c": thread, "d": 0}
+
+
+@override_options({"api.serializers.concurrent-loaders.enabled": True})
+def test_run_loaders_error():
+    finished = []
+
+    def fail():
+        raise ValueError("loader failed")
+
+    def slow():
+        time.sleep(0.1)
+        finished.append(True)
+
+    with pytest.raises(ValueError):
+        run_loaders({"fail": fail, "slow": slow})
+    assert finished == [True]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_close_unusable_connections():
+    connection.ensure_connection()
+    raw_connection = connection.connection
+
+    # Connections are kept for the next loader.
+    _close_unusable_connections()
+    assert connection.connection is raw_connection
+
+    with mock.patch("sentry.api.serializers.loaders.LOADER_CONNECTION_MAX_AGE", 0):
+        _close_unusable_connections()
+    assert connection.connection is None
+
+
+@region_silo_test
+class ConcurrentSerializationTest(SnubaTestCase, TransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_user()
+        self.groups = [
+            self.store_event(
+                data={"fingerprint": [fingerprint], "timestamp": iso_format(before_now(minutes=1))},
+                project_id=self.project.id,
+            ).group
+            for fingerprint in ("group-1", "group-2")
+        ]
+
+        group, other = self.groups
+        GroupBookmark.objects.create(project=group.project, group=group, user=self.user)
+        GroupSubscription.objects.create(
+            user=self.user, group=group, project=group.project, is_active=True
+        )
+        GroupAssignee.objects.assign(group, self.user)
+        GroupSnooze.objects.create(group=other, until=timezone.now() + timedelta(minutes=1))
+
+    def assert_serialized_concurrently(self, serializer):
+        expected = serialize(self.groups, self.user, serializer=serializer)
+
+        with override_options({"api.serializers.concurrent-loaders.enabled": True}), mock.patch(
+            "sentry.api.serializers.loaders._run_loader", wraps=_run_loader
+        ) as run_loader:
+            assert serialize(self.groups, self.user, serializer=serializer) == expected
+        assert run_loader.called
+
+    def test_group_serializer(self):
+        self.assert_serialized_concurrently(GroupSerializer())
+
+    def test_stream_group_serializer_snuba(self):
+        self.assert_serialized_concurrently(StreamGroupSerializerSnuba(stats_period="24h"))
@@ -18,6 +18,9 @@ class InMemoryCache:
         assert key not in self.raw_map or raw == self.raw_map[key]
         return copy.deepcopy(self.data.get(key))
 
+    def get_many(self, keys, raw=False):
+        return [self.get(key, raw=raw) for key in keys]
+
     def set(self, key, value, timeout=None, raw=False):
         # Attachment chunks MUST be bytestrings. Josh please don't change this
         # to unicode.
@@ -75,6 +78,12 @@ def test_basic_chunked():
     assert att2.data == att.data == b"Hello World! Bye."
     assert att2.rate_limited is None
 
+    (att3,) = cache.get("c:foo")
+    fileobj = att3.getfile()
+    assert fileobj.read(5) == b"Hello"
+    assert fileobj.read() == b" World! Bye."
+    assert fileobj.read() == b""
+
     cache.delete("c:foo")
     assert not list(cache.get("c:foo"))
 
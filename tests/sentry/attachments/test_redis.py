@@ -3,19 +3,58 @@ from unittest import mock
 
 import pytest
 
+from sentry.attachments.base import MissingAttachmentChunks
 from sentry.cache.redis import RbCache, RedisClusterCache
 from sentry.utils.imports import import_string
 
 KEY_FMT = "c:1:%s"
 
 
+class FakePromise:
+    def __init__(self, value):
+        self.value = value
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.keys = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def get(self, key):
+        self.keys.append(key)
+        return FakePromise(self.client.data.get(key))
+
+    def execute(self):
+        self.client.round_trips += 1
+        return [self.client.data.get(key) for key in self.keys]
+
+
+class FakeMap(FakePipeline):
+    def __exit__(self, *args):
+        self.execute()
+
+
 class FakeClient:
     def __init__(self):
         self.data = {}
+        self.round_trips = 0
 
     def get(self, key):
+        self.round_trips += 1
         return self.data[key]
 
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def map(self):
+        return FakeMap(self)
+
 
 @pytest.fixture
 def mock_client():
@@ -84,3 +123,35 @@ def test_chunked(mocked_attachment_cache, mock_client):
         "content_type": "text/plain",
     }
     assert attachment.data == b"Hello World! This attachment is chunked up."
+
+
+def test_chunked_windows(mocked_attachment_cache, mock_client):
+    mock_client.data[
+        KEY_FMT % "foo:a"
+    ] = '[{"name":"foo.txt","content_type":"text/plain","chunks":5}]'
+    for chunk_index in range(5):
+        mock_client.data[KEY_FMT % f"foo:a:0:{chunk_index}"] = zlib.compress(b"%d" % chunk_index)
+
+    (attachment,) = mocked_attachment_cache.get("foo")
+    mock_client.round_trips = 0
+    chunks = list(mocked_attachment_cache.get_data_chunks(attachment, window=2))
+    assert chunks == [b"0", b"1", b"2", b"3", b"4"]
+    assert mock_client.round_trips == 3
+
+
+def test_chunked_getfile(mocked_attachment_cache, mock_client):
+    mock_client.data[
+        KEY_FMT % "foo:a"
+    ] = '[{"name":"foo.txt","content_type":"text/plain","chunks":3}]'
+    mock_client.data[KEY_FMT % "foo:a:0:0"] = zlib.compress(b"Hello World!")
+    mock_client.data[KEY_FMT % "foo:a:0:1"] = zlib.compress(b" This attachment is ")
+
+    (attachment,) = mocked_attachment_cache.get("foo")
+    fileobj = attachment.getfile()
+    assert fileobj.read(5) == b"Hello"
+    assert fileobj.read(10) == b" World! Th"
+    with pytest.raises(MissingAttachmentChunks):
+        fileobj.read()
+
+    mock_client.data[KEY_FMT % "foo:a:0:2"] = zlib.compress(b"chunked up.")
+    assert attachment.getfile().read() == b"Hello World! This attachment is chunked up."
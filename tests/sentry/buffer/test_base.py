@@ -69,3 +69,48 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters, {"last_seen": the_date}, signal_only=True)
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
+
+    def test_process_batch(self):
+        group = Group.objects.create(project=Project(id=1))
+        the_date = timezone.now() + timedelta(days=5)
+        batch = [
+            (Group, {"times_seen": 1}, {"id": group.id}, {"last_seen": the_date}, None),
+            (Group, {"times_seen": 2}, {"id": group.id}, None, None),
+            (ReleaseProject, {"new_groups": 1}, {"id": 0}, None, None),
+        ]
+        with mock.patch("sentry.buffer.base.Buffer.process") as process:
+            assert self.buf.process_batch(batch) == 1
+
+        group_ = Group.objects.get(id=group.id)
+        assert group_.times_seen == group.times_seen + 3
+        assert group_.last_seen == the_date
+        # rows that don't exist go through the regular path
+        process.assert_called_once_with(
+            self.buf, ReleaseProject, {"new_groups": 1}, {"id": 0}, None, None
+        )
+
+    def test_process_batch_creates_missing_rows(self):
+        filters = {"project_id": self.project.id, "release_id": self.release.id}
+        assert (
+            self.buf.process_batch([(ReleaseProject, {"new_groups": 2}, filters, None, None)]) == 0
+        )
+        assert ReleaseProject.objects.filter(new_groups=2, **filters).exists()
+
+    @mock.patch("sentry.buffer.base.buffer_incr_complete")
+    def test_process_batch_signal_only(self, buffer_incr_complete):
+        group = Group.objects.create(project=Project(id=1))
+        batch = [(Group, {"times_seen": 1}, {"id": group.id}, None, True)]
+        assert self.buf.process_batch(batch) == 0
+        assert Group.objects.get(id=group.id).times_seen == group.times_seen
+        assert buffer_incr_complete.send_robust.call_count == 1
+
+    @mock.patch("sentry.buffer.base.buffer_incr_complete")
+    def test_process_batch_keeps_signal_only_rows_apart(self, buffer_incr_complete):
+        group = Group.objects.create(project=Project(id=1))
+        batch = [
+            (Group, {"times_seen": 1}, {"id": group.id}, None, True),
+            (Group, {"times_seen": 2}, {"id": group.id}, None, None),
+        ]
+        assert self.buf.process_batch(batch) == 1
+        assert Group.objects.get(id=group.id).times_seen == group.times_seen + 2
+        assert buffer_incr_complete.send_robust.call_count == 2
@@ -0,0 +1,64 @@
+from datetime import datetime
+
+import pytest
+from django.utils import timezone
+
+from sentry.buffer.redis import RedisBuffer
+
+FILTERS = {"pk": 1234567890, "project_id": 42, "environment": "production"}
+EXTRA = {
+    "last_seen": datetime(2017, 5, 3, 6, 6, 6, 123456, tzinfo=timezone.utc),
+    "message": "TypeError: Cannot read properties of undefined (reading 'foo')",
+    "culprit": "app/components/foo in render",
+    "level": 40,
+    "score": 1493791566.123,
+}
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+def dump(buf, use_msgpack):
+    return {
+        "f": buf._dump_payload(FILTERS, use_msgpack),
+        **{"e+" + k: buf._dump_payload(v, use_msgpack) for k, v in EXTRA.items()},
+    }
+
+
+def load(buf, payloads):
+    return {k: buf._load_payload_value(v) for k, v in payloads.items()}
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("use_msgpack", [False, True], ids=["pickle", "msgpack"])
+def test_benchmark_encode(use_msgpack, benchmark):
+    buf = RedisBuffer()
+    benchmark(dump, buf, use_msgpack)
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("use_msgpack", [False, True], ids=["pickle", "msgpack"])
+def test_benchmark_decode(use_msgpack, benchmark):
+    buf = RedisBuffer()
+    payloads = dump(buf, use_msgpack)
+    assert load(buf, payloads) == {
+        "f": FILTERS,
+        **{"e+" + k: v for k, v in EXTRA.items()},
+    }
+
+    benchmark(load, buf, payloads)
+
+    # Report the memory Redis needs for a buffered key using this encoding.
+    client = buf.cluster.get_local_client_for_key("b:k:benchmark")
+    client.hmset("b:k:benchmark", payloads)
+    try:
+        benchmark.extra_info["payload_bytes"] = sum(len(v) for v in payloads.values())
+        benchmark.extra_info["redis_memory_bytes"] = client.memory_usage("b:k:benchmark")
+    finally:
+        client.delete("b:k:benchmark")
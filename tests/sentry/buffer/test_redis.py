@@ -6,9 +6,10 @@ from django.utils import timezone
 from django.utils.encoding import force_text
 from freezegun import freeze_time
 
-from sentry.buffer.redis import RedisBuffer
+from sentry.buffer.redis import MSGPACK_VERSION, RedisBuffer
 from sentry.models import Group, Project
 from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
 
 
 class RedisBufferTest(TestCase):
@@ -103,6 +104,48 @@ class RedisBufferTest(TestCase):
         group = Group.objects.get_from_cache(id=self.group.id)
         assert group.times_seen == orig_times_seen + times_seen_incr
 
+    def test_batch_flush(self):
+        buf = RedisBuffer(batch_flush=True)
+        other_group = self.create_group()
+        orig_times_seen = self.group.times_seen
+        other_times_seen = other_group.times_seen
+        last_seen = timezone.now()
+        buf.incr(Group, {"times_seen": 2}, {"pk": self.group.id}, {"last_seen": last_seen})
+        buf.incr(Group, {"times_seen": 3}, {"pk": other_group.id})
+
+        client = buf.cluster.get_routing_client()
+        batch_keys = [force_text(key) for key in client.zrange("b:p", 0, -1)]
+        assert len(batch_keys) == 2
+
+        with mock.patch.object(buf, "_process_single_incr") as process_single_incr:
+            buf.process(batch_keys=batch_keys)
+        assert not process_single_incr.called
+
+        group = Group.objects.get(id=self.group.id)
+        assert group.times_seen == orig_times_seen + 2
+        assert group.last_seen == last_seen
+        assert Group.objects.get(id=other_group.id).times_seen == other_times_seen + 3
+        assert client.zrange("b:p", 0, -1) == []
+        for key in batch_keys:
+            assert not client.exists(key)
+            assert not client.exists(buf._make_lock_key(key))
+
+    @mock.patch("sentry.buffer.base.Buffer.process_batch", return_value=0)
+    def test_batch_flush_skips_locked_keys(self, process_batch):
+        buf = RedisBuffer(batch_flush=True)
+        buf.incr(Group, {"times_seen": 1}, {"pk": self.group.id})
+        buf.incr(Group, {"times_seen": 1}, {"pk": self.create_group().id})
+
+        client = buf.cluster.get_routing_client()
+        locked, unlocked = [force_text(key) for key in client.zrange("b:p", 0, -1)]
+        client.set(buf._make_lock_key(locked), "1")
+
+        buf.process(batch_keys=[locked, unlocked])
+        (batch,) = process_batch.call_args[0]
+        assert len(batch) == 1
+        assert client.exists(locked)
+        assert not client.exists(unlocked)
+
     def test_get(self):
         model = mock.Mock()
         model.__name__ = "Mock"
@@ -149,6 +192,46 @@ class RedisBufferTest(TestCase):
         pending = client.zrange("b:p", 0, -1)
         assert pending == [key.encode("utf-8")]
 
+    @override_options({"buffer.msgpack-write-rate": 1.0})
+    def test_incr_saves_msgpack_to_redis(self):
+        now = datetime(2017, 5, 3, 6, 6, 6, tzinfo=timezone.utc)
+        client = self.buf.cluster.get_routing_client()
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        filters = {"pk": 1, "project": Project(id=2), "datetime": now}
+        key = self.buf._make_key(model, filters=filters)
+        self.buf.incr(model, {"times_seen": 1}, filters, extra={"foo": "bar", "score": 1.5})
+        result = {force_text(k): v for k, v in client.hgetall(key).items()}
+
+        for field in ("f", "e+foo", "e+score"):
+            assert result[field].startswith(MSGPACK_VERSION)
+        assert self.buf._load_payload_value(result["f"]) == {
+            "pk": 1,
+            "project_id": 2,
+            "datetime": now,
+        }
+        assert self.buf._load_payload_value(result["e+foo"]) == "bar"
+        assert self.buf._load_payload_value(result["e+score"]) == 1.5
+
+    @override_options({"buffer.msgpack-write-rate": 1.0})
+    def test_incr_falls_back_to_pickle(self):
+        client = self.buf.cluster.get_routing_client()
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        naive = datetime(2017, 5, 3, 6, 6, 6)
+        key = self.buf._make_key(model, filters={"pk": 1})
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1}, extra={"datetime": naive})
+        assert pickle.loads(client.hget(key, "e+datetime")) == naive
+
+    @override_options({"buffer.msgpack-write-rate": 1.0})
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_does_bubble_up_msgpack(self, process):
+        now = datetime(2017, 5, 3, 6, 6, 6, tzinfo=timezone.utc)
+        filters = {"pk": self.group.id}
+        self.buf.incr(Group, {"times_seen": 2}, filters, extra={"last_seen": now})
+        self.buf.process(self.buf._make_key(Group, filters))
+        process.assert_called_once_with(Group, {"times_seen": 2}, filters, {"last_seen": now}, None)
+
     @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
     @mock.patch("sentry.buffer.redis.process_incr")
     @mock.patch("sentry.buffer.redis.process_pending")
@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+
+from sentry.models import Project
+from sentry.testutils import TestCase
+from sentry.testutils.silo import region_silo_test
+from sentry.utils.cache import cache
+from sentry.utils.lru import LRUCache
+
+
+@region_silo_test
+@override_settings(SENTRY_MODEL_PROCESS_CACHE=True)
+class ProcessCacheTest(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.project = self.create_project()
+        Project.objects.uncache_object(self.project.id)
+
+    def test_get_from_cache(self):
+        with mock.patch.object(cache, "get", wraps=cache.get) as cache_get:
+            project = Project.objects.get_from_cache(id=self.project.id)
+            assert Project.objects.get_from_cache(id=self.project.id) == project
+            assert cache_get.call_count == 1
+
+        # Instances are handed out as copies, so changes stay local.
+        project.name = "changed"
+        project.flags.has_releases = True
+        cached = Project.objects.get_from_cache(id=self.project.id)
+        assert cached.name == self.project.name
+        assert not cached.flags.has_releases
+
+    def test_get_many_from_cache(self):
+        other = self.create_project()
+        Project.objects.uncache_object(other.id)
+
+        with mock.patch.object(cache, "set_many", wraps=cache.set_many) as cache_set_many:
+            projects = Project.objects.get_many_from_cache([self.project.id, other.id])
+            assert {p.id for p in projects} == {self.project.id, other.id}
+            assert cache_set_many.call_count == 1
+
+        with mock.patch.object(cache, "get_many", wraps=cache.get_many) as cache_get_many:
+            projects = Project.objects.get_many_from_cache([self.project.id, other.id])
+            assert {p.id for p in projects} == {self.project.id, other.id}
+            # Only the version stamps of the instances are read.
+            assert cache_get_many.call_count == 1
+
+    def test_invalidation(self):
+        Project.objects.get_from_cache(id=self.project.id)
+
+        self.project.update(name="renamed")
+        assert Project.objects.get_from_cache(id=self.project.id).name == "renamed"
+
+        Project.objects.filter(id=self.project.id).update(name="updated")
+        Project.objects.uncache_object(self.project.id)
+        assert Project.objects.get_from_cache(id=self.project.id).name == "updated"
+
+        self.project.delete()
+        with pytest.raises(Project.DoesNotExist):
+            Project.objects.get_from_cache(id=self.project.id)
+
+    def test_invalidation_by_other_process(self):
+        Project.objects.get_from_cache(id=self.project.id)
+        Project.objects.get_many_from_cache([self.project.id])
+
+        # Saves in other processes only reset the version stamp of the instance.
+        with mock.patch.object(LRUCache, "delete"):
+            self.project.update(name="renamed")
+        assert Project.objects.get_from_cache(id=self.project.id).name == "renamed"
+
+        with mock.patch.object(LRUCache, "delete"):
+            self.project.update(name="updated")
+        (project,) = Project.objects.get_many_from_cache([self.project.id])
+        assert project.name == "updated"
+
+    @override_settings(SENTRY_MODEL_PROCESS_CACHE=False)
+    def test_disabled(self):
+        Project.objects.get_from_cache(id=self.project.id)
+
+        with mock.patch.object(cache, "get", wraps=cache.get) as cache_get:
+            Project.objects.get_from_cache(id=self.project.id)
+            assert cache_get.call_count == 1
@@ -0,0 +1,62 @@
+from unittest import mock
+
+from sentry import nodestore
+from sentry.digests import Record
+from sentry.digests.codecs import CompactNotificationCodec, CompressedPickleCodec
+from sentry.digests.notifications import Notification, event_to_record, fetch_state
+from sentry.testutils import TestCase
+from sentry.testutils.helpers.options import override_options
+from sentry.testutils.silo import region_silo_test
+
+
+@region_silo_test
+class CompactNotificationCodecTestCase(TestCase):
+    codec = CompactNotificationCodec()
+
+    def setUp(self):
+        super().setUp()
+        self.event = self.store_event(
+            data={"message": "hello", "fingerprint": ["group-1"]}, project_id=self.project.id
+        )
+        self.rule = self.project.rule_set.all()[0]
+
+    @override_options({"digests.compact-codec-write-rate": 1.0})
+    def test_encode_compact(self):
+        value = self.codec.encode(Notification(self.event, [self.rule.id]))
+        assert len(value) < len(CompressedPickleCodec().encode(Notification(self.event, [])))
+
+        event, rules = self.codec.decode(value)
+        assert rules == [self.rule.id]
+        assert event.project_id == self.event.project_id
+        assert event.event_id == self.event.event_id
+        assert event.group_id == self.event.group_id
+        assert event.data._node_data is None
+        assert event.data["logentry"] == self.event.data["logentry"]
+
+    @override_options({"digests.compact-codec-write-rate": 0.0})
+    def test_encode_pickle(self):
+        value = self.codec.encode(Notification(self.event, [self.rule.id]))
+        assert value == CompressedPickleCodec().encode(Notification(self.event, [self.rule.id]))
+
+        event, rules = self.codec.decode(value)
+        assert rules == [self.rule.id]
+        assert event.event_id == self.event.event_id
+        assert event.data._node_data is not None
+
+    @override_options({"digests.compact-codec-write-rate": 1.0})
+    def test_fetch_state_binds_event_data(self):
+        other = self.store_event(
+            data={"message": "world", "fingerprint": ["group-2"]}, project_id=self.project.id
+        )
+        records = []
+        for event in (other, self.event):
+            key, value, timestamp = event_to_record(event, (self.rule,))
+            records.append(Record(key, self.codec.decode(self.codec.encode(value)), timestamp))
+
+        with mock.patch.object(nodestore, "get_multi", wraps=nodestore.get_multi) as get_multi:
+            state = fetch_state(self.project, records)
+
+        assert get_multi.call_count == 1
+        assert set(state["groups"]) == {self.event.group_id, other.group_id}
+        for record in records:
+            assert record.value.event.data._node_data is not None
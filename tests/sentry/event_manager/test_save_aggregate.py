@@ -1,11 +1,16 @@
 import contextlib
 import time
 from threading import Thread
+from unittest import mock
 
 import pytest
 
 from sentry.event_manager import _save_aggregate
 from sentry.eventstore.models import CalculatedHashes, Event
+from sentry.grouping.grouphash_cache import invalidate_grouphash_cache
+from sentry.models import GroupHash
+from sentry.testutils.factories import Factories
+from sentry.testutils.helpers.options import override_options
 
 
 @pytest.mark.django_db(transaction=True)
@@ -87,3 +92,40 @@ def test_group_creation_race(monkeypatch, default_project, is_race_free):
         # assert many groups are new
         assert 1 < len({rv.group.id for rv in return_values}) <= CONCURRENCY
         assert 1 < sum(rv.is_new for rv in return_values) <= CONCURRENCY
+
+
+@pytest.mark.django_db(transaction=True)
+@override_options({"store.grouphash-cache.enabled": True})
+def test_grouphash_cache(default_project):
+    def save_event():
+        data = {"timestamp": time.time()}
+        evt = Event(default_project.id, "89aeed6a472e4c5fb992d14df4d7e1b6", data=data)
+        return _save_aggregate(
+            evt,
+            hashes=CalculatedHashes(
+                hashes=["c" * 32, "d" * 32],
+                hierarchical_hashes=[],
+                tree_labels=[],
+            ),
+            release=None,
+            metadata={},
+            received_timestamp=None,
+            level=10,
+            culprit="",
+        )
+
+    group = save_event().group
+
+    # The hashes of the new group are cached, so they aren't looked up again.
+    with mock.patch("sentry.event_manager._find_existing_grouphash") as find_existing_grouphash:
+        group_info = save_event()
+    assert not find_existing_grouphash.called
+    assert group_info.group.id == group.id
+    assert not group_info.is_new
+
+    # Hashes that are moved to another group are resolved from the database.
+    other_group = Factories.create_group(project=default_project)
+    GroupHash.objects.filter(group=group).update(group=other_group)
+    invalidate_grouphash_cache(default_project.id)
+
+    assert save_event().group.id == other_group.id
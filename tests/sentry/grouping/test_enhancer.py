@@ -442,3 +442,42 @@ def test_app_no_matches(frame):
     enhancements = Enhancements.from_config_string("app:no +app")
     enhancements.apply_modifications_to_frame([frame], "native", None)
     assert frame.get("in_app")
+
+
+def test_rules_for_frames():
+    enhancements = Enhancements.from_config_string(
+        """
+        family:native function:std::*                  -app
+        family:javascript,native path:**/test.js       -app
+        family:all function:main                       +app
+        !family:native function:main                   +app
+        function:main                                  +app
+    """
+    )
+    native, js_native, all_, not_native, any_ = enhancements.rules
+
+    def rules_for(*platforms):
+        match_frames = [create_match_frame({}, platform) for platform in platforms]
+        return enhancements._get_rules_for_frames(enhancements._modifier_rules, match_frames)
+
+    assert rules_for("native") == [native, js_native, all_, not_native, any_]
+    assert rules_for("javascript") == [js_native, all_, not_native, any_]
+    assert rules_for("java") == [all_, not_native, any_]
+    assert rules_for("java", "javascript") == [js_native, all_, not_native, any_]
+
+
+@pytest.mark.parametrize(
+    "pattern,function,matches",
+    [
+        ("std::*", "std::whatever", True),
+        ("std::*", "core::whatever", False),
+        ("std::whatever", "std::whatever", True),
+        ("std::whatever", "std::whatever2", False),
+        ("*::whatever", "std::whatever", True),
+        ("?td::*", "std::whatever", True),
+        ("[s]td::*", "std::whatever", True),
+    ],
+)
+def test_function_literal_prefix(pattern, function, matches):
+    rule = Enhancements.from_config_string(f"function:{pattern} +app").rules[0]
+    assert bool(_get_matching_frame_actions(rule, [{"function": function}], "native")) is matches
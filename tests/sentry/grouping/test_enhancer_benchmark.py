@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from sentry.grouping.component import GroupingComponent
+from sentry.grouping.enhancer import Enhancements
+from sentry.utils import json
+
+_grouping_fixture_path = os.path.join(os.path.dirname(__file__), "grouping_inputs")
+
+# Grouping inputs with deep stack traces, and the platform of their event.
+INPUTS = {
+    "android-anr": "java",
+    "java-minimal": "java",
+    "actix": "native",
+    "macos-intel-driver": "native",
+}
+
+ENHANCEMENTS = Enhancements.from_config_string("", bases=["mobile:2021-04-02"])
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+def load_frames(name):
+    with open(os.path.join(_grouping_fixture_path, f"{name}.json")) as f:
+        data = json.load(f)
+
+    # Use the deepest stack trace of the event.
+    stacktraces = [
+        value["stacktrace"]
+        for interface in ("exception", "threads")
+        for value in (data.get(interface) or {}).get("values") or ()
+        if value.get("stacktrace")
+    ]
+    return max((stacktrace["frames"] for stacktrace in stacktraces), key=len)
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("name", sorted(INPUTS), ids=lambda x: x.replace("-", "_"))
+def test_benchmark_apply_modifications_to_frame(name, benchmark):
+    frames = load_frames(name)
+    benchmark.extra_info["frames"] = len(frames)
+
+    def setup():
+        return ([dict(frame) for frame in frames], INPUTS[name], {}), {}
+
+    benchmark.pedantic(ENHANCEMENTS.apply_modifications_to_frame, setup=setup, rounds=200)
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("name", sorted(INPUTS), ids=lambda x: x.replace("-", "_"))
+def test_benchmark_assemble_stacktrace_component(name, benchmark):
+    frames = load_frames(name)
+    benchmark.extra_info["frames"] = len(frames)
+
+    def setup():
+        components = [GroupingComponent(id="frame", values=["frame"]) for _ in frames]
+        return (components, frames, INPUTS[name]), {}
+
+    benchmark.pedantic(ENHANCEMENTS.assemble_stacktrace_component, setup=setup, rounds=200)
@@ -0,0 +1,44 @@
+from unittest import mock
+
+import pytest
+
+from sentry.exceptions import InvalidConfiguration
+from sentry.ingest.deduplication.redis import RedisDeduplicator
+
+
+@pytest.fixture
+def deduplicator() -> RedisDeduplicator:
+    return RedisDeduplicator(cluster="default", window=60, shards=4)
+
+
+def test_invalid_config() -> None:
+    with pytest.raises(InvalidConfiguration):
+        RedisDeduplicator(window=0)
+
+    with pytest.raises(InvalidConfiguration):
+        RedisDeduplicator(shards=0)
+
+
+def test_get_duplicates(deduplicator: RedisDeduplicator) -> None:
+    assert deduplicator.get_duplicates([]) == set()
+    assert deduplicator.get_duplicates([(1, "a" * 32), (2, "a" * 32)]) == set()
+
+    deduplicator.mark_seen([(1, "a" * 32), (1, "b" * 32)])
+
+    assert deduplicator.get_duplicates([(1, "a" * 32), (2, "a" * 32), (1, "b" * 32)]) == {
+        (1, "a" * 32),
+        (1, "b" * 32),
+    }
+
+
+def test_window(deduplicator: RedisDeduplicator) -> None:
+    with mock.patch("time.time", return_value=1000.0):
+        deduplicator.mark_seen([(1, "a" * 32)])
+
+    # Events are found in the previous bucket...
+    with mock.patch("time.time", return_value=1070.0):
+        assert deduplicator.get_duplicates([(1, "a" * 32)]) == {(1, "a" * 32)}
+
+    # ...but not in the one before it.
+    with mock.patch("time.time", return_value=1140.0):
+        assert deduplicator.get_duplicates([(1, "a" * 32)]) == set()
@@ -1,19 +1,32 @@
 import datetime
+import os
+import signal
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock
 
 import pytest
+from django.db import connection
 
 from sentry.event_manager import EventManager
+from sentry.eventstore.processing.base import EventProcessingStore
 from sentry.ingest.ingest_consumer import (
+    IngestConsumerWorker,
+    create_process_pool,
+    filter_duplicate_events,
     process_attachment_chunk,
     process_event,
     process_individual_attachment,
     process_userreport,
+    shard_messages_by_project,
 )
 from sentry.models import EventAttachment, EventUser, File, UserReport
+from sentry.testutils.helpers.options import override_options
 from sentry.utils import json
+from sentry.utils.codecs import BytesCodec, JSONCodec
+from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
+from sentry.utils.kvstore.memory import MemoryKVStorage
 
 
 def get_normalized_event(data, project):
@@ -70,6 +83,87 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
     }
 
 
+def test_filter_duplicate_events(monkeypatch):
+    get_duplicates = Mock(return_value={(1, "b")})
+    monkeypatch.setattr("sentry.ingest.deduplication.get_duplicates", get_duplicates)
+
+    messages = [
+        {"type": "event", "project_id": 1, "event_id": "a"},
+        {"type": "event", "project_id": 1, "event_id": "b"},
+        {"type": "attachment", "project_id": 1, "event_id": "a"},
+        {"type": "event", "project_id": 1, "event_id": "a"},
+        {"type": "event", "project_id": 2, "event_id": "b"},
+    ]
+    assert filter_duplicate_events(messages) == [messages[0], messages[2], messages[4]]
+    get_duplicates.assert_called_once_with({(1, "a"), (1, "b"), (2, "b")})
+
+
+def test_shard_messages_by_project():
+    messages = [{"project_id": project_id, "n": n} for n, project_id in enumerate([1, 2, 3, 1, 4])]
+    assert shard_messages_by_project(messages, 3) == [
+        [{"project_id": 1, "n": 0}, {"project_id": 1, "n": 3}, {"project_id": 4, "n": 4}],
+        [{"project_id": 2, "n": 1}],
+        [{"project_id": 3, "n": 2}],
+    ]
+
+
+def get_worker_state():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        (result,) = cursor.fetchone()
+    return os.getpid(), signal.getsignal(signal.SIGTERM), result
+
+
+@pytest.mark.django_db(transaction=True)
+def test_create_process_pool():
+    connection.ensure_connection()
+    pool = create_process_pool(2)
+    try:
+        # Connections are closed before the workers are forked, all at once.
+        assert connection.connection is None
+        assert len(pool._processes) == 2
+
+        pid, sigterm_handler, result = pool.submit(get_worker_state).result()
+        assert pid in pool._processes and pid != os.getpid()
+        assert sigterm_handler == signal.SIG_IGN
+        assert result == 1
+
+        # Workers querying the database leave the consumer's session intact.
+        assert get_worker_state()[2] == 1
+        pool.submit(get_worker_state).result()
+        assert get_worker_state()[2] == 1
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.django_db
+def test_process_pool(default_project, task_runner, preprocess_event, monkeypatch):
+    # Worker processes can't report back to the test, use threads instead.
+    monkeypatch.setattr(
+        "sentry.ingest.ingest_consumer.create_process_pool", lambda n: ThreadPoolExecutor(n)
+    )
+    worker = IngestConsumerWorker(processes=2)
+
+    payloads = [get_normalized_event({"message": f"hello {i}"}, default_project) for i in range(3)]
+    worker.flush_batch(
+        [
+            {
+                "type": "event",
+                "payload": json.dumps(payload),
+                "start_time": time.time(),
+                "event_id": payload["event_id"],
+                "project_id": default_project.id,
+                "remote_addr": "127.0.0.1",
+            }
+            for payload in payloads
+        ]
+    )
+    worker.shutdown()
+
+    # All events of a project are processed by one worker, in order.
+    assert [kwargs["data"] for kwargs in preprocess_event] == payloads
+
+
 @pytest.mark.django_db
 def test_transactions_spawn_save_event_transaction(
     default_project,
@@ -119,6 +213,68 @@ def test_transactions_spawn_save_event_transaction(
     )
 
 
+@pytest.mark.django_db
+def test_unparsed_transactions(
+    default_project,
+    task_runner,
+    preprocess_event,
+    save_event_transaction,
+    monkeypatch,
+):
+    store = MemoryKVStorage()
+    processing_store = EventProcessingStore(
+        KVStorageCodecWrapper(store, JSONCodec() | BytesCodec()), raw_inner=store
+    )
+    monkeypatch.setattr("sentry.ingest.ingest_consumer.event_processing_store", processing_store)
+
+    project_id = default_project.id
+    now = datetime.datetime.now()
+    payload = get_normalized_event(
+        {
+            "type": "transaction",
+            "timestamp": now.isoformat(),
+            "start_timestamp": now.isoformat(),
+            "spans": [],
+            "contexts": {
+                "trace": {
+                    "type": "trace",
+                    "trace_id": "a7d67cf796774551a95be6543cacd459",
+                    "span_id": "babaae0d4b7512d9",
+                }
+            },
+        },
+        default_project,
+    )
+    event_id = payload["event_id"]
+    raw_payload = json.dumps(payload).encode("utf-8")
+    start_time = time.time() - 3600
+    with override_options({"store.unparsed-transactions-ingest-consumer-rate": 1.0}):
+        process_event(
+            {
+                "payload": raw_payload,
+                "start_time": start_time,
+                "event_id": event_id,
+                "project_id": project_id,
+                "remote_addr": "127.0.0.1",
+                "is_transaction": True,
+            },
+            projects={default_project.id: default_project},
+        )
+
+    cache_key = f"e:{event_id}:{project_id}"
+    assert not len(preprocess_event)
+    assert save_event_transaction.delay.call_args[1] == dict(
+        cache_key=cache_key,
+        data=None,
+        start_time=start_time,
+        event_id=event_id,
+        project_id=project_id,
+    )
+    # The payload is stored as is, and parsed when reading it.
+    assert store.get(cache_key) is raw_payload
+    assert processing_store.get(cache_key) == payload
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize("missing_chunks", (True, False))
 def test_with_attachments(default_project, task_runner, missing_chunks, monkeypatch, django_cache):
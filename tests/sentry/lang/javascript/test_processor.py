@@ -12,6 +12,7 @@ from requests.exceptions import RequestException
 
 from sentry import http, options
 from sentry.event_manager import get_tag
+from sentry.lang.javascript.cache import artifact_cache
 from sentry.lang.javascript.errormapping import REACT_MAPPING_URL, rewrite_exception
 from sentry.lang.javascript.processor import (
     CACHE_CONTROL_MAX,
@@ -22,6 +23,7 @@ from sentry.lang.javascript.processor import (
     discover_sourcemap,
     fetch_file,
     fetch_release_archive_for_url,
+    fetch_release_artifacts,
     fetch_release_file,
     fetch_sourcemap,
     generate_module,
@@ -547,6 +549,43 @@ class FetchReleaseFileTest(TestCase):
         assert bad_file.chunks.call_count == 1
         assert good_file.chunks.call_count == 1
 
+    def test_bulk(self):
+        project = self.project
+        release = Release.objects.create(organization_id=project.organization_id, version="abc")
+        release.add_project(project)
+
+        for name, body in (("file.min.js", b"foo"), ("~/other.min.js", b"bar")):
+            file = File.objects.create(
+                name=name,
+                type="release.file",
+                headers={"Content-Type": "application/json; charset=utf-8"},
+            )
+            file.putfile(BytesIO(body))
+            ReleaseFile.objects.create(
+                name=name,
+                release_id=release.id,
+                organization_id=project.organization_id,
+                file=file,
+            )
+
+        urls = ["file.min.js", "http://example.com/other.min.js", "missing.js"]
+        with patch.object(
+            ReleaseFile.objects, "filter", wraps=ReleaseFile.objects.filter
+        ) as mock_filter:
+            results = fetch_release_artifacts(urls, release, None)
+            # one query for the artifact index, one for all release files
+            assert len([c for c in mock_filter.call_args_list if "ident__in" in c.kwargs]) == 1
+
+        assert results["file.min.js"].body == b"foo"
+        assert results["http://example.com/other.min.js"].body == b"bar"
+        assert results["missing.js"] is None
+        assert results["file.min.js"] == fetch_release_file("file.min.js", release)
+
+        # everything is cached now, including the missing file
+        with patch.object(ReleaseFile.objects, "filter") as mock_filter:
+            assert fetch_release_artifacts(urls, release, None) == results
+            assert not mock_filter.called
+
 
 class FetchFileTest(TestCase):
     @responses.activate
@@ -1509,3 +1548,37 @@ class CacheSourceTest(TestCase):
         # now we have an error
         assert len(processor.cache.get_errors(abs_path)) == 1
         assert processor.cache.get_errors(abs_path)[0] == {"url": map_url, "type": "js_no_source"}
+
+    @patch("sentry.lang.javascript.processor.discover_sourcemap")
+    def test_process_cache_shared_between_events(self, mock_discover_sourcemap):
+        mock_discover_sourcemap.return_value = None
+
+        project = self.create_project()
+        release = self.create_release(project=project, version="12.31.12")
+
+        abs_path = "app:///index.js"
+        missing_path = "app:///missing.js"
+        self.create_release_file(release_id=release.id, name=abs_path)
+        artifact_cache.clear()
+
+        def cache_sources():
+            processor = JavaScriptStacktraceProcessor(
+                data={"release": release.version}, stacktrace_infos=None, project=project
+            )
+            processor.release = release
+            processor.cache_source(abs_path)
+            processor.cache_source(missing_path)
+            return processor
+
+        with override_options({"sourcemaps.process-cache.enabled": True}), patch(
+            "sentry.lang.javascript.processor.fetch_file", wraps=fetch_file
+        ) as mock_fetch_file:
+            first = cache_sources()
+            assert mock_fetch_file.call_count == 2
+
+            second = cache_sources()
+            assert mock_fetch_file.call_count == 2
+
+        assert second.cache.get(abs_path) is first.cache.get(abs_path)
+        assert second.cache.get_errors(missing_path) == first.cache.get_errors(missing_path)
+        assert len(second.cache.get_errors(missing_path)) == 1
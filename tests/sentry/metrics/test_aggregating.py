@@ -0,0 +1,95 @@
+from threading import Thread
+from unittest.mock import call, patch
+
+from sentry.metrics.aggregating import AggregatingMetricsBackend, _Flusher
+from sentry.metrics.dummy import DummyMetricsBackend
+
+BACKEND = "sentry.metrics.dummy.DummyMetricsBackend"
+
+
+@patch.object(DummyMetricsBackend, "incr")
+def test_incr(mock_incr):
+    backend = AggregatingMetricsBackend(BACKEND, flush_interval=60)
+    backend.incr("foo", tags={"a": "1", "b": "2"})
+    backend.incr("foo", tags={"b": "2", "a": "1"}, amount=2)
+    backend.incr("foo", instance="bar")
+    assert not mock_incr.called
+
+    with patch.object(backend, "_should_sample", return_value=True):
+        backend.incr("foo", amount=5, sample_rate=0.5)
+
+    backend.flush()
+    assert mock_incr.call_args_list == [
+        call("foo", None, {"a": "1", "b": "2"}, 3, 1),
+        call("foo", "bar", {}, 1, 1),
+        call("foo", None, {}, 10, 1),
+    ]
+
+    # Sampled amounts are rounded once they are merged.
+    with patch.object(backend, "_should_sample", return_value=True):
+        backend.incr("foo", sample_rate=0.3)
+        backend.incr("foo", sample_rate=0.3)
+
+    mock_incr.reset_mock()
+    backend.flush()
+    mock_incr.assert_called_once_with("foo", None, {}, 7, 1)
+
+    mock_incr.reset_mock()
+    backend.flush()
+    assert not mock_incr.called
+
+
+@patch.object(DummyMetricsBackend, "gauge")
+def test_gauge(mock_gauge):
+    backend = AggregatingMetricsBackend(BACKEND, flush_interval=60)
+    backend.gauge("foo", 1)
+    backend.gauge("foo", 5)
+    backend.gauge("foo", 2, tags={"a": "1"})
+    assert not mock_gauge.called
+
+    backend.flush()
+    assert mock_gauge.call_args_list == [
+        call("foo", 5, None, {}, 1),
+        call("foo", 2, None, {"a": "1"}, 1),
+    ]
+
+
+@patch.object(DummyMetricsBackend, "timing")
+def test_timing(mock_timing):
+    backend = AggregatingMetricsBackend(BACKEND, flush_interval=60)
+    backend.timing("foo", 30, instance="bar", sample_rate=0.5)
+    mock_timing.assert_called_once_with("foo", 30, "bar", None, 0.5)
+
+
+@patch.object(DummyMetricsBackend, "incr")
+def test_flush_thresholds(mock_incr):
+    backend = AggregatingMetricsBackend(BACKEND, flush_interval=60, max_keys=3)
+    backend.incr("foo")
+    backend.incr("bar")
+    assert not mock_incr.called
+    backend.incr("baz")
+    assert mock_incr.call_count == 3
+
+    mock_incr.reset_mock()
+    backend = AggregatingMetricsBackend(BACKEND, flush_interval=0)
+    backend.incr("foo")
+    mock_incr.assert_called_once_with("foo", None, {}, 1, 1)
+
+
+@patch.object(DummyMetricsBackend, "incr")
+def test_flush_idle_threads(mock_incr):
+    # Use a flusher without a daemon thread, so that nothing is flushed before
+    # it's asked to.
+    with patch.object(_Flusher, "run"), patch(
+        "sentry.metrics.aggregating._flusher", _Flusher()
+    ) as flusher:
+        backend = AggregatingMetricsBackend(BACKEND, flush_interval=60)
+
+        # The thread exits without flushing what it buffered.
+        thread = Thread(target=lambda: backend.incr("foo"))
+        thread.start()
+        thread.join()
+        assert not mock_incr.called
+
+        flusher.flush_all()
+    mock_incr.assert_called_once_with("foo", None, {}, 1, 1)
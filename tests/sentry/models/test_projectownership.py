@@ -1,6 +1,9 @@
+from unittest import mock
+
 from sentry.models import ActorTuple, ProjectOwnership, Team, User
 from sentry.models.groupowner import OwnerRuleType
-from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema, resolve_actors
+from sentry.models.projectownership import compiled_rules_cache
+from sentry.ownership.grammar import Matcher, Owner, Rule, dump_schema, load_schema, resolve_actors
 from sentry.testutils import TestCase
 from sentry.testutils.silo import region_silo_test
 from sentry.utils.cache import cache
@@ -80,6 +83,31 @@ class ProjectOwnershipTestCase(TestCase):
             ([ActorTuple(self.team.id, Team), ActorTuple(self.user.id, User)], [rule_a, rule_b]),
         )
 
+    def test_get_owners_compiled_rules(self):
+        compiled_rules_cache.clear()
+        rule_a = Rule(Matcher("path", "*.py"), [Owner("team", self.team.slug)])
+        rule_b = Rule(Matcher("path", "src/*"), [Owner("user", self.user.email)])
+        ownership = ProjectOwnership.objects.create(
+            project_id=self.project.id, schema=dump_schema([rule_a]), fallthrough=True
+        )
+        data = {"stacktrace": {"frames": [{"filename": "foo.py"}]}}
+
+        with mock.patch(
+            "sentry.models.projectownership.load_schema", wraps=load_schema
+        ) as mock_load_schema:
+            assert ProjectOwnership.get_owners(self.project.id, data)[1] == [rule_a]
+            assert ProjectOwnership.get_owners(self.project.id, data)[1] == [rule_a]
+            assert mock_load_schema.call_count == 1
+
+            # Changing the rules compiles the new schema.
+            ownership.schema = dump_schema([rule_b])
+            ownership.save()
+            assert ProjectOwnership.get_owners(self.project.id, data) == (
+                ProjectOwnership.Everyone,
+                None,
+            )
+            assert mock_load_schema.call_count == 2
+
     def test_get_owners_when_codeowners_exists_and_no_issueowners(self):
         # This case will never exist bc we create a ProjectOwnership record if none exists when creating a ProjectCodeOwner record.
         # We have this testcase for potential corrupt data.
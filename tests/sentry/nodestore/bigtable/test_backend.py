@@ -1,11 +1,19 @@
 import os
+import struct
 from contextlib import contextmanager
 from unittest import mock
 
 import pytest
+import zstandard
 from google.rpc.status_pb2 import Status
 
-from sentry.nodestore.bigtable.backend import BigtableKVStorage, BigtableNodeStorage
+from sentry.nodestore.bigtable.backend import (
+    COMPRESSION_DICTIONARY_SUFFIX,
+    BigtableKVStorage,
+    BigtableNodeStorage,
+)
+from sentry.utils import json
+from sentry.utils.kvstore.bigtable import BigtableError
 
 
 class MockedBigtableKVStorage(BigtableKVStorage):
@@ -152,3 +160,38 @@ def test_cache(ns):
         ns.get("node_4")
         ns.get("node_4")
         assert mock_read_row.call_count == 2
+
+
+def test_compression_dictionary(tmp_path):
+    samples = [
+        json.dumps({"event_id": f"{i:032x}", "platform": "python", "tags": [["n", i % 7]]}).encode()
+        for i in range(1000)
+    ]
+    dictionary = zstandard.train_dictionary(1024, samples, dict_id=40000)
+    (tmp_path / f"40000{COMPRESSION_DICTIONARY_SUFFIX}").write_bytes(dictionary.as_bytes())
+
+    ns = MockedBigtableNodeStorage(
+        project="test", compression_dictionaries_path=str(tmp_path), compression_dictionary_id=40000
+    )
+    data = {"event_id": "a" * 32, "platform": "python", "tags": [["n", 1]]}
+    ns.set("node_1", data)
+
+    table = ns.store._get_table()
+    [flags] = table.read_row("node_1").cells["x"][BigtableKVStorage.flags_column]
+    assert flags.value == struct.pack("<BI", BigtableKVStorage.Flags.COMPRESSED_ZSTD_DICT, 40000)
+    value = ns.store.get("node_1")
+    assert json.loads(value) == data
+
+    # Nodes written with a dictionary stay readable once writes move to
+    # another compression setting, as long as the dictionary is still there.
+    reader = MockedBigtableNodeStorage(
+        project="test", compression="zstd", compression_dictionaries_path=str(tmp_path)
+    )
+    reader.store._MockedBigtableKVStorage__table = table
+    assert reader.store.get("node_1") == value
+
+    # Without the dictionary, they are not.
+    reader = MockedBigtableNodeStorage(project="test")
+    reader.store._MockedBigtableKVStorage__table = table
+    with pytest.raises(BigtableError):
+        reader.store.get("node_1")
@@ -0,0 +1,153 @@
+import random
+
+import pytest
+import zstandard
+
+from sentry.nodestore.base import NodeStorage
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.codecs import ZlibCodec, ZstdCodec, ZstdDictCodec
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+def make_native_event(num_threads, num_frames, num_images):
+    return {
+        "platform": "native",
+        "message": "EXC_BAD_ACCESS / KERN_INVALID_ADDRESS",
+        "threads": {
+            "values": [
+                {
+                    "id": thread_id,
+                    "crashed": thread_id == 0,
+                    "stacktrace": {
+                        "frames": [
+                            {
+                                "instruction_addr": hex(0x100000000 + thread_id * 0x1000 + i),
+                                "function": f"namespace::Class<T>::method_{i}(int, char const*)",
+                                "package": f"/usr/lib/libsomething_{i % num_images}.so",
+                                "filename": f"src/module_{i % 50}/file_{i}.cpp",
+                                "lineno": i,
+                                "in_app": i % 3 == 0,
+                            }
+                            for i in range(num_frames)
+                        ],
+                        "registers": {f"x{r}": hex(r * 0x1111) for r in range(32)},
+                    },
+                }
+                for thread_id in range(num_threads)
+            ]
+        },
+        "debug_meta": {
+            "images": [
+                {
+                    "type": "elf",
+                    "code_file": f"/usr/lib/libsomething_{i}.so",
+                    "debug_id": f"{i:08x}-0000-0000-0000-000000000000",
+                    "image_addr": hex(0x100000000 + i * 0x100000),
+                    "image_size": 0x100000,
+                }
+                for i in range(num_images)
+            ]
+        },
+    }
+
+
+EVENTS = {
+    # a processed native event, with its unprocessed copy for reprocessing
+    "native": make_native_event(num_threads=10, num_frames=50, num_images=100),
+    # minidumps have a lot more threads and loaded modules
+    "minidump": make_native_event(num_threads=80, num_frames=60, num_images=400),
+}
+
+
+def encode(event, indexed):
+    data = {None: event, "unprocessed": event}
+    with override_options({"nodestore.indexed-encoding-write-rate": 1.0 if indexed else 0.0}):
+        return NodeStorage()._encode(data)
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("subkey", [None, "unprocessed"], ids=["default", "unprocessed"])
+@pytest.mark.parametrize("indexed", [False, True], ids=["legacy", "indexed"])
+@pytest.mark.parametrize("event_name", sorted(EVENTS))
+def test_benchmark_decode(event_name, indexed, subkey, benchmark):
+    ns = NodeStorage()
+    event = EVENTS[event_name]
+    blob = encode(event, indexed)
+    assert ns._decode(blob, subkey=subkey) == event
+
+    benchmark.extra_info["blob_bytes"] = len(blob)
+    benchmark(ns._decode, blob, subkey)
+
+
+def make_python_event(rng):
+    """
+    A small, typical event. These compress poorly on their own, which is what
+    trained dictionaries are meant to help with.
+    """
+    module = rng.choice(["api", "tasks", "models", "utils", "views"])
+    return {
+        "event_id": "%032x" % rng.getrandbits(128),
+        "platform": "python",
+        "level": rng.choice(["error", "warning", "fatal"]),
+        "environment": rng.choice(["production", "staging"]),
+        "release": f"backend@{rng.randint(1, 300)}",
+        "tags": [["server_name", f"web-{rng.randint(1, 40)}"], ["runtime", "CPython 3.8.12"]],
+        "user": {
+            "id": str(rng.randint(1, 10**6)),
+            "ip_address": "10.0.%d.%d" % (rng.randint(0, 255), rng.randint(0, 255)),
+        },
+        "exception": {
+            "values": [
+                {
+                    "type": rng.choice(["KeyError", "ValueError", "OperationalError"]),
+                    "value": f"'{module}_{rng.randint(1, 1000)}'",
+                    "stacktrace": {
+                        "frames": [
+                            {
+                                "module": f"app.{module}.handler_{i}",
+                                "filename": f"app/{module}/handler_{i}.py",
+                                "function": rng.choice(["get", "post", "dispatch", "run"]),
+                                "lineno": rng.randint(1, 500),
+                                "in_app": True,
+                            }
+                            for i in range(rng.randint(3, 15))
+                        ]
+                    },
+                }
+            ]
+        },
+    }
+
+
+def make_compression_corpus():
+    rng = random.Random(0)
+    ns = NodeStorage()
+    training = [ns._encode({None: make_python_event(rng)}) for _ in range(2000)]
+    samples = [ns._encode({None: make_python_event(rng)}) for _ in range(100)]
+    return training, samples
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("codec_name", ["zlib", "zstd", "zstd-dict"])
+def test_benchmark_compression(codec_name, benchmark):
+    training, samples = make_compression_corpus()
+    if codec_name == "zlib":
+        codec = ZlibCodec()
+    elif codec_name == "zstd":
+        codec = ZstdCodec()
+    else:
+        codec = ZstdDictCodec(zstandard.train_dictionary(112640, training))
+
+    compressed = [codec.encode(sample) for sample in samples]
+    assert [codec.decode(value) for value in compressed] == samples
+
+    benchmark.extra_info["compression_ratio"] = sum(map(len, samples)) / sum(map(len, compressed))
+    benchmark(lambda: [codec.encode(sample) for sample in samples])
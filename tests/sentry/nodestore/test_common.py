@@ -3,10 +3,14 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 `ns` fixture to have it tested.
 """
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
+from django.test import override_settings
 
+from sentry.nodestore.base import INDEXED_PREFIX, get_local_cache
 from sentry.nodestore.django.backend import DjangoNodeStorage
+from sentry.testutils.helpers.options import override_options
 from tests.sentry.nodestore.bigtable.test_backend import (
     MockedBigtableNodeStorage,
     get_temporary_bigtable_nodestorage,
@@ -67,6 +71,21 @@ def test_delete_multi(ns):
     assert not ns.get(nodes[1][0])
 
 
+def test_set_multi(ns):
+    nodes = {"node_1": {"foo": "a"}, "node_2": {"foo": "b"}}
+    ns.set_multi(nodes)
+    assert ns.get_multi(list(nodes)) == nodes
+
+    ns.set_subkeys_multi(
+        {"node_1": {None: {"foo": "c"}, "other": {"foo": "d"}}, "node_2": {None: {"foo": "e"}}}
+    )
+    assert ns.get_multi(list(nodes)) == {"node_1": {"foo": "c"}, "node_2": {"foo": "e"}}
+    assert ns.get("node_1", subkey="other") == {"foo": "d"}
+
+    ns.delete_multi(list(nodes))
+    assert not any(ns.get_multi(list(nodes)).values())
+
+
 def test_set_subkeys(ns):
     """
     Subkeys are used to store multiple JSON payloads under the same main key.
@@ -91,3 +110,49 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+def test_set_subkeys_indexed(ns):
+    data = {None: {"foo": "a"}, "other": {"foo": "b\nc"}, "third": [1, 2]}
+    with override_options({"nodestore.indexed-encoding-write-rate": 1.0}):
+        ns.set_subkeys("node_1", dict(data))
+
+    assert ns._get_bytes("node_1").startswith(INDEXED_PREFIX)
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b\nc"}
+    assert ns.get("node_1", subkey="third") == [1, 2]
+    assert ns.get("node_1", subkey="missing") is None
+    assert ns.get_multi(["node_1"], subkey="other") == {"node_1": {"foo": "b\nc"}}
+
+    # blobs in the old encoding stay readable
+    ns.set_subkeys("node_1", dict(data))
+    assert not ns._get_bytes("node_1").startswith(INDEXED_PREFIX)
+    assert ns.get("node_1", subkey="other") == {"foo": "b\nc"}
+
+
+@override_settings(SENTRY_NODESTORE_LOCAL_CACHE_MAX_BYTES=1024 * 1024)
+def test_local_cache(ns):
+    get_local_cache().clear()
+    ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+    ns.set("node_2", {"foo": "c"})
+
+    with mock.patch.object(ns, "_get_bytes") as get_bytes, mock.patch.object(
+        ns, "_get_bytes_multi"
+    ) as get_bytes_multi:
+        assert ns.get("node_1") == {"foo": "a"}
+        assert ns.get("node_1", subkey="other") == {"foo": "b"}
+        assert ns.get_multi(["node_1", "node_2"]) == {
+            "node_1": {"foo": "a"},
+            "node_2": {"foo": "c"},
+        }
+        assert not get_bytes.called
+        assert not get_bytes_multi.called
+
+    # payloads are decoded on every hit and never shared between callers
+    ns.get("node_1")["foo"] = "changed"
+    assert ns.get("node_1") == {"foo": "a"}
+
+    ns.delete("node_1")
+    assert ns.get("node_1") is None
+    ns.delete_multi(["node_2"])
+    assert ns.get("node_2") is None
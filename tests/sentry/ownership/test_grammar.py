@@ -1,6 +1,7 @@
 import pytest
 
 from sentry.ownership.grammar import (
+    CompiledRules,
     Matcher,
     Owner,
     Rule,
@@ -510,6 +511,9 @@ def _assert_matcher(matcher: Matcher, path_details, expected):
     frames = {"stacktrace": {"frames": path_details}}
     assert matcher.test(frames) == expected
 
+    rule = Rule(matcher, [])
+    assert CompiledRules([rule]).get_matching_rules(frames) == ([rule] if expected else [])
+
 
 @pytest.mark.parametrize(
     "path_details, expected",
@@ -1035,3 +1039,26 @@ def test_convert_schema_to_rules_text():
         )
         == "path:*.js #frontend m@robenolt.com\nurl:http://google.com/* #backend\npath:src/sentry/* david@sentry.io\ntags.foo:bar tagperson@sentry.io\ntags.foo:bar baz tagperson@sentry.io\nmodule:foo.bar #workflow\nmodule:foo bar meow@sentry.io\n"
     )
+
+
+def test_compiled_rules():
+    rules = parse_rules(fixture_data + "codeowners:docs//  githubdocs@sentry.io\n")
+    compiled_rules = CompiledRules(rules)
+    for data in [
+        {},
+        {"request": {"url": "http://google.com/foo"}},
+        {"tags": [["foo", "bar"]]},
+        {
+            "stacktrace": {
+                "frames": [
+                    {"filename": "src/sentry/models.py", "module": "foo.bar"},
+                    {"filename": "frontend/index.ts", "abs_path": "/src/components/app.js"},
+                ]
+            }
+        },
+        {"stacktrace": {"frames": [{"filename": "src/components/index.js"}]}},
+        {"stacktrace": {"frames": [{"filename": "docs/index.md"}]}},
+    ]:
+        assert compiled_rules.get_matching_rules(data) == [
+            rule for rule in rules if rule.test(data)
+        ]
@@ -7,8 +7,10 @@ the mock indexer actually behaves the same as the postgres indexer.
 """
 
 from typing import Mapping, Set
+from unittest import mock
 
 import pytest
+from django.test import override_settings
 
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.indexer.base import FetchType, FetchTypeExt, Metadata
@@ -163,6 +165,66 @@ def test_resolve_and_reverse_resolve(indexer, indexer_cache):
     assert indexer.reverse_resolve(use_case_id=use_case_id, org_id=org1_id, id=1234) is None
 
 
+def test_bulk_reverse_resolve(indexer, indexer_cache):
+    org1_id = 1
+    strings = {"hello", "hey", "hi"}
+
+    indexer = StaticStringIndexer(CachingIndexer(indexer_cache, indexer))
+    results = indexer.bulk_record(use_case_id=use_case_id, org_strings={org1_id: strings})
+    ids = {results[org1_id][string]: string for string in strings}
+    ids[SHARED_STRINGS["release"]] = "release"
+
+    assert indexer.bulk_reverse_resolve(use_case_id, org1_id, [*ids, 1234]) == ids
+    assert indexer.bulk_reverse_resolve(use_case_id, org1_id, []) == {}
+
+
+def test_local_cache(indexer, indexer_cache):
+    org1_id = 1
+
+    with override_settings(SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE=100):
+        caching_indexer = CachingIndexer(indexer_cache, indexer)
+
+    id = caching_indexer.record(use_case_id=use_case_id, org_id=org1_id, string="hello")
+    assert caching_indexer.resolve(use_case_id, org1_id, "hello") == id
+
+    # Both directions are served from the process without asking the backend.
+    with mock.patch.object(indexer, "resolve") as resolve, mock.patch.object(
+        indexer, "bulk_reverse_resolve"
+    ) as bulk_reverse_resolve:
+        indexer_cache.cache.clear()
+        assert caching_indexer.resolve(use_case_id, org1_id, "hello") == id
+        assert caching_indexer.reverse_resolve(use_case_id, org1_id, id) == "hello"
+        assert not resolve.called
+        assert not bulk_reverse_resolve.called
+
+
+def test_local_cache_bulk_record(indexer, indexer_cache):
+    org_strings = {1: {"hello", "hey"}, 2: {"hello"}}
+
+    with override_settings(SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE=100):
+        caching_indexer = CachingIndexer(indexer_cache, indexer)
+
+    results = caching_indexer.bulk_record(use_case_id=use_case_id, org_strings=org_strings)
+
+    with mock.patch.object(
+        indexer_cache, "get_many", wraps=indexer_cache.get_many
+    ) as get_many, mock.patch.object(
+        indexer, "bulk_record", wraps=indexer.bulk_record
+    ) as bulk_record:
+        # Only the string that was never seen before goes past the local tier.
+        cached_results = caching_indexer.bulk_record(
+            use_case_id=use_case_id, org_strings={**org_strings, 2: {"hello", "hi"}}
+        )
+        get_many.assert_called_once_with(["2:hi"], use_case_id.value)
+        bulk_record.assert_called_once_with(use_case_id, {2: {"hi"}})
+
+    assert cached_results[1] == results[1]
+    assert cached_results[2]["hello"] == results[2]["hello"]
+    assert_fetch_type_for_tag_string_set(
+        cached_results.get_fetch_metadata()[1], FetchType.CACHE_HIT, {"hello", "hey"}
+    )
+
+
 def test_already_created_plus_written_results(indexer, indexer_cache) -> None:
     """
     Test that we correctly combine db read results with db write results
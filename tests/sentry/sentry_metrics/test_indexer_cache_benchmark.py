@@ -0,0 +1,74 @@
+import itertools
+from datetime import datetime, timezone
+
+import pytest
+from django.test import override_settings
+
+from sentry.sentry_metrics.configuration import UseCaseKey
+from sentry.sentry_metrics.consumers.indexer.batch import IndexerBatch
+from sentry.sentry_metrics.indexer.cache import CachingIndexer, StringIndexerCache
+from sentry.sentry_metrics.indexer.mock import RawSimpleIndexer
+from sentry.snuba.metrics.naming_layer.mri import SessionMRI
+from tests.sentry.sentry_metrics.test_batch import _construct_outer_message
+
+pytestmark = pytest.mark.sentry_metrics
+
+ts = int(datetime.now(tz=timezone.utc).timestamp())
+
+# A release health batch the way the consumer receives it: a few metric
+# names and tag keys shared by every message, and releases and environments
+# that repeat from one batch to the next.
+PAYLOADS = [
+    (
+        {
+            "name": name,
+            "tags": {
+                "environment": environment,
+                "release": f"backend@{release}.0.0",
+                "session.status": status,
+            },
+            "timestamp": ts,
+            "type": "c",
+            "value": 1.0,
+            "org_id": org_id,
+            "project_id": org_id * 10,
+        },
+        [],
+    )
+    for org_id, name, environment, release, status in itertools.product(
+        range(1, 21),
+        [SessionMRI.SESSION.value, SessionMRI.ERROR.value, SessionMRI.RAW_DURATION.value],
+        ["production", "staging"],
+        range(5),
+        ["init", "healthy", "errored", "crashed"],
+    )
+]
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("local_cache_size", [0, 10000])
+def test_benchmark_bulk_record(local_cache_size, benchmark):
+    batch = IndexerBatch(UseCaseKey.RELEASE_HEALTH, _construct_outer_message(PAYLOADS), True)
+    org_strings = batch.extract_strings()
+    benchmark.extra_info["strings"] = sum(len(strings) for strings in org_strings.values())
+
+    indexer_cache = StringIndexerCache(cache_name="default", partition_key="benchmark")
+    with override_settings(SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE=local_cache_size):
+        indexer = CachingIndexer(indexer_cache, RawSimpleIndexer())
+
+    # Replay the batch against warm caches, like consecutive batches of a
+    # running consumer.
+    indexer.bulk_record(UseCaseKey.RELEASE_HEALTH, org_strings)
+    try:
+        benchmark(indexer.bulk_record, UseCaseKey.RELEASE_HEALTH, org_strings)
+    finally:
+        indexer_cache.cache.clear()
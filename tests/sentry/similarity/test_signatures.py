@@ -1,6 +1,8 @@
 from collections import Counter
 from unittest import TestCase
 
+import mmh3
+
 from sentry.similarity.signatures import MinHashSignatureBuilder
 
 
@@ -28,3 +30,16 @@ class MinHashSignatureBuilderTestCase(TestCase):
         self.assertAlmostEqual(
             similarity, estimation, delta=0.1  # totally made up constant, seems reasonable
         )
+
+    def test_matches_reference_implementation(self):
+        # Signatures are persisted in existing indexes, so they must not change.
+        def reference(columns, rows, features):
+            return [
+                min(mmh3.hash(feature, column) % rows for feature in features)
+                for column in range(columns)
+            ]
+
+        features = [b"foo", b"bar", "baz", b"foo", "☃", b"\x00\xff"]
+        for columns, rows in ((16, 0xFFFF), (32, 0xFFFF), (4, 7)):
+            get_signature = MinHashSignatureBuilder(columns, rows)
+            assert get_signature(features) == reference(columns, rows, features)
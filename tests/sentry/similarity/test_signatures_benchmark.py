@@ -0,0 +1,26 @@
+import pytest
+
+from sentry.similarity import text_shingle
+from sentry.similarity.signatures import MinHashSignatureBuilder
+
+# A message with repeated tokens, shingled the way ``message:message:character-shingles``
+# features are.
+MESSAGE = "TypeError: Cannot read property 'length' of undefined " * 8
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("columns", [16, 32])
+def test_benchmark_minhash_signature(columns, benchmark):
+    features = [shingle.encode("utf8") for shingle in text_shingle(5, MESSAGE)]
+    benchmark.extra_info["features"] = len(features)
+
+    benchmark(MinHashSignatureBuilder(columns, 0xFFFF), features)
@@ -1,3 +1,6 @@
+from unittest import mock
+
+from sentry import killswitches
 from sentry.killswitches import _value_matches, normalize_value
 
 
@@ -82,3 +85,23 @@ def test_value_matches():
         [{"event_type": "transaction"}],
         {"project_id": 3, "event_type": "transaction"},
     )
+
+
+def test_value_matches_compiles_once():
+    name = "store.load-shed-group-creation-projects"
+    option_value = [{"project_id": 1, "platform": "python"}, {"project_id": 2}]
+
+    with mock.patch.object(
+        killswitches, "_compile_value", wraps=killswitches._compile_value
+    ) as compile_value:
+        assert _value_matches(name, option_value, {"project_id": 1, "platform": "python"})
+        assert not _value_matches(name, option_value, {"project_id": 1, "platform": "java"})
+        assert _value_matches(name, list(option_value), {"project_id": 2, "platform": "java"})
+        assert compile_value.call_count == 1
+
+        # The option value has changed, so it needs to be compiled again.
+        assert not _value_matches(name, [{"project_id": 1}], {"project_id": 2, "platform": None})
+        assert compile_value.call_count == 2
+
+    # Compiling must not modify the option value that was passed in.
+    assert option_value == [{"project_id": 1, "platform": "python"}, {"project_id": 2}]
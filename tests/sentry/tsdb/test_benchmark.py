@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+from django.test import override_settings
+
+from sentry.tsdb.base import ONE_DAY, ONE_HOUR, TSDBModel
+from sentry.utils.dates import to_datetime
+
+NUM_KEYS = 100
+NUM_DAYS = 30
+
+
+def benchmark_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+@pytest.fixture
+def tsdb():
+    from sentry.tsdb.redis import RedisTSDB
+
+    with override_settings(
+        SENTRY_OPTIONS={
+            "redis.clusters": {"tsdb": {"hosts": {i - 6: {"db": i} for i in range(6, 9)}}}
+        }
+    ):
+        db = RedisTSDB(rollups=((ONE_HOUR, 24), (ONE_DAY, NUM_DAYS)), vnodes=64, cluster="tsdb")
+
+    yield db
+
+    with db.cluster.all() as client:
+        client.flushdb()
+
+
+def hget_range(db, model, keys, start, end):
+    """The previous implementation of ``get_range``, with one HGET per key and bucket."""
+    rollup, series = db.get_optimal_rollup_series(start, end, None)
+    results = {}
+    with db.cluster.map() as client:
+        for key in keys:
+            for timestamp in series:
+                hash_key, hash_field = db.make_counter_key(
+                    model, rollup, to_datetime(timestamp), key, None
+                )
+                results[(key, timestamp)] = client.hget(hash_key, hash_field)
+    return {key: int(promise.value or 0) for key, promise in results.items()}
+
+
+def count_commands(db, func, *args):
+    # All hosts of the cluster are databases of the same local Redis server,
+    # whose stats cover all of them.
+    client = db.cluster.get_local_client(0)
+    before = int(client.info("stats")["total_commands_processed"])
+    func(*args)
+    # Don't count the first INFO command.
+    return int(client.info("stats")["total_commands_processed"]) - before - 1
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("method", ["hget_range", "get_range", "get_sums"])
+def test_benchmark_get_range(tsdb, method, benchmark):
+    now = datetime.utcnow().replace(tzinfo=pytz.UTC)
+    start = now - timedelta(days=NUM_DAYS - 1)
+    keys = list(range(NUM_KEYS))
+    for day in range(NUM_DAYS):
+        tsdb.incr_multi(
+            [(TSDBModel.group, key) for key in keys], start + timedelta(days=day), count=day
+        )
+
+    func = {
+        "hget_range": lambda *args: hget_range(tsdb, *args),
+        "get_range": tsdb.get_range,
+        "get_sums": tsdb.get_sums,
+    }[method]
+    args = (TSDBModel.group, keys, start, now)
+
+    benchmark.extra_info["commands"] = count_commands(tsdb, func, *args)
+    benchmark(func, *args)
@@ -188,6 +188,39 @@ class RedisTSDBTest(TestCase):
         results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert results == {1: 0, 2: 0}
 
+    def test_get_sums_many_keys(self):
+        now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(days=10)
+        dts = [now + timedelta(days=i) for i in range(10)]
+
+        # More keys than vnodes, with string and integer keys, so that hashes
+        # are shared between keys and spread across all hosts.
+        keys = list(range(100)) + [f"key-{i}" for i in range(20)]
+        for i, dt in enumerate(dts):
+            self.db.incr_multi([(TSDBModel.group, key, {"count": i + 1}) for key in keys[i::2]], dt)
+            self.db.incr_multi([(TSDBModel.group, key) for key in keys[::3]], dt, environment_id=1)
+
+        for environment_id in (None, 1, 2):
+            ranges = self.db.get_range(
+                TSDBModel.group,
+                keys,
+                dts[0],
+                dts[-1],
+                environment_ids=[environment_id] if environment_id is not None else None,
+            )
+            sums = self.db.get_sums(
+                TSDBModel.group, keys, dts[0], dts[-1], environment_id=environment_id
+            )
+            assert sums == {
+                key: sum(count for _, count in points) for key, points in ranges.items()
+            }
+
+        sums = self.db.get_sums(TSDBModel.group, keys, dts[0], dts[-1])
+        assert sums[0] == 1 + 10
+        assert sums[1] == 2
+        assert sums[99] == 2 + 4 + 6 + 8 + 10 + 10
+
+        assert self.db.get_sums(TSDBModel.group, [], dts[0], dts[-1]) == {}
+
     def test_count_distinct(self):
         now = datetime.utcnow().replace(tzinfo=pytz.UTC) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
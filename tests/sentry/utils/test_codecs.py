@@ -1,6 +1,7 @@
 import pytest
+import zstandard
 
-from sentry.utils.codecs import BytesCodec, JSONCodec, ZlibCodec, ZstdCodec
+from sentry.utils.codecs import BytesCodec, JSONCodec, ZlibCodec, ZstdCodec, ZstdDictCodec
 
 
 @pytest.mark.parametrize(
@@ -22,3 +23,18 @@ def test_codec_chaining() -> None:
 
     assert codec.encode([1, 2, 3]) == b"[1,2,3]"
     assert codec.decode(b"[1,2,3]") == [1, 2, 3]
+
+
+def test_zstd_dict_codec() -> None:
+    samples = [
+        f'{{"event_id":"{i:032x}","platform":"python","level":"error","tags":[["server","web-{i % 7}"]]}}'.encode()
+        for i in range(1000)
+    ]
+    dictionary = zstandard.train_dictionary(1024, samples, dict_id=40000)
+    codec = ZstdDictCodec(dictionary)
+
+    assert codec.dict_id == 40000
+    for sample in samples[:10]:
+        encoded = codec.encode(sample)
+        assert len(encoded) < len(ZstdCodec().encode(sample))
+        assert codec.decode(encoded) == sample
@@ -0,0 +1,65 @@
+from sentry.utils.lru import LRUCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(max_items=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    assert cache.set("c", 3) == 1
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+    assert (cache.hits, cache.misses, cache.evictions) == (3, 2, 1)
+
+
+def test_byte_size_accounting():
+    cache = LRUCache(max_bytes=10, sizeof=len)
+    cache.set("a", b"12345")
+    cache.set("b", b"1234")
+    assert cache.nbytes == 9
+    cache.set("b", b"123")
+    assert cache.nbytes == 8
+    assert cache.set("c", b"123") == 1
+    assert "a" not in cache
+    assert cache.nbytes == 6
+
+    # entries that can never fit are not stored at all
+    assert cache.set("d", b"x" * 11) == 0
+    assert "d" not in cache
+    assert len(cache) == 2
+
+
+def test_ttl():
+    timer = FakeTimer()
+    cache = LRUCache(max_items=10, ttl=5, timer=timer)
+    cache.set("a", 1)
+    timer.now = 4
+    assert cache.get("a") == 1
+    timer.now = 5
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+    cache.set_many({"b": 2}, ttl=10)
+    timer.now = 14
+    assert cache.get("b") == 2
+    timer.now = 15
+    assert cache.get("b") is None
+
+
+def test_delete():
+    cache = LRUCache(max_items=10)
+    cache.set_many({"a": 1, "b": 2, "c": 3})
+    cache.delete("a")
+    cache.delete_many(["b", "unknown"])
+    assert cache.get_many(["a", "b", "c"]) == {"c": 3}
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.nbytes == 0
@@ -16,6 +16,7 @@ from sentry.rules.conditions.event_frequency import (
 )
 from sentry.testutils.cases import RuleTestCase, SnubaTestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.perfomance_issues.store_transaction import PerfIssueTransactionTestMixin
 from sentry.testutils.silo import region_silo_test
 from sentry.types.issues import GroupType
@@ -219,6 +220,27 @@ class EventFrequencyConditionTestCase(
                 timestamp=timestamp,
             )
 
+    @override_options({"rules.event-frequency.rate-cache-ttl": 60})
+    def test_shared_rate_cache(self):
+        event = self.add_event(
+            data={"fingerprint": ["something_random"]},
+            project_id=self.project.id,
+            timestamp=before_now(minutes=1),
+        )
+        rule = self.get_rule(data={"interval": "1h", "value": 1}, rule=Rule(environment_id=None))
+        other_rule = self.get_rule(
+            data={"interval": "1h", "value": 0}, rule=Rule(environment_id=None)
+        )
+
+        with patch.object(rule.tsdb, "get_sums", wraps=rule.tsdb.get_sums) as get_sums:
+            self.assertDoesNotPass(rule, event)
+            self.increment(event, 2)
+            # Both conditions are answered from the rate computed for the first check.
+            self.assertDoesNotPass(rule, event)
+            self.assertPasses(other_rule, event)
+
+        assert get_sums.call_count == 1
+
 
 class EventUniqueUserFrequencyConditionTestCase(
     FrequencyConditionMixin,